@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
 import json
 import math
 import multiprocessing
@@ -6,17 +10,44 @@ import platform
 import queue
 import random
 import re
+import sqlite3
+import statistics
 import subprocess
 import sys
 import threading
 import time
-import tkinter as tk
-from datetime import datetime
-from tkinter import messagebox, ttk
+from array import array
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+from urllib.request import pathname2url
+
+# Kernels, the workload registry and the worker entry points. Spawn-mode
+# workers also re-import this module as __mp_main__, so nothing below does
+# work at import time: Tk is imported by _import_tk() and psutil by main().
+from quickbench_kernels import (
+    DEFAULT_WORKLOAD, MEMORY_BYTES_PER_ELEM, MEMORY_CHUNK,
+    MEMORY_KERNELS, NUMPY_WORKLOADS, SLOT_BATCHES, SLOT_HEARTBEAT_NS,
+    SLOT_MAX_NS, SLOT_MIN_NS, SLOT_READY, SLOT_TOTAL_NS, WORKER_SLOT_STRIDE,
+    WORKLOADS, Workload,
+    _SharedFlag, _memory_buffers, _memory_worker, _pool_worker_main,
+    _stream_kernel, affinity_supported, get_workload, import_numpy,
+    multicore_worker, numpy_matmul_side, optional_package_missing,
+    pass_profile,
+)
+
+# tkinter is imported by _import_tk() only when the GUI starts, so the
+# headless runner works on hosts without a display (or without Tk at all).
+tk         = None
+ttk        = None
+messagebox = None
 
 APP_NAME = "QuickBench"
-APP_VERSION = "3.0"
+APP_VERSION = "3.1"
+HISTORY_DB   = os.path.expanduser("~/.quickbench_history.sqlite3")
+# Pre-3.1 history; imported into HISTORY_DB once, then renamed to *.migrated.
 HISTORY_FILE = os.path.expanduser("~/.quickbench_history.json")
+PROFILE_CACHE_FILE = os.path.expanduser("~/.quickbench_profile.json")
+PROFILE_CACHE_TTL  = 7 * 24 * 3600     # seconds before a matching cache is re-detected
 
 # App icon embedded as base64-encoded PNG — no external files or Pillow needed.
 # Generated from QB.png (converted to true PNG, 256×256 RGBA).
@@ -736,6 +767,21 @@ def _mono_font(size=11):
     return ("Courier New", size)        # universally available on Linux
 
 
+# ---------------------------------------------------------------------------
+# Lazy tkinter import
+# Only the GUI needs Tk. Importing it here instead of at module level keeps
+# `--headless` runs free of tkinter (no X / Aqua session required).
+# ---------------------------------------------------------------------------
+
+def _import_tk():
+    """Bind tk / ttk / messagebox module globals on first GUI use."""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as _messagebox, ttk as _ttk
+        tk, ttk, messagebox = tkinter, _ttk, _messagebox
+
+
 # ---------------------------------------------------------------------------
 # Dependency bootstrap
 # Must run before any third-party import so the UI can ask permission first.
@@ -748,6 +794,8 @@ def _mono_font(size=11):
 _REQUIRED_PACKAGES = [
     ("psutil", "psutil", "CPU / RAM monitoring during benchmarks"),
 ]
+# Packages that unlock extra benchmarks are listed in quickbench_kernels
+# (_OPTIONAL_PACKAGES), next to the kernels that need them.
 
 
 def _check_missing():
@@ -959,33 +1007,89 @@ PSUTIL = None   # populated in main() after bootstrap completes
 # Subprocess helpers
 # ---------------------------------------------------------------------------
 
+# Thread ident -> the subprocess run_command is waiting on in that thread, so
+# run_probes can kill the commands of probes that overran their deadline.
+_RUNNING_COMMANDS      = {}
+_RUNNING_COMMANDS_LOCK = threading.Lock()
+
+
 def run_command(command, timeout=12, shell=False):
     try:
         kwargs = dict(
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=timeout,
-            check=False,
             shell=shell,
         )
         # Suppress console windows on Windows (PowerShell/wmic popups)
         if os.name == "nt":
             kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-        result = subprocess.run(command, **kwargs)
-        if result.returncode == 0:
-            return result.stdout.strip()
+        process = subprocess.Popen(command, **kwargs)
     except Exception:
-        pass
-    return ""
-
-
-def run_powershell(script):
+        return ""
+    ident = threading.get_ident()
+    with _RUNNING_COMMANDS_LOCK:
+        _RUNNING_COMMANDS[ident] = process
+    try:
+        stdout, _ = process.communicate(timeout=timeout)
+    except Exception:           # timed out, or killed by run_probes
+        process.kill()
+        process.communicate()
+        return ""
+    finally:
+        with _RUNNING_COMMANDS_LOCK:
+            _RUNNING_COMMANDS.pop(ident, None)
+    return stdout.strip() if process.returncode == 0 else ""
+
+
+def run_powershell(script, timeout=15):
     return run_command(
         ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", script],
-        timeout=15,
+        timeout=timeout,
     )
 
 
+# Overall budget for one round of detection probes. Probes still running when
+# it expires count as empty output, same as a failed command.
+PROBE_DEADLINE = 20.0
+
+
+def run_probes(probes, deadline=PROBE_DEADLINE):
+    """Run independent probes concurrently; {name: output} once all finish or
+    the deadline passes, so detection costs the slowest probe, not the sum.
+
+    probes: {name: zero-argument callable returning a string}
+    """
+    outputs = {}
+
+    def run(name, probe):
+        try:
+            outputs[name] = probe()
+        except Exception:
+            pass
+
+    # Daemon threads, and stragglers' commands are killed: an overrunning
+    # probe must not hold up the caller or interpreter exit.
+    threads = {name: threading.Thread(target=run, args=(name, probe), daemon=True)
+               for name, probe in probes.items()}
+    for thread in threads.values():
+        thread.start()
+    end = time.monotonic() + deadline
+    for thread in threads.values():
+        thread.join(max(0.0, end - time.monotonic()))
+    results = {}
+    for name, thread in threads.items():
+        if thread.is_alive():
+            with _RUNNING_COMMANDS_LOCK:
+                process = _RUNNING_COMMANDS.get(thread.ident)
+            if process is not None:
+                process.kill()
+            results[name] = ""
+        else:
+            results[name] = outputs.get(name) or ""
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Unit helpers
 # ---------------------------------------------------------------------------
@@ -1014,6 +1118,31 @@ def mhz_to_string(mhz):
     return f"{int(round(mhz))} MHz"
 
 
+def gb_string_to_bytes(text):
+    """"16 GB" (as written by bytes_to_gb_string), "512 MB" or "1 TB" -> bytes,
+    or None when the text holds no size."""
+    match = re.search(r"([\d.]+)\s*([KMGT])B\b", str(text or ""), re.IGNORECASE)
+    if not match:
+        return None
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return None
+    return int(value * 1024 ** ("KMGT".index(match.group(2).upper()) + 1))
+
+
+def frequency_string_to_mhz(text):
+    """"3.20 GHz" / "2100 MHz" (as written by mhz_to_string) -> MHz, or None."""
+    match = re.search(r"([\d.]+)\s*([GM])Hz\b", str(text or ""), re.IGNORECASE)
+    if not match:
+        return None
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return None
+    return value * 1000 if match.group(2).upper() == "G" else value
+
+
 def normalize_cpu_frequency(max_mhz, current_mhz):
     if max_mhz and max_mhz > 100:
         return mhz_to_string(max_mhz)
@@ -1124,6 +1253,45 @@ def _get_cpu_name():
     return "Unknown CPU"
 
 
+# Every Win32 field detect_system_profile() needs, as one JSON object.
+_WINDOWS_PROFILE_SCRIPT = """
+$cs   = Get-CimInstance Win32_ComputerSystem
+$cpus = @(Get-CimInstance Win32_Processor)
+$vcs  = @(Get-CimInstance Win32_VideoController)
+$mem  = @(Get-CimInstance Win32_PhysicalMemory)
+$blacklist = @('virtual','basic display','parsec','indirect','remote','mirror',
+               'citrix','vmware','virtualbox','hyper-v','teamviewer','anydesk',
+               'spacedesk','sunshine','moonlight','virtual audio')
+$gpus = $vcs | Where-Object {
+    $name = "$($_.Name)".ToLower()
+    -not ($blacklist | Where-Object { $name -like "*$_*" })
+} | Select-Object -ExpandProperty Name
+if (-not $gpus) { $gpus = $vcs | Select-Object -ExpandProperty Name }
+$vram = $vcs | ForEach-Object {
+  if ($_.AdapterRAM) { [math]::Round($_.AdapterRAM / 1GB, 1).ToString() + ' GB' }
+}
+$types = $mem | ForEach-Object {
+  switch ($_.SMBIOSMemoryType) {
+    20 {'DDR'} 21 {'DDR2'} 24 {'DDR3'} 26 {'DDR4'} 34 {'DDR5'} default {'Unknown'}
+  }
+} | Select-Object -Unique
+$speeds = $mem | Select-Object -ExpandProperty Speed | Sort-Object -Unique |
+          ForEach-Object { "$_ MHz" }
+[pscustomobject]@{
+  model        = $cs.Model
+  manufacturer = $cs.Manufacturer
+  cpu          = $cpus[0].Name
+  gpu          = ($gpus   -join ', ')
+  gpu_vram     = ($vram   -join ', ')
+  mem_type     = ($types  -join ', ')
+  mem_speed    = ($speeds -join ', ')
+  logical      = ($cpus | Measure-Object -Property NumberOfLogicalProcessors -Sum).Sum
+  physical     = ($cpus | Measure-Object -Property NumberOfCores -Sum).Sum
+  freq         = $cpus[0].MaxClockSpeed
+} | ConvertTo-Json -Compress
+"""
+
+
 def detect_system_profile():
     vm = PSUTIL.virtual_memory()
     cpu_freq = PSUTIL.cpu_freq()
@@ -1148,12 +1316,18 @@ def detect_system_profile():
     }
 
     if sys.platform == "darwin":
-        model  = run_command(["sysctl", "-n", "hw.model"])
-        cpu    = run_command(["sysctl", "-n", "machdep.cpu.brand_string"])
-        ram    = run_command(["sysctl", "-n", "hw.memsize"])
-        sp_hw  = run_command(["system_profiler", "SPHardwareDataType"])
-        sp_gpu = run_command(["system_profiler", "SPDisplaysDataType"])
-        sp_mem = run_command(["system_profiler", "SPMemoryDataType"])
+        # One system_profiler call per data type: a combined call would mix
+        # the hardware and display "Total Number of Cores:" lines.
+        out = run_probes({
+            "model":  lambda: run_command(["sysctl", "-n", "hw.model"]),
+            "cpu":    lambda: run_command(["sysctl", "-n", "machdep.cpu.brand_string"]),
+            "ram":    lambda: run_command(["sysctl", "-n", "hw.memsize"]),
+            "sp_hw":  lambda: run_command(["system_profiler", "SPHardwareDataType"]),
+            "sp_gpu": lambda: run_command(["system_profiler", "SPDisplaysDataType"]),
+            "sp_mem": lambda: run_command(["system_profiler", "SPMemoryDataType"]),
+        })
+        model, cpu, ram = out["model"], out["cpu"], out["ram"]
+        sp_hw, sp_gpu, sp_mem = out["sp_hw"], out["sp_gpu"], out["sp_mem"]
 
         if model:
             info["model"] = model
@@ -1236,49 +1410,30 @@ def detect_system_profile():
             info["ram_type"] = "Unified Memory"
 
     elif os.name == "nt":
-        model        = run_powershell("(Get-CimInstance Win32_ComputerSystem).Model")
-        manufacturer = run_powershell("(Get-CimInstance Win32_ComputerSystem).Manufacturer")
-        cpu          = run_powershell(
-            "(Get-CimInstance Win32_Processor | Select-Object -First 1 -ExpandProperty Name)")
-        gpu          = run_powershell("""
-$blacklist = @('virtual','basic display','parsec','indirect','remote','mirror',
-               'citrix','vmware','virtualbox','hyper-v','teamviewer','anydesk',
-               'spacedesk','sunshine','moonlight','virtual audio')
-$gpus = Get-CimInstance Win32_VideoController | Where-Object {
-    $name = $_.Name.ToLower()
-    -not ($blacklist | Where-Object { $name -like "*$_*" })
-} | Select-Object -ExpandProperty Name
-if ($gpus) { $gpus -join ', ' } else {
-    (Get-CimInstance Win32_VideoController | Select-Object -ExpandProperty Name) -join ', '
-}
-""")
-        gpu_vram = run_powershell("""
-$vals = Get-CimInstance Win32_VideoController | ForEach-Object {
-  if ($_.AdapterRAM) { [math]::Round($_.AdapterRAM / 1GB, 1).ToString() + ' GB' }
-}
-$vals -join ', '
-""")
-        mem_type = run_powershell("""
-$vals = Get-CimInstance Win32_PhysicalMemory | Select-Object -ExpandProperty SMBIOSMemoryType
-if ($vals) {
-  $mapped = $vals | ForEach-Object {
-    switch ($_){
-      20 {'DDR'} 21 {'DDR2'} 24 {'DDR3'} 26 {'DDR4'} 34 {'DDR5'} default {'Unknown'}
-    }
-  }
-  ($mapped | Select-Object -Unique) -join ', '
-}
-""")
-        mem_speed = run_powershell("""
-$vals = Get-CimInstance Win32_PhysicalMemory | Select-Object -ExpandProperty Speed
-if ($vals) { (($vals | Sort-Object -Unique) | ForEach-Object { "$_ MHz" }) -join ', ' }
-""")
-        logical  = run_powershell(
-            "(Get-CimInstance Win32_Processor | Measure-Object -Property NumberOfLogicalProcessors -Sum).Sum")
-        physical = run_powershell(
-            "(Get-CimInstance Win32_Processor | Measure-Object -Property NumberOfCores -Sum).Sum")
-        freq = run_powershell(
-            "(Get-CimInstance Win32_Processor | Select-Object -First 1 -ExpandProperty MaxClockSpeed)")
+        # All CIM queries in one PowerShell process: its startup cost is paid
+        # once instead of per field.
+        raw = run_powershell(_WINDOWS_PROFILE_SCRIPT, timeout=PROBE_DEADLINE)
+        try:
+            fields = json.loads(raw) if raw else {}
+        except ValueError:
+            fields = {}
+        if not isinstance(fields, dict):
+            fields = {}
+
+        def field(name):
+            value = fields.get(name)
+            return "" if value is None else str(value).strip()
+
+        model        = field("model")
+        manufacturer = field("manufacturer")
+        cpu          = field("cpu")
+        gpu          = field("gpu")
+        gpu_vram     = field("gpu_vram")
+        mem_type     = field("mem_type")
+        mem_speed    = field("mem_speed")
+        logical      = field("logical")
+        physical     = field("physical")
+        freq         = field("freq")
 
         if manufacturer and model:
             info["model"] = f"{manufacturer} {model}"
@@ -1308,8 +1463,12 @@ if ($vals) { (($vals | Sort-Object -Unique) | ForEach-Object { "$_ MHz" }) -join
         info["model"]    = platform.node() or "Unknown Model"
         # Call tools directly — avoids a /bin/bash dependency and works on
         # systems where bash isn't the default shell.
-        lscpu = run_command(["lscpu"])
-        gpu   = run_command(["lspci"])   # filtered below
+        out = run_probes({
+            "lscpu": lambda: run_command(["lscpu"]),
+            "lspci": lambda: run_command(["lspci"]),
+        })
+        lscpu = out["lscpu"]
+        gpu   = out["lspci"]   # filtered below
 
         # Read DMI identity files directly — no shell required.
         def _read_dmi(filename):
@@ -1350,32 +1509,859 @@ if ($vals) { (($vals | Sort-Object -Unique) | ForEach-Object { "$_ MHz" }) -join
 
 
 # ---------------------------------------------------------------------------
-# Scoring
+# System profile cache
+# detect_system_profile() costs seconds (system_profiler, PowerShell/CIM,
+# lscpu/lspci). The result is cached on disk under a fingerprint of things
+# that are cheap to read and change when the hardware or OS does; a matching
+# cache is served at startup and refreshed only once it passes its TTL.
+# ---------------------------------------------------------------------------
+
+def _dmi_product_name():
+    """Machine model without the slow profilers: DMI, hw.model or the BIOS key."""
+    if sys.platform == "darwin":
+        return run_command(["sysctl", "-n", "hw.model"], timeout=3)
+    if os.name == "nt":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                                 r"HARDWARE\DESCRIPTION\System\BIOS")
+            name, _ = winreg.QueryValueEx(key, "SystemProductName")
+            winreg.CloseKey(key)
+            return str(name).strip()
+        except Exception:
+            return ""
+    return _read_sysfs("/sys/devices/virtual/dmi/id/product_name") or ""
+
+
+def hardware_fingerprint():
+    """Cheap hash of CPU brand, core counts, total RAM, DMI model and OS release."""
+    parts = [
+        _get_cpu_name(),
+        PSUTIL.cpu_count(logical=False),
+        PSUTIL.cpu_count(logical=True),
+        PSUTIL.virtual_memory().total,
+        _dmi_product_name(),
+        platform.system(),
+        platform.release(),
+        APP_VERSION,            # a new release may detect more fields
+    ]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def cached_system_profile(fingerprint, path=None, ttl=PROFILE_CACHE_TTL):
+    """(profile, stale) for a cache matching `fingerprint`, else (None, True).
+
+    A stale profile is still the right machine, so callers may show it while
+    they re-detect.
+    """
+    try:
+        with open(path or PROFILE_CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("fingerprint") != fingerprint or not isinstance(cache.get("profile"), dict):
+            return None, True
+        return cache["profile"], time.time() - float(cache.get("saved", 0)) > ttl
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None, True
+
+
+def save_system_profile(fingerprint, profile, path=None):
+    path = path or PROFILE_CACHE_FILE
+    tmp  = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "saved": time.time(),
+                       "profile": profile}, f, indent=2)
+        os.replace(tmp, path)   # readers never see a half-written cache
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Memory footprint
 # ---------------------------------------------------------------------------
 
-def score_single_core(items: int, seconds: float) -> int:
-    if seconds <= 0 or items <= 1:
+def current_rss_bytes():
+    try:
+        return PSUTIL.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def bytes_to_mb_string(num_bytes):
+    if num_bytes is None:
+        return "Unknown"
+    return f"{num_bytes / (1024 ** 2):,.0f} MB"
+
+
+# ---------------------------------------------------------------------------
+# NumPy tier results
+# The kernels are registered in quickbench_kernels; the tier runs each one
+# through the single- and multi-core runners.
+# ---------------------------------------------------------------------------
+
+NUMPY_MIN_STEP = 3.0     # seconds of multi-core time per tier kernel
+
+
+def score_numpy_tier(multi_scores):
+    """Tier score: geometric mean of the kernels' multi-core scores."""
+    if not multi_scores or min(multi_scores) <= 0:
         return 0
-    work_units = items * math.log2(items)
-    return int(work_units / seconds / 100_000)
+    return int(math.exp(sum(math.log(s) for s in multi_scores) / len(multi_scores)))
+
+
+def format_numpy_result(result):
+    if result.get("skipped"):
+        return f"NumPy tier skipped: {result['skipped']}"
+    lines = [f"{'Kernel':<22}{'1 core':>10}{'all cores':>12}"]
+    for kernel in result["kernels"]:
+        lines.append(f"{_workload_label(kernel):<22}{kernel['single_score']:>10}"
+                     f"{kernel['multi_score']:>12}")
+    matmul = next((k for k in result["kernels"] if k["workload"] == "numpy_matmul"), None)
+    if matmul is not None:
+        lines.append(f"Matmul: {matmul['single_rate'] / 1e9:.2f} GFLOPS on 1 core, "
+                     f"{matmul['multi_rate'] / 1e9:.2f} GFLOPS on {result['cores']} "
+                     f"process{'es' if result['cores'] != 1 else ''} "
+                     f"(N = {matmul['matrix_n']} / "
+                     f"{matmul['batch_matrix_n']} per batch)")
+    lines += [
+        f"NumPy {result['numpy_version']} — BLAS / OpenMP limited to 1 thread per process",
+        f"Runtime: {result['elapsed']:.2f}s",
+        f"NumPy tier score (geometric mean, all cores): {result['score']}",
+    ]
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Memory bandwidth (STREAM-style)
+# copy: c = a   scale: b = q·c   add: c = a + b   triad: a = b + q·c
+# Buffers are bytearrays accessed through memoryviews. copy is a straight
+# memcpy and is the only kernel that runs at memory speed, so it is the
+# headline and the score. The stdlib has no vectorised arithmetic: scale runs
+# through bytes.translate (a per-byte q·x table) and add / triad through
+# big-int arithmetic on cache-sized chunks, whose carries cross byte
+# boundaries. Those three are compute-bound and are reported as effective
+# rates for comparing machines, not as bandwidth. Bytes are counted the way
+# STREAM counts them. The kernels live in quickbench_kernels.
+# ---------------------------------------------------------------------------
+
+MEMORY_HEADLINE        = "copy"      # the one kernel bound by memory traffic
+MEMORY_PASSES          = 5           # best pass is reported (STREAM's NTIMES is 10;
+                                     # 5 keeps runs short on large-LLC servers)
+MEMORY_MIN_ARRAY_BYTES = 16 * 1024 ** 2
+
+
+def detect_llc_bytes():
+    """Size of the last-level CPU cache in bytes, or None if unknown."""
+    if sys.platform.startswith("linux"):
+        best_level, best_size = -1, None
+        base = "/sys/devices/system/cpu/cpu0/cache"
+        try:
+            entries = os.listdir(base)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.startswith("index"):
+                continue
+            try:
+                with open(os.path.join(base, entry, "level"), encoding="utf-8") as f:
+                    level = int(f.read().strip())
+                with open(os.path.join(base, entry, "size"), encoding="utf-8") as f:
+                    raw = f.read().strip().upper()
+            except (OSError, ValueError):
+                continue
+            m = re.match(r"(\d+)([KMG]?)", raw)
+            if not m:
+                continue
+            size = int(m.group(1)) * {"": 1, "K": 1024, "M": 1024 ** 2,
+                                      "G": 1024 ** 3}[m.group(2)]
+            if level > best_level:
+                best_level, best_size = level, size
+        return best_size
+    if sys.platform == "darwin":
+        for key in ("hw.l3cachesize", "hw.l2cachesize"):
+            value = run_command(["sysctl", "-n", key])
+            if value.isdigit() and int(value) > 0:
+                return int(value)
+    return None
+
 
+def memory_array_bytes(processes: int):
+    """Per-process array size: ≥ 4× LLC in total (the STREAM rule), capped so
+    all 3 arrays in every process fit in a quarter of the available RAM."""
+    llc       = detect_llc_bytes() or 32 * 1024 ** 2
+    wanted    = max(MEMORY_MIN_ARRAY_BYTES, 4 * llc // max(1, processes))
+    available = PSUTIL.virtual_memory().available
+    cap       = available // 4 // (3 * max(1, processes))
+    size      = max(1024 ** 2, min(wanted, cap))
+    return size - size % MEMORY_CHUNK, llc
 
-def score_multi_core(batches: int, effective_batch_size: int, seconds: float) -> int:
-    if seconds <= 0 or batches <= 0 or effective_batch_size <= 0:
+
+def score_memory(gb_per_second: float) -> int:
+    if gb_per_second <= 0:
         return 0
-    items_per_second = (batches * effective_batch_size) / seconds
-    return int(items_per_second / 1_000)
+    return int(gb_per_second * 100)
+
+
+def format_memory_result(result):
+    lines = [f"{'Kernel':<7}{'1 core':>11}{'all cores':>12}"]
+    for kernel in MEMORY_KERNELS:
+        single = result["single_gbps"].get(kernel)
+        multi  = result["multi_gbps"].get(kernel)
+        name   = kernel if kernel == MEMORY_HEADLINE else kernel + "*"
+        lines.append(
+            f"{name:<7}"
+            f"{f'{single:.2f} GB/s' if single is not None else '—':>11}"
+            f"{f'{multi:.2f} GB/s' if multi is not None else '—':>12}")
+    lines += [
+        "* compute-bound in CPython: effective rate, not memory bandwidth",
+        f"Processes: {result['processes']}",
+        f"Buffers: 3 × {bytes_to_mb_string(result['single_array_bytes'])} (1 core), "
+        f"3 × {bytes_to_mb_string(result['multi_array_bytes'])} per process",
+        f"Last-level cache: {bytes_to_mb_string(result['llc_bytes'])}",
+        f"Runtime: {result['elapsed']:.2f}s",
+        f"Memory score ({MEMORY_HEADLINE}): {result['score']}",
+    ]
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# History persistence
+# Module-level so the GUI and the headless runner write identical rows.
+# Rows live in SQLite: the machine-describing fields are stored once per
+# hardware fingerprint in `machines`, everything else in `results`, which is
+# indexed by timestamp, type and machine. A save is one indexed INSERT
+# instead of a rewrite of the whole history, and WAL journaling keeps the
+# file intact if the app dies mid-write.
+# ---------------------------------------------------------------------------
+
+# Row fields that describe the machine rather than the run.
+HISTORY_MACHINE_FIELDS = (
+    "machine_name", "model", "cpu_name", "gpu_name", "gpu_vram", "gpu_cores",
+    "cpu_frequency", "cpu_physical_cores", "cpu_logical_threads", "installed_ram",
+    "ram_type", "ram_speed", "system",
+)
+# The hardware that identifies a machine: the fields hardware_fingerprint()
+# hashes (CPU, core counts, RAM, model). An OS or driver update is the same
+# machine; `machines` keeps its latest description and each result keeps its
+# own copy of the other fields.
+MACHINE_IDENTITY_FIELDS = (
+    "model", "cpu_name", "cpu_physical_cores", "cpu_logical_threads", "installed_ram",
+)
+MACHINE_KEY_VERSION = "2"        # bump to re-key machines when the identity changes
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    id          INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    info        TEXT NOT NULL,
+    model       TEXT,
+    cpu_name    TEXT,
+    gpu_name    TEXT,
+    ram_bytes   INTEGER,
+    freq_mhz    REAL,
+    cores       INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    id         INTEGER PRIMARY KEY,
+    timestamp  TEXT NOT NULL,
+    type       TEXT NOT NULL,
+    workload   TEXT,
+    score      INTEGER,
+    machine_id INTEGER NOT NULL REFERENCES machines(id),
+    data       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_time    ON results(timestamp);
+CREATE INDEX IF NOT EXISTS results_by_type    ON results(type, timestamp);
+CREATE INDEX IF NOT EXISTS results_by_machine ON results(machine_id, timestamp);
+CREATE INDEX IF NOT EXISTS results_by_score   ON results(score);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS baselines (
+    key    TEXT PRIMARY KEY,
+    scores TEXT NOT NULL
+);
+"""
+
+
+def _whole_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Sortable machine fields, stored as columns next to the JSON info so the
+# history sorts on numbers ("8 GB" before "16 GB") through an index.
+# column -> (SQL type, value from the machine info)
+_MACHINE_SORT_COLUMNS = {
+    "model":     ("TEXT",    lambda info: info.get("model")),
+    "cpu_name":  ("TEXT",    lambda info: info.get("cpu_name")),
+    "gpu_name":  ("TEXT",    lambda info: info.get("gpu_name")),
+    "ram_bytes": ("INTEGER", lambda info: gb_string_to_bytes(info.get("installed_ram"))),
+    "freq_mhz":  ("REAL",    lambda info: frequency_string_to_mhz(info.get("cpu_frequency"))),
+    "cores":     ("INTEGER", lambda info: _whole_or_none(info.get("cpu_physical_cores"))),
+}
+
+
+def machine_fingerprint(row):
+    """Stable id for the machine a history row (or its machine fields) came from."""
+    info = {field: row.get(field) for field in MACHINE_IDENTITY_FIELDS}
+    return hashlib.sha256(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _open_history_db(path=None):
+    """Connect for writing: create or upgrade the schema and import the legacy
+    JSON file on first use. Readers use _open_history_reader instead."""
+    conn = sqlite3.connect(path or HISTORY_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_HISTORY_SCHEMA)
+    _upgrade_machines(conn)
+    _rekey_machines(conn)
+    _migrate_json_history(conn)
+    _build_baselines(conn)
+    return conn
+
+
+def _connect_history_readonly(path):
+    """Read-only connection: no schema, migration or backfill, and no writes."""
+    return sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro",
+                           uri=True)
+
+
+def _upgrade_machines(conn, schema="main"):
+    """Add the sort columns to a machines table from before they existed,
+    fill them from its info, and index them."""
+    have    = {row[1] for row in conn.execute(f"PRAGMA {schema}.table_info(machines)")}
+    missing = [column for column in _MACHINE_SORT_COLUMNS if column not in have]
+    if missing:
+        with conn:
+            for column in missing:
+                conn.execute(f"ALTER TABLE {schema}.machines ADD COLUMN "
+                             f"{column} {_MACHINE_SORT_COLUMNS[column][0]}")
+            assignments = ", ".join(f"{column} = ?" for column in _MACHINE_SORT_COLUMNS)
+            conn.executemany(
+                f"UPDATE {schema}.machines SET {assignments} WHERE id = ?",
+                [(*_machine_sort_values(json.loads(info)), machine_id) for machine_id, info
+                 in conn.execute(f"SELECT id, info FROM {schema}.machines").fetchall()])
+    for column in _MACHINE_SORT_COLUMNS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.machines_by_{column} "
+                     f"ON machines({column})")
+
+
+def _rekey_machines(conn):
+    """Merge machines that differ only outside MACHINE_IDENTITY_FIELDS (older
+    keys hashed the OS release too), once per MACHINE_KEY_VERSION. Each result
+    first takes a copy of the machine fields it no longer gets from its row."""
+    keyed = conn.execute("SELECT value FROM meta WHERE key = 'machine_key'").fetchone()
+    if keyed and keyed[0] == MACHINE_KEY_VERSION:
+        return
+    kept = {}       # fingerprint -> id of the machine row that stays
+    with conn:
+        for machine_id, info in conn.execute(
+                "SELECT id, info FROM machines ORDER BY id").fetchall():
+            info  = json.loads(info)
+            extra = {k: info.get(k) for k in HISTORY_MACHINE_FIELDS
+                     if k not in MACHINE_IDENTITY_FIELDS}
+            conn.executemany(
+                "UPDATE results SET data = ? WHERE id = ?",
+                [(json.dumps({**extra, **json.loads(data)}), result_id) for result_id, data
+                 in conn.execute("SELECT id, data FROM results WHERE machine_id = ?",
+                                 (machine_id,)).fetchall()])
+            fingerprint = machine_fingerprint(info)
+            if fingerprint in kept:
+                conn.execute("UPDATE results SET machine_id = ? WHERE machine_id = ?",
+                             (kept[fingerprint], machine_id))
+                conn.execute("DELETE FROM machines WHERE id = ?", (machine_id,))
+                _update_machine(conn, kept[fingerprint], info)     # later row is newer
+            else:
+                kept[fingerprint] = machine_id
+                conn.execute("UPDATE machines SET fingerprint = ? WHERE id = ?",
+                             (fingerprint, machine_id))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('machine_key', ?)",
+                     (MACHINE_KEY_VERSION,))
+
+
+def _update_machine(conn, machine_id, info):
+    assignments = ", ".join(f"{column} = ?" for column in _MACHINE_SORT_COLUMNS)
+    conn.execute(f"UPDATE machines SET info = ?, {assignments} WHERE id = ?",
+                 (json.dumps(info), *_machine_sort_values(info), machine_id))
+
+
+def _machine_sort_values(info):
+    return tuple(value(info) for _, value in _MACHINE_SORT_COLUMNS.values())
+
+
+def _open_history_reader(path=None):
+    """Read-only connection for browsing the history, or None if there is none.
+
+    A database from before the machine sort columns gets them in a TEMP copy
+    of its (small) machines table, which shadows the original for this
+    connection only, so reading never writes the file.
+    """
+    path = path or HISTORY_DB
+    if not os.path.exists(path):
+        return None
+    conn = _connect_history_readonly(path)
+    have = {row[1] for row in conn.execute("PRAGMA main.table_info(machines)")}
+    if not have:
+        conn.close()
+        return None
+    if any(column not in have for column in _MACHINE_SORT_COLUMNS):
+        conn.execute("CREATE TEMP TABLE machines (id INTEGER PRIMARY KEY, "
+                     "fingerprint TEXT, info TEXT)")
+        conn.execute("INSERT INTO temp.machines SELECT id, fingerprint, info "
+                     "FROM main.machines")
+        _upgrade_machines(conn, "temp")
+    return conn
+
+
+def import_legacy_history():
+    """Import a pre-3.1 JSON history now if one is waiting, so the History
+    window shows it before the first new result is saved."""
+    if os.path.exists(HISTORY_FILE):
+        _open_history_db().close()
+
+
+def _migrate_json_history(conn, legacy_path=None):
+    legacy_path = legacy_path or HISTORY_FILE
+    if not os.path.exists(legacy_path):
+        return
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_json_migrated'").fetchone():
+        return
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except (OSError, ValueError):
+        rows = []
+    with conn:
+        for row in rows if isinstance(rows, list) else []:
+            if isinstance(row, dict):
+                _insert_history_row(conn, row)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) "
+                     "VALUES ('legacy_json_migrated', ?)", (legacy_path,))
+    try:
+        os.replace(legacy_path, legacy_path + ".migrated")
+    except OSError:
+        pass        # the meta flag already prevents a second import
+
+
+def _insert_history_row(conn, row):
+    info        = {field: row.get(field) for field in HISTORY_MACHINE_FIELDS}
+    fingerprint = machine_fingerprint(info)
+    conn.execute("INSERT OR IGNORE INTO machines (fingerprint, info) VALUES (?, ?)",
+                 (fingerprint, json.dumps(info)))
+    (machine_id,) = conn.execute("SELECT id FROM machines WHERE fingerprint = ?",
+                                 (fingerprint,)).fetchone()
+    _update_machine(conn, machine_id, info)     # the latest OS, clock, GPU, …
+    data = {k: v for k, v in row.items() if k not in MACHINE_IDENTITY_FIELDS}
+    conn.execute(
+        "INSERT INTO results (timestamp, type, workload, score, machine_id, data) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (row.get("timestamp", ""), row.get("type", ""), row.get("workload"),
+         row.get("score"), machine_id, json.dumps(data)))
+
+
+# Sortable history columns -> SQL. Every one is indexed: result columns on
+# results, machine columns on machines (then a machine's results are read in
+# timestamp order through results_by_machine).
+HISTORY_SORT_COLUMNS = {
+    "timestamp":     "r.timestamp",
+    "type":          "r.type",
+    "score":         "r.score",
+    "model":         "m.model",
+    "cpu":           "m.cpu_name",
+    "gpu":           "m.gpu_name",
+    "ram_installed": "m.ram_bytes",
+    "cores":         "m.cores",
+    "freq":          "m.freq_mhz",
+}
+
+
+def _history_where(benchmark_type=None, fingerprint=None, since=None, before=None):
+    """WHERE clause and parameters for the indexed history filters."""
+    clauses, params = [], []
+    if benchmark_type is not None:
+        clauses.append("r.type = ?")
+        params.append(benchmark_type)
+    if fingerprint is not None:
+        clauses.append("m.fingerprint = ?")
+        params.append(fingerprint)
+    if since is not None:
+        clauses.append("r.timestamp >= ?")
+        params.append(since)
+    if before is not None:
+        clauses.append("r.timestamp < ?")
+        params.append(before)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def query_history(benchmark_type=None, fingerprint=None, since=None, before=None,
+                  sort="timestamp", descending=False, limit=None, offset=0, path=None,
+                  conn=None):
+    """History rows matching the filters, each a full row dict as built by
+    build_history_row plus its "fingerprint".
+
+    `since` is an inclusive and `before` an exclusive timestamp bound; both
+    compare as "YYYY-MM-DD HH:MM:SS" strings, so a bare date works too.
+    Reads through `conn` when given (and leaves it open).
+    """
+    where, params = _history_where(benchmark_type, fingerprint, since, before)
+    order  = "DESC" if descending else "ASC"
+    column = HISTORY_SORT_COLUMNS[sort]
+    # Machine sorts break ties per machine, in the order results_by_machine
+    # already holds its rows.
+    ties   = "" if column.startswith("r.") else f"m.id {order}, r.timestamp {order}, "
+    sql = ("SELECT m.fingerprint, m.info, r.data FROM results r "
+           "JOIN machines m ON m.id = r.machine_id" + where +
+           f" ORDER BY {column} {order}, {ties}r.id {order}")
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [int(limit), int(offset)]
+    own = conn is None
+    if own:
+        conn = _open_history_reader(path)
+        if conn is None:
+            return []
+    try:
+        return [{**json.loads(info), **json.loads(data), "fingerprint": fp}
+                for fp, info, data in conn.execute(sql, params)]
+    finally:
+        if own:
+            conn.close()
+
+
+def count_history(benchmark_type=None, fingerprint=None, since=None, before=None,
+                  path=None, conn=None):
+    where, params = _history_where(benchmark_type, fingerprint, since, before)
+    own = conn is None
+    if own:
+        conn = _open_history_reader(path)
+        if conn is None:
+            return 0
+    try:
+        return conn.execute("SELECT COUNT(*) FROM results r "
+                            "JOIN machines m ON m.id = r.machine_id" + where,
+                            params).fetchone()[0]
+    finally:
+        if own:
+            conn.close()
+
+
+def history_types(path=None):
+    """Distinct benchmark types in the history (read from the type index)."""
+    conn = _open_history_reader(path)
+    if conn is None:
+        return []
+    try:
+        return [t for (t,) in conn.execute("SELECT DISTINCT type FROM results ORDER BY type")]
+    finally:
+        conn.close()
+
+
+def history_machines(path=None):
+    """[(fingerprint, label)] for every machine with saved results."""
+    conn = _open_history_reader(path)
+    if conn is None:
+        return []
+    try:
+        machines = [(fp, json.loads(info)) for fp, info in
+                    conn.execute("SELECT fingerprint, info FROM machines ORDER BY id")]
+    finally:
+        conn.close()
+    named = []
+    for fp, info in machines:
+        name = info.get("model") or info.get("machine_name") or "Unknown"
+        named.append((fp, f"{name} — {info['cpu_name']}" if info.get("cpu_name") else name))
+    labels = [label for _, label in named]
+    # Same model and CPU but different RAM/GPU: tell them apart by fingerprint.
+    out = [(fp, label if labels.count(label) == 1 else f"{label} ({fp[:6]})")
+           for fp, label in named]
+    return out
+
+
+class HistoryPager:
+    """Random access to a filtered, sorted history, fetched a page at a time.
+
+    The history window asks for the rows it is about to show; only pages that
+    were touched are read, and at most `max_pages` stay cached. All reads go
+    through one read-only connection, opened here and released by close().
+    """
+
+    PAGE_ROWS = 200
+
+    def __init__(self, filters=None, sort="timestamp", descending=True,
+                 max_pages=8, path=None):
+        self.filters    = dict(filters or {})
+        self.sort       = sort
+        self.descending = descending
+        self.max_pages  = max_pages
+        self.path       = path
+        self._conn      = _open_history_reader(path)
+        self.total      = (count_history(conn=self._conn, **self.filters)
+                           if self._conn is not None else 0)
+        self._pages     = {}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def rows(self, start, count):
+        """Rows [start, start + count), clipped to the history size."""
+        stop = min(self.total, start + count)
+        out  = []
+        for index in range(max(0, start), stop):
+            page = self._page(index // self.PAGE_ROWS)
+            offset = index % self.PAGE_ROWS
+            if offset >= len(page):
+                break
+            out.append(page[offset])
+        return out
+
+    def _page(self, number):
+        page = self._pages.pop(number, None)
+        if page is None:
+            page = ([] if self._conn is None else
+                    query_history(sort=self.sort, descending=self.descending,
+                                  limit=self.PAGE_ROWS, offset=number * self.PAGE_ROWS,
+                                  conn=self._conn, **self.filters))
+            while len(self._pages) >= self.max_pages:
+                self._pages.pop(next(iter(self._pages)))
+        self._pages[number] = page      # most recently used goes last
+        return page
+
+
+def build_history_row(system_info, benchmark_type, result):
+    return {
+        "timestamp":           datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "machine_name":        system_info["label"],
+        "model":               system_info["model"],
+        "cpu_name":            system_info["cpu"],
+        "gpu_name":            system_info["gpu"],
+        "gpu_vram":            system_info["gpu_vram"],
+        "gpu_cores":           system_info["gpu_cores"],
+        "cpu_frequency":       system_info["cpu_frequency"],
+        "cpu_physical_cores":  system_info["cpu_cores_physical"],
+        "cpu_logical_threads": system_info["cpu_cores_logical"],
+        "installed_ram":       system_info["ram"],
+        "ram_type":            system_info["ram_type"],
+        "ram_speed":           system_info["ram_speed"],
+        "type":                benchmark_type,
+        "workload":            result.get("workload", DEFAULT_WORKLOAD),
+        "score":               result.get("score", 0),
+        "system":              system_info["platform_name"],
+        "python":              platform.python_version(),
+        "avg_cpu":             round(float(result.get("avg_cpu", 0.0)), 1),
+        "ram":                 round(float(result.get("ram",     0.0)), 1),
+        "details":             result,
+    }
+
+
+def _workload_label(result):
+    """Display label for the workload a result (or its details dict) used."""
+    name = result.get("workload", DEFAULT_WORKLOAD)
+    return WORKLOADS[name].label if name in WORKLOADS else name
+
+
+def _history_test_label(row):
+    """Test column text: the benchmark type, plus the workload if not sort."""
+    workload = row.get("workload", DEFAULT_WORKLOAD)
+    if workload == DEFAULT_WORKLOAD:
+        return row.get("type", "")
+    return f"{row.get('type', '')} · {workload}"
+
+
+def append_history_row(row, path=None, threshold=None):
+    """Save row and roll it into its baseline. Returns the verdict on row
+    against the results saved before it (see judge_score), which is also
+    stored in the row as "baseline"."""
+    conn = _open_history_db(path)
+    try:
+        with conn:
+            verdict = _update_baseline(conn, row, threshold)
+            row["baseline"] = verdict
+            _insert_history_row(conn, row)
+    finally:
+        conn.close()
+    return verdict
+
+
+# ---------------------------------------------------------------------------
+# Regression baselines
+# Each machine / test / workload keeps the scores of its last
+# REGRESSION_WINDOW saved runs. A new score is judged against their median
+# before it joins the window: it is a regression when it falls below the
+# median by more than REGRESSION_SIGMAS robust standard deviations
+# (1.4826 × MAD), and never for a drop smaller than the threshold percent.
+# The key leaves out the OS and Python version on purpose: those upgrades
+# are exactly what the baseline should catch.
+# ---------------------------------------------------------------------------
+
+REGRESSION_WINDOW      = 20
+REGRESSION_MIN_SAMPLES = 5       # earlier runs needed before judging a new one
+REGRESSION_SIGMAS      = 3.0
+REGRESSION_THRESHOLD   = 5.0     # % of the median; the narrowest band allowed
+REGRESSION_EXIT_CODE   = 3       # headless exit status when a result regressed
+
+BASELINE_MACHINE_FIELDS = (
+    "machine_name", "model", "cpu_name", "cpu_physical_cores",
+    "cpu_logical_threads", "installed_ram",
+)
+
+# Result options that change what a score measures, per test type. Runs that
+# differ in any of them keep separate baselines (a GIL-bound threads run
+# scores about 1/N of a process run). Values missing from older rows take the
+# default they ran with.
+BASELINE_OPTION_FIELDS = {
+    "single":  ("items", "trials"),
+    "multi":   ("backend", "pin", "dataset", "batch_size", "trials"),
+    "sweep":   ("pin", "dataset", "batch_size"),
+    "percore": ("dataset", "batch_size"),
+    "memory":  ("headline",),
+    "numpy":   ("items", "batch_size"),
+}
+_BASELINE_OPTION_DEFAULTS = {"backend": "processes", "pin": False, "dataset": "private",
+                             "trials": 1, "headline": "triad"}
+BASELINE_KEY_VERSION = "2"       # bump to rebuild the baselines when the key changes
+
+
+def baseline_options(row):
+    """The score-relevant options of a row, from its details."""
+    details = row.get("details") or {}
+    options = {}
+    for field in BASELINE_OPTION_FIELDS.get(row.get("type"), ()):
+        value = details.get(field)
+        if field == "trials" and isinstance(value, dict):
+            value = value.get("count")
+        options[field] = _BASELINE_OPTION_DEFAULTS.get(field) if value is None else value
+    return options
+
+
+def options_label(options):
+    """"backend=threads, pin=False, …" for a baseline_options() dict; runs with
+    the same label measured the same thing."""
+    return ", ".join(f"{field}={value}" for field, value in options.items())
+
+
+def baseline_key(row):
+    parts = [row.get(field) for field in BASELINE_MACHINE_FIELDS]
+    parts += [row.get("type"), row.get("workload"), baseline_options(row)]
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def judge_score(score, scores, threshold=None):
+    """Verdict on score given earlier scores (oldest first).
+
+    status is "learning" until REGRESSION_MIN_SAMPLES runs exist, then
+    "ok", "regression" or "improvement" with the median, band and change %.
+    """
+    threshold = REGRESSION_THRESHOLD if threshold is None else threshold
+    verdict   = {"status": "learning", "samples": len(scores)}
+    if score is None or len(scores) < REGRESSION_MIN_SAMPLES:
+        return verdict
+    median = statistics.median(scores)
+    mad    = statistics.median(abs(s - median) for s in scores)
+    half   = max(REGRESSION_SIGMAS * 1.4826 * mad, abs(median) * threshold / 100.0)
+    low, high = median - half, median + half
+    verdict.update(
+        status="regression" if score < low else "improvement" if score > high else "ok",
+        median=median,
+        low=round(low, 1),
+        high=round(high, 1),
+        change=round((score - median) / median * 100.0, 1) if median else 0.0,
+    )
+    return verdict
+
+
+def _update_baseline(conn, row, threshold=None):
+    key    = baseline_key(row)
+    found  = conn.execute("SELECT scores FROM baselines WHERE key = ?", (key,)).fetchone()
+    scores = json.loads(found[0]) if found else []
+    verdict = judge_score(row.get("score"), scores, threshold)
+    if row.get("score") is not None:
+        scores = (scores + [row["score"]])[-REGRESSION_WINDOW:]
+        conn.execute("INSERT OR REPLACE INTO baselines (key, scores) VALUES (?, ?)",
+                     (key, json.dumps(scores)))
+    return verdict
+
+
+def _build_baselines(conn):
+    """Fill the baselines from the saved rows, once per BASELINE_KEY_VERSION."""
+    built = conn.execute("SELECT value FROM meta WHERE key = 'baselines_built'").fetchone()
+    if built and built[0] == BASELINE_KEY_VERSION:
+        return
+    windows = {}
+    for info, data in conn.execute(
+            "SELECT m.info, r.data FROM results r JOIN machines m ON m.id = r.machine_id "
+            "ORDER BY r.timestamp, r.id"):
+        row = {**json.loads(info), **json.loads(data)}
+        if row.get("score") is not None:
+            window = windows.setdefault(baseline_key(row), [])
+            window.append(row["score"])
+            del window[:-REGRESSION_WINDOW]
+    with conn:
+        conn.execute("DELETE FROM baselines")
+        conn.executemany("INSERT OR REPLACE INTO baselines (key, scores) VALUES (?, ?)",
+                         [(key, json.dumps(scores)) for key, scores in windows.items()])
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('baselines_built', ?)",
+                     (BASELINE_KEY_VERSION,))
+
+
+def check_baseline(row, path=None, threshold=None):
+    """Verdict on row without saving it (headless --no-history).
+
+    Opens the database read-only and never migrates or backfills it; with no
+    database, no baselines table or baselines from an older key version the
+    verdict is "learning".
+    """
+    path  = path or HISTORY_DB
+    found = None
+    if os.path.exists(path):
+        conn = _connect_history_readonly(path)
+        try:
+            built = conn.execute(
+                "SELECT value FROM meta WHERE key = 'baselines_built'").fetchone()
+            if built and built[0] == BASELINE_KEY_VERSION:
+                found = conn.execute("SELECT scores FROM baselines WHERE key = ?",
+                                     (baseline_key(row),)).fetchone()
+        except sqlite3.OperationalError:
+            pass        # no meta / baselines table yet
+        finally:
+            conn.close()
+    return judge_score(row.get("score"), json.loads(found[0]) if found else [], threshold)
+
+
+def format_baseline(verdict):
+    status = verdict["status"]
+    if status == "learning":
+        return (f"Baseline: learning ({verdict['samples']} of {REGRESSION_MIN_SAMPLES} "
+                f"earlier runs on this machine)")
+    detail = (f"{verdict['change']:+.1f}% vs median {verdict['median']:g} of the last "
+              f"{verdict['samples']} runs (normal {verdict['low']:g}–{verdict['high']:g})")
+    if status == "regression":
+        return f"⚠ Regression: {detail}"
+    if status == "improvement":
+        return f"Baseline: improvement, {detail}"
+    return f"Baseline: normal, {detail}"
 
 
 # ---------------------------------------------------------------------------
 # ScrollableFrame
 # ---------------------------------------------------------------------------
 
-class ScrollableFrame(ttk.Frame):
+class ScrollableFrame:
+    # Wraps a ttk.Frame rather than subclassing it: the base class would have
+    # to exist at import time, and tkinter is only loaded when the GUI starts.
     def __init__(self, master):
-        super().__init__(master)
-        self.canvas    = tk.Canvas(self, highlightthickness=0)
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.frame     = ttk.Frame(master)
+        self.canvas    = tk.Canvas(self.frame, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical",
+                                       command=self.canvas.yview)
         self.inner     = ttk.Frame(self.canvas)
 
         self.inner.bind(
@@ -1388,8 +2374,8 @@ class ScrollableFrame(ttk.Frame):
 
         self.canvas.grid(row=0, column=0, sticky="nsew")
         self.scrollbar.grid(row=0, column=1, sticky="ns")
-        self.rowconfigure(0, weight=1)
-        self.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
 
         self.canvas.bind("<Configure>", self._on_canvas_configure)
 
@@ -1405,6 +2391,9 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.bind_all("<Button-4>", self._on_mousewheel_linux)
         self.canvas.bind_all("<Button-5>", self._on_mousewheel_linux)
 
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
     def _pointer_in_canvas(self, event):
         """Return True only if the pointer is within our canvas boundaries."""
         try:
@@ -1450,253 +2439,1920 @@ class ScrollableFrame(ttk.Frame):
 
 
 # ---------------------------------------------------------------------------
-# BenchmarkWorker
+# Multi-core per-worker counters
+# Each worker owns one 64-byte slot (8 × int64) of a shared lock-free array,
+# so workers never contend on a lock or share a cache line; the parent sums
+# the slots. Durations are perf_counter_ns deltas; the heartbeat is
+# monotonic_ns, which is system-wide and comparable across processes. The
+# slot layout (WORKER_SLOT_STRIDE, SLOT_*) is defined in quickbench_kernels.
 # ---------------------------------------------------------------------------
 
-class BenchmarkWorker:
-    def __init__(self, event_queue: queue.Queue):
-        self.event_queue      = event_queue
-        self.cancel_event     = threading.Event()
-        self.thread           = None
-        self.monitor_thread   = None
-        self.monitor_stop     = threading.Event()
-        self.cpu_samples      = []
-        self.multi_stop_event = None
-        self.processes        = []
-        self.batch_counter    = None
+def total_batches(slots, worker_count):
+    if slots is None:
+        return 0
+    return sum(slots[i * WORKER_SLOT_STRIDE + SLOT_BATCHES] for i in range(worker_count))
+
+
+def summarize_worker_slots(slots, processes, alive_at_stop, stop_ns):
+    workers = []
+    for index, process in enumerate(processes):
+        base      = index * WORKER_SLOT_STRIDE
+        batches   = slots[base + SLOT_BATCHES]
+        heartbeat = slots[base + SLOT_HEARTBEAT_NS]
+        workers.append({
+            "index":          index,
+            "batches":        batches,
+            "mean_batch_ms":  slots[base + SLOT_TOTAL_NS] / batches / 1e6 if batches else None,
+            "min_batch_ms":   slots[base + SLOT_MIN_NS] / 1e6 if batches else None,
+            "max_batch_ms":   slots[base + SLOT_MAX_NS] / 1e6 if batches else None,
+            # Seconds between the worker's last finished batch and the stop
+            # signal — large values flag a stalled or starved worker.
+            "last_batch_age": (stop_ns - heartbeat) / 1e9 if heartbeat else None,
+            "alive_at_stop":  alive_at_stop[index],
+            "exitcode":       getattr(process, "exitcode", None),
+        })
+    return workers
 
-    def is_running(self):
-        return self.thread is not None and self.thread.is_alive()
 
-    def start(self, benchmark_type: str, single_numbers: int,
-              multi_duration: int, multi_batch: int):
-        if self.is_running():
-            return
-        self.cancel_event.clear()
-        self.monitor_stop.clear()
-        self.cpu_samples = []
-        self.thread = threading.Thread(
-            target=self._run,
-            args=(benchmark_type, single_numbers, multi_duration, multi_batch),
-            daemon=True,
-        )
-        self.thread.start()
+def format_worker_balance(result):
+    workers = result.get("workers") or []
+    if not workers:
+        return "Per-worker batches: —"
+    counts = [w["batches"] for w in workers]
+    text = (f"Per-worker batches: {min(counts)}–{max(counts)} "
+            f"(spread {result.get('imbalance', 0.0):.1f}%)")
+    dead = result.get("dead_workers") or []
+    if dead:
+        text += f"\nDead workers: {', '.join(str(i) for i in dead)}"
+    return text
 
-    def cancel(self):
-        self.cancel_event.set()
-        if self.multi_stop_event is not None:
-            self.multi_stop_event.set()
 
-    def join(self, timeout=None):
-        """Block until the worker thread finishes (used during shutdown)."""
-        if self.thread is not None:
-            self.thread.join(timeout=timeout)
+def format_dataset(result):
+    if result.get("dataset") != "shared":
+        return "Input: generated per batch by each worker"
+    return (f"Input: {result['shared_items']:,} items pre-generated in shared memory "
+            f"({result['generation_time']:.2f}s, not timed)")
 
-    # ------------------------------------------------------------------
 
-    def _monitor_usage(self):
-        while not self.monitor_stop.is_set() and not self.cancel_event.is_set():
-            try:
-                cpu = PSUTIL.cpu_percent(interval=0.25)
-                mem = PSUTIL.virtual_memory().percent
-                self.cpu_samples.append(cpu)
-                if len(self.cpu_samples) > 20:
-                    self.cpu_samples.pop(0)
-                avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
-                           if self.cpu_samples else 0.0)
-                self.event_queue.put(("usage", avg_cpu, mem))
-            except Exception:
-                # FIX: transient psutil failures (e.g. permission errors on
-                # Linux) must not trigger an error dialog — just stop monitoring.
-                break
+def worker_imbalance(workers):
+    """Spread of per-worker batch counts as a percentage of the mean."""
+    counts = [w["batches"] for w in workers]
+    if not counts or sum(counts) == 0:
+        return 0.0
+    mean = sum(counts) / len(counts)
+    return round((max(counts) - min(counts)) / mean * 100, 1)
 
-    def _run(self, benchmark_type: str, single_numbers: int,
-             multi_duration: int, multi_batch: int):
-        self.monitor_thread = threading.Thread(target=self._monitor_usage, daemon=True)
-        self.monitor_thread.start()
-        try:
-            if benchmark_type == "single":
-                self._run_single(single_numbers)
-            elif benchmark_type == "multi":
-                self._run_multi(multi_duration, multi_batch)
-            else:
-                raise ValueError(f"Unknown benchmark type: {benchmark_type}")
-        except MemoryError:
-            self.event_queue.put(("error",
-                "The benchmark used more memory than your system could comfortably provide. "
-                "Try a smaller workload."))
-        except Exception as exc:
-            self.event_queue.put(("error", str(exc)))
-        finally:
-            self.monitor_stop.set()
-            if self.monitor_thread is not None:
-                self.monitor_thread.join(timeout=1.0)
-            self.event_queue.put(("done",))
 
-    # ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+# Trial statistics
+# Repeated runs are summarised with a t-based 95% confidence interval on the
+# mean; small trial counts need the t critical value, not the normal 1.96.
+# ---------------------------------------------------------------------------
+
+# Two-sided 95% Student-t critical values by degrees of freedom.
+_T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+         8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+         25: 2.060, 30: 2.042}
+
+
+# Per-run fields kept for each trial sample in the result details.
+_TRIAL_SAMPLE_KEYS = ("score", "sort_time", "generation_time", "elapsed",
+                      "batches", "imbalance", "peak_rss", "start_seconds",
+                      "teardown_seconds")
+
+
+def _t_critical_95(df):
+    if df > 30:
+        return 1.96
+    # Round down to the nearest tabulated df, which errs on the wide side.
+    return _T_95[max(k for k in _T_95 if k <= df)]
+
+
+def summarize_samples(values):
+    """min / max / median / mean / stdev / 95% CI of the mean / CV% of values."""
+    n     = len(values)
+    mean  = statistics.fmean(values)
+    stdev = statistics.stdev(values) if n > 1 else 0.0
+    half  = _t_critical_95(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n":      n,
+        "min":    min(values),
+        "max":    max(values),
+        "median": statistics.median(values),
+        "mean":   mean,
+        "stdev":  stdev,
+        "ci95":   [mean - half, mean + half],
+        "cv":     stdev / mean * 100 if mean else None,
+    }
+
+
+def format_trials(result):
+    """Result-panel lines for a trials run, or "" for a single measurement."""
+    trials = result.get("trials")
+    if not trials:
+        return ""
+    st  = trials["stats"]
+    cv  = f"{st['cv']:.1f}%" if st["cv"] is not None else "n/a"
+    text = (f"Trials: {trials['count']} measured + {trials['warmup']} warm-up\n"
+            f"Median {st['median']:.0f}   mean {st['mean']:.1f}   "
+            f"range {st['min']}–{st['max']}\n"
+            f"Std dev {st['stdev']:.1f}   95% CI {st['ci95'][0]:.1f}–{st['ci95'][1]:.1f}   "
+            f"CV {cv}")
+    if trials["noisy"]:
+        text += (f"\n⚠ Noisy: CV {cv} exceeds {trials['cv_threshold']:g}% — "
+                 "close background apps and re-run")
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Scaling sweep analysis
+# Amdahl:  S(n) = 1 / (s + (1 − s) / n)           s = serial fraction
+# USL:     S(n) = n / (1 + σ(n − 1) + κ·n(n − 1))  σ = contention, κ = coherency
+# Both are fitted by least squares on the points with n ≤ logical CPUs; the
+# oversubscribed 2N point is measured and shown but is not a model input.
+# ---------------------------------------------------------------------------
+
+def sweep_worker_counts(cpu_count):
+    counts = []
+    n = 1
+    while n < cpu_count:
+        counts.append(n)
+        n *= 2
+    counts.append(cpu_count)
+    counts.append(2 * cpu_count)
+    return counts
+
+
+def fit_amdahl(points):
+    """Serial fraction s in [0, 1] from (n, speedup) pairs, or None."""
+    # 1/S − 1/n = s · (1 − 1/n)  → one-parameter least squares through 0.
+    sxx = sxy = 0.0
+    for n, speedup in points:
+        if n <= 1 or speedup <= 0:
+            continue
+        x = 1 - 1 / n
+        y = 1 / speedup - 1 / n
+        sxx += x * x
+        sxy += x * y
+    if sxx == 0:
+        return None
+    return min(1.0, max(0.0, sxy / sxx))
+
+
+def fit_usl(points):
+    """(sigma, kappa) ≥ 0 from (n, speedup) pairs, or None."""
+    # n/S − 1 = σ(n − 1) + κ·n(n − 1)  → two-parameter least squares through 0.
+    rows = [(n - 1, n * (n - 1), n / speedup - 1)
+            for n, speedup in points if n > 1 and speedup > 0]
+    if not rows:
+        return None
+    a11 = sum(x1 * x1 for x1, _, _ in rows)
+    a12 = sum(x1 * x2 for x1, x2, _ in rows)
+    a22 = sum(x2 * x2 for _, x2, _ in rows)
+    b1  = sum(x1 * y for x1, _, y in rows)
+    b2  = sum(x2 * y for _, x2, y in rows)
+    det = a11 * a22 - a12 * a12
+    if len(rows) >= 2 and abs(det) > 1e-12:
+        sigma = (b1 * a22 - b2 * a12) / det
+        kappa = (a11 * b2 - a12 * b1) / det
+        if sigma >= 0 and kappa >= 0:
+            return sigma, kappa
+    # Degenerate or a negative coefficient: refit the single-term models
+    # and keep the better one.
+    candidates = []
+    if a11 > 0:
+        candidates.append((max(0.0, b1 / a11), 0.0))
+    if a22 > 0:
+        candidates.append((0.0, max(0.0, b2 / a22)))
+    if not candidates:
+        return None
+
+    def sse(coeffs):
+        sigma, kappa = coeffs
+        return sum((y - sigma * x1 - kappa * x2) ** 2 for x1, x2, y in rows)
+
+    return min(candidates, key=sse)
+
+
+def amdahl_speedup(n, serial):
+    return 1 / (serial + (1 - serial) / n)
+
+
+def usl_speedup(n, sigma, kappa):
+    return n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def scaling_curve(points, cpu_count):
+    """Speedup / efficiency per point plus Amdahl and USL fits."""
+    base = next((p["throughput"] for p in points if p["workers"] == 1), 0)
+    for p in points:
+        p["speedup"]    = p["throughput"] / base if base else 0.0
+        p["efficiency"] = p["speedup"] / p["workers"] if base else 0.0
+    in_range = [(p["workers"], p["speedup"]) for p in points if p["workers"] <= cpu_count]
+    serial   = fit_amdahl(in_range)
+    usl      = fit_usl(in_range)
+    peak     = None
+    if usl is not None and usl[1] > 0:
+        # Throughput under USL peaks at n* = sqrt((1 − σ) / κ).
+        peak = math.sqrt(max(0.0, 1 - usl[0]) / usl[1])
+    return {
+        "points":           points,
+        "amdahl_serial":    serial,
+        "usl_sigma":        usl[0] if usl else None,
+        "usl_kappa":        usl[1] if usl else None,
+        "usl_peak_workers": peak,
+    }
+
+
+CHART_HEIGHT = 190
+
+
+def sweep_chart(result):
+    """Chart spec for QuickBenchApp._draw_chart: measured vs modelled speedup."""
+    measured = [(p["workers"], p["speedup"]) for p in result["points"]]
+    if not measured:
+        return None
+    xs     = [n for n, _ in measured]
+    dense  = sorted(set(xs) | {2 ** (i / 4) for i in range(0, int(math.log2(max(xs)) * 4) + 1)})
+    series = [
+        {"label": "ideal", "color": "#9CA3AF", "dash": True,
+         "points": [(n, float(n)) for n in dense if n <= result["cores"]]},
+        {"label": "measured", "color": "#0A84FF", "markers": True, "points": measured},
+    ]
+    if result.get("amdahl_serial") is not None:
+        series.append({"label": "Amdahl", "color": "#F59E0B", "dash": True,
+                       "points": [(n, amdahl_speedup(n, result["amdahl_serial"]))
+                                  for n in dense]})
+    if result.get("usl_sigma") is not None:
+        series.append({"label": "USL", "color": "#10B981", "dash": True,
+                       "points": [(n, usl_speedup(n, result["usl_sigma"],
+                                                  result["usl_kappa"]))
+                                  for n in dense]})
+    return {"title": "Speedup vs workers", "x_label": "workers", "log_x": True,
+            "x_ticks": xs, "series": series}
+
+
+def format_sweep_result(result):
+    lines = [f"{'Workers':>7}{'Speedup':>9}{'Efficiency':>12}{'Score':>8}"]
+    for p in result["points"]:
+        lines.append(f"{p['workers']:>7}{p['speedup']:>8.2f}×"
+                     f"{p['efficiency'] * 100:>11.0f}%{p['score']:>8}")
+    if result.get("amdahl_serial") is not None:
+        lines.append(f"Amdahl serial fraction: {result['amdahl_serial'] * 100:.1f}%")
+    if result.get("usl_sigma") is not None:
+        lines.append(f"USL σ (contention): {result['usl_sigma']:.4f}   "
+                     f"κ (coherency): {result['usl_kappa']:.5f}")
+    if result.get("usl_peak_workers"):
+        lines.append(f"USL predicted peak: ~{result['usl_peak_workers']:.0f} workers")
+    lines.append(f"Step duration: {result['step_duration']}s")
+    if result.get("worker_pool"):
+        lines.append(format_worker_pool(result))
+    lines.append(f"Peak multi score: {result['score']}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Merge-pass profile display
+# A pass whose throughput falls well below the previous one marks a width
+# where the merged runs outgrew a cache level.
+# ---------------------------------------------------------------------------
+
+PASS_KNEE_DROP = 0.15     # fractional throughput drop that counts as a knee
+
+
+def format_short_count(value):
+    """1024 -> "1K", 2097152 -> "2M"; other values as plain numbers."""
+    for unit, scale in (("M", 1 << 20), ("K", 1 << 10)):
+        if value >= scale and value % scale == 0:
+            return f"{value // scale}{unit}"
+    return f"{value:g}"
+
+
+def pass_profile_knees(profile):
+    """Passes whose items/s dropped by PASS_KNEE_DROP or more vs the previous pass."""
+    knees = []
+    for prev, cur in zip(profile, profile[1:]):
+        if prev["items_per_s"] > 0:
+            drop = 1 - cur["items_per_s"] / prev["items_per_s"]
+            if drop >= PASS_KNEE_DROP:
+                knees.append({"width": cur["width"], "drop": drop})
+    return knees
+
+
+def pass_profile_chart(result):
+    """Chart spec for QuickBenchApp._draw_chart: merged items/s per pass width."""
+    profile = result.get("pass_profile")
+    if not profile:
+        return None
+    points = [(p["width"], p["items_per_s"] / 1e6) for p in profile]
+    step   = max(1, len(points) // 8)
+    return {"title": "Merge throughput per pass (M items/s)", "x_label": "run width",
+            "log_x": True, "x_ticks": [x for x, _ in points][::step],
+            "series": [{"label": "items/s", "color": "#0A84FF", "markers": True,
+                        "points": points}]}
+
+
+def format_pass_profile(result):
+    profile = result.get("pass_profile")
+    if not profile:
+        return ""
+    best  = max(profile, key=lambda p: p["items_per_s"])
+    worst = min(profile, key=lambda p: p["items_per_s"])
+    text  = (f"Per-pass merge rate: {best['items_per_s'] / 1e6:.2f}M items/s peak "
+             f"(width {format_short_count(best['width'])}), "
+             f"{worst['items_per_s'] / 1e6:.2f}M low "
+             f"(width {format_short_count(worst['width'])})")
+    knees = pass_profile_knees(profile)
+    if knees:
+        text += "\nThroughput drops at width " + ", ".join(
+            f"{format_short_count(k['width'])} (−{k['drop'] * 100:.0f}%)" for k in knees)
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Sustained-load timeline
+# During a multi-core window the parent records a sample once at least
+# TIMELINE_INTERVAL seconds and TIMELINE_MIN_BATCHES batches have passed:
+# the batches finished since the previous sample divided by the time between
+# the two samples' latest batch finishes (worker heartbeats), plus the mean
+# per-core clock and the hottest CPU temperature. Timing whole batches by
+# their finish times, with enough of them per sample, keeps batch
+# granularity from showing up as ±20–40% noise on a steady machine.
+# Peak and sustained are both rates over TIMELINE_SUSTAINED seconds (or a
+# third of a shorter run): peak is the best such window, sustained the last
+# one, so a machine that throttles part-way through shows a degradation.
+# ---------------------------------------------------------------------------
+
+TIMELINE_INTERVAL    = 1.0     # minimum seconds between samples
+TIMELINE_MIN_BATCHES = 20      # a sample waits until it holds this many batches
+TIMELINE_SUSTAINED   = 10      # seconds in the peak and sustained windows
+THROTTLE_FLAG        = 10.0    # degradation % reported as throttling
+
+# psutil.sensors_temperatures() keys for CPU packages, most specific first.
+CPU_TEMP_SENSORS = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal",
+                    "soc_thermal", "acpitz")
+
+
+def sample_cpu_clock():
+    """Mean current per-core clock in MHz, or None where psutil can't read it."""
+    try:
+        freqs = PSUTIL.cpu_freq(percpu=True)
+    except Exception:
+        return None
+    current = [f.current for f in freqs or () if f and f.current]
+    return sum(current) / len(current) if current else None
+
+
+def sample_cpu_temperature():
+    """Hottest CPU sensor reading in °C, or None (no sensors on Windows / macOS)."""
+    try:
+        sensors = PSUTIL.sensors_temperatures()
+    except Exception:
+        return None
+    if not sensors:
+        return None
+    for name in CPU_TEMP_SENSORS:
+        if sensors.get(name):
+            readings = sensors[name]
+            break
+    else:
+        readings = [r for entries in sensors.values() for r in entries]
+    temps = [r.current for r in readings if r.current]
+    return max(temps) if temps else None
+
+
+def last_batch_ns(slots, worker_count):
+    """Latest batch-finish heartbeat (monotonic_ns) across the workers, or 0."""
+    if slots is None:
+        return 0
+    return max((slots[i * WORKER_SLOT_STRIDE + SLOT_HEARTBEAT_NS]
+                for i in range(worker_count)), default=0)
+
+
+def sample_timeline(elapsed, batches, seconds, mhz=None, temp=None):
+    """One timeline point. `mhz` / `temp` are the latest readings the monitor
+    thread published, so no sensor is read inside the timed window."""
+    return {"t": round(elapsed, 2), "rate": batches / seconds,
+            "batches": batches, "seconds": seconds, "mhz": mhz, "temp": temp}
+
+
+def timeline_windows(series, window):
+    """(rate, seconds) for every run of consecutive samples ending at each
+    sample that spans at least `window` seconds, shortest run first."""
+    windows = []
+    first, batches, seconds = 0, 0, 0.0
+    for point in series:
+        batches += point["batches"]
+        seconds += point["seconds"]
+        while seconds - series[first]["seconds"] >= window:
+            batches -= series[first]["batches"]
+            seconds -= series[first]["seconds"]
+            first   += 1
+        if seconds >= window:
+            windows.append((batches / seconds, seconds))
+    return windows
+
+
+def summarize_timeline(series, score, mean_rate):
+    """Peak / sustained / degradation from a window's samples, plus the
+    compact columnar series stored in history. None with < 2 samples."""
+    if len(series) < 2 or mean_rate <= 0:
+        return None
+    window  = min(TIMELINE_SUSTAINED, sum(p["seconds"] for p in series) / 3)
+    windows = timeline_windows(series, window)
+    peak    = max(rate for rate, _ in windows)
+    sustained, sustained_seconds = windows[-1]
+    mhz       = [p["mhz"] for p in series if p["mhz"] is not None]
+    temps     = [p["temp"] for p in series if p["temp"] is not None]
+    degradation = (peak - sustained) / peak * 100 if peak > 0 else 0.0
+    return {
+        "peak_score":        round(score * peak / mean_rate),
+        "sustained_score":   round(score * sustained / mean_rate),
+        "sustained_seconds": round(sustained_seconds, 1),
+        "degradation":       round(degradation, 1),
+        "throttling":        degradation >= THROTTLE_FLAG,
+        "mhz_start":         round(mhz[0]) if mhz else None,
+        "mhz_end":           round(mhz[-1]) if mhz else None,
+        "temp_max":          round(max(temps), 1) if temps else None,
+        # Columnar, rounded: a 60 s run is a few hundred bytes in history.
+        "series": {
+            "t":    [p["t"] for p in series],
+            "rate": [round(p["rate"], 2) for p in series],
+            "mhz":  [round(p["mhz"]) if p["mhz"] is not None else None for p in series],
+            "temp": [round(p["temp"], 1) if p["temp"] is not None else None
+                     for p in series],
+        },
+    }
+
+
+def format_timeline(result):
+    timeline = result.get("timeline")
+    if not timeline:
+        return ""
+    text = (f"Peak score: {timeline['peak_score']}   "
+            f"sustained (last {timeline['sustained_seconds']:g}s): "
+            f"{timeline['sustained_score']}   "
+            f"degradation {timeline['degradation']:.1f}%")
+    details = []
+    if timeline["mhz_start"] is not None:
+        details.append(f"Clock {timeline['mhz_start']} → {timeline['mhz_end']} MHz")
+    if timeline["temp_max"] is not None:
+        details.append(f"max CPU temperature {timeline['temp_max']:.0f}°C")
+    if details:
+        text += "\n" + ", ".join(details)
+    if timeline["throttling"]:
+        text += "\n⚠ Throughput dropped under sustained load (throttling)"
+    return text
+
+
+def timeline_chart(result):
+    """Chart spec for QuickBenchApp._draw_chart: batch rate over the run."""
+    timeline = result.get("timeline")
+    if not timeline:
+        return None
+    series = timeline["series"]
+    points = list(zip(series["t"], series["rate"]))
+    step   = max(1, len(points) // 8)
+    return {"title": "Batches per second during the run", "x_label": "seconds",
+            "x_ticks": [round(t) for t, _ in points][::step],
+            "series": [{"label": "batches/s", "color": "#0A84FF", "points": points,
+                        "markers": len(points) <= 30}]}
+
+
+# ---------------------------------------------------------------------------
+# Warm multi-core worker pool
+# Spawning N interpreters (and, under spawn, re-importing this module in each)
+# is paid once per session instead of once per run. Each run is:
+#   dispatch  the parent zeroes the slots and sends every worker its task;
+#             each builds its first input and reports "ready"
+#   go        once all are ready the parent starts the clock and sets go_event
+#   stop      the parent sets stop_event; workers drop the batch in hand and
+#             report "done"
+# Only go → stop is timed; spawn, dispatch and stop are reported separately.
+# ---------------------------------------------------------------------------
+
+POOL_READY_TIMEOUT = 60.0   # seconds to wait for a worker to spawn or get ready
+POOL_STOP_GRACE    = 2.0    # minimum wait for workers to finish after stop
+
+
+class WorkerPool:
+    """Long-lived multi-core worker processes reused across runs and sweeps.
+
+    Worker i always writes slot i of one shared counter array sized for
+    max_workers (2 × logical CPUs, the largest sweep step). Workers that die
+    or hang are terminated and respawned by the next ensure().
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or 2 * multiprocessing.cpu_count()
+        self.slots       = multiprocessing.Array(
+            "q", self.max_workers * WORKER_SLOT_STRIDE, lock=False)
+        self.go_event    = multiprocessing.Event()
+        self.stop_event  = multiprocessing.Event()
+        self.processes   = []
+        self.conns       = []
+        self._running    = set()
+        # Total time spent spawning and warming workers over the pool's life.
+        self.spawn_seconds = 0.0
+
+    def ready_count(self):
+        return sum(1 for p in self.processes if p.is_alive())
+
+    def ensure(self, count):
+        """Spawn workers 0..count-1 that are missing or dead; returns seconds spent."""
+        if count > self.max_workers:
+            raise ValueError(f"Worker pool holds at most {self.max_workers} workers")
+        started = time.perf_counter()
+        spawned = []
+        for index in range(count):
+            if index < len(self.processes) and self.processes[index].is_alive():
+                continue
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_pool_worker_main,
+                args=(self.slots, index, child_conn, self.go_event, self.stop_event),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            if index < len(self.processes):
+                self.conns[index].close()
+                self.processes[index] = process
+                self.conns[index]     = parent_conn
+            else:
+                self.processes.append(process)
+                self.conns.append(parent_conn)
+            spawned.append(index)
+        for index in spawned:
+            if self._receive(index, POOL_READY_TIMEOUT) != "ready":
+                self._retire(index)
+                raise RuntimeError(f"Worker process {index} failed to start.")
+        if not spawned:
+            return 0.0
+        elapsed = time.perf_counter() - started
+        self.spawn_seconds += elapsed
+        return elapsed
+
+    def dispatch(self, count, task, cpus=None):
+        """Send `task` to workers 0..count-1 and wait until all are at the gate.
+
+        `cpus`, if given, pins worker i to cpus[i] for this task.
+        """
+        for i in range(count * WORKER_SLOT_STRIDE):
+            self.slots[i] = 0
+        self.go_event.clear()
+        self.stop_event.clear()
+        started       = time.perf_counter()
+        self._running = set(range(count))
+        for index in range(count):
+            self.conns[index].send((task, cpus[index] if cpus else None))
+        for index in range(count):
+            message = self._receive(index, POOL_READY_TIMEOUT)
+            if message == "done":
+                # Cancelled before reaching the gate.
+                self._running.discard(index)
+            elif message != "ready":
+                self._retire(index)
+                self._running.discard(index)
+        return time.perf_counter() - started
+
+    def go(self):
+        """Open the gate; returns the perf_counter() start of the timed window."""
+        start = time.perf_counter()
+        self.go_event.set()
+        return start
+
+    def stop(self, count):
+        """Signal stop and wait for running workers; returns seconds spent."""
+        started = time.perf_counter()
+        self.stop_event.set()
+        self.go_event.set()
+        slowest  = max((self.slots[i * WORKER_SLOT_STRIDE + SLOT_MAX_NS]
+                        for i in range(count)), default=0) / 1e9
+        deadline = started + max(POOL_STOP_GRACE, 3 * slowest)
+        for index in sorted(self._running):
+            message = self._receive(index, max(0.0, deadline - time.perf_counter()))
+            if message != "done":
+                self._retire(index)
+        self._running = set()
+        return time.perf_counter() - started
+
+    def close(self):
+        """Shut every worker down; returns seconds spent."""
+        started = time.perf_counter()
+        self.stop_event.set()
+        self.go_event.set()
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for index, process in enumerate(self.processes):
+            process.join(timeout=0.5)
+            if process.is_alive():
+                self._retire(index)
+        for conn in self.conns:
+            conn.close()
+        self.processes = []
+        self.conns     = []
+        return time.perf_counter() - started
+
+    def _receive(self, index, timeout):
+        conn = self.conns[index]
+        try:
+            if conn.poll(timeout):
+                return conn.recv()
+        except (EOFError, OSError):
+            pass
+        return None
+
+    def _retire(self, index):
+        process = self.processes[index]
+        process.terminate()
+        process.join(timeout=0.5)
+        if process.is_alive():
+            try:
+                process.kill()
+            except AttributeError:
+                pass
+            process.join(timeout=0.5)
+
+
+def format_worker_pool(result):
+    info = result.get("worker_pool")
+    if not info:
+        return ""
+    spawn = info["spawn_seconds"]
+    text  = (f"Worker pool: spawned in {spawn:.2f}s (not timed)" if spawn
+             else "Worker pool: warm, reused")
+    if info.get("start_seconds") is not None:
+        text += (f" · start {info['start_seconds'] * 1000:.0f} ms"
+                 f" · stop {info['teardown_seconds'] * 1000:.0f} ms")
+    return text
+
+
+def _thread_worker_main(slots, index, stop_event, barrier, task, cpu=None):
+    """Thread-backend worker: like a pool worker, but gated by a Barrier."""
+    passed = False
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})      # pid 0 = this thread on Linux
+
+    def start_gate():
+        nonlocal passed
+        passed = True
+        barrier.wait()
+
+    try:
+        multicore_worker(slots, index, stop_event, *task, start_gate=start_gate)
+    finally:
+        if not passed:
+            # Still count as arrived so the parent is not left waiting; the
+            # worker shows up as dead in the per-worker stats.
+            try:
+                barrier.wait(timeout=POOL_READY_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+
+
+def _window_result(workload, batch_size, workers, cancelled, elapsed):
+    effective_batch_size = workload.effective_batch_size(batch_size)
+    batches = sum(w["batches"] for w in workers)
+    return {
+        "cancelled":            cancelled,
+        "elapsed":              elapsed,
+        "batches":              batches,
+        "effective_batch_size": effective_batch_size,
+        "workers":              workers,
+        "dead_workers":         [w["index"] for w in workers if not w["alive_at_stop"]],
+        "imbalance":            worker_imbalance(workers),
+        "score":                workload.batch_score(batches, effective_batch_size, elapsed),
+    }
+
+
+def processes_rss_bytes(processes):
+    """Summed RSS of live processes, or None when it can't be read."""
+    total = 0
+    try:
+        for process in processes:
+            if process.is_alive():
+                total += PSUTIL.Process(process.pid).memory_info().rss
+    except Exception:
+        return None
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Multi-core backends
+# "processes" is the default. Other backends run the same kernel and are
+# reported next to a process-backend baseline measured in the same run.
+# ---------------------------------------------------------------------------
+
+MULTI_BACKENDS = {
+    "processes":    "Processes",
+    "threads":      "Threads",
+    "interpreters": "Subinterpreters",
+}
+
+
+def gil_enabled():
+    """False only on a free-threaded build running with the GIL disabled."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def load_interpreters():
+    """concurrent.interpreters (Python 3.14+), or None when unavailable."""
+    try:
+        from concurrent import interpreters
+    except ImportError:
+        return None
+    return interpreters
+
+
+# Source run by each subinterpreter worker. The interpreter starts empty, so it
+# takes the parent's sys.path and imports quickbench_kernels by name; the
+# kernels are the ones the other backends run.
+_INTERPRETER_WORKER_SOURCE = """\
+import sys
+sys.path[:] = {path!r}
+import quickbench_kernels
+quickbench_kernels._interpreter_worker_main({control!r}, {index}, {count}, {task!r})
+"""
+
+
+def backend_summary(backend, run):
+    """One comparison row for a multi-core measurement."""
+    return {
+        "backend":       backend,
+        "score":         run["score"],
+        "items_per_s":   (run["batches"] * run["effective_batch_size"] / run["elapsed"]
+                          if run["elapsed"] > 0 else 0.0),
+        "spawn_seconds": run.get("spawn_seconds"),
+        "start_seconds": run.get("start_seconds"),
+        "rss_bytes":     run.get("rss_bytes"),
+    }
+
+
+def format_backend_comparison(result):
+    rows = result.get("comparison")
+    if not rows:
+        return ""
+    lines = [f"{'Backend':<13}{'Items/s':>10}{'Score':>8}{'Startup':>10}{'Memory':>11}"]
+    for row in rows:
+        startup = (row["spawn_seconds"] or 0.0) + (row["start_seconds"] or 0.0)
+        lines.append(f"{MULTI_BACKENDS.get(row['backend'], row['backend']):<13}"
+                     f"{row['items_per_s'] / 1e6:>9.2f}M{row['score']:>8}"
+                     f"{startup * 1000:>8.0f}ms{bytes_to_mb_string(row['rss_bytes']):>11}")
+    if "gil_enabled" in result:
+        lines.append("GIL: " + ("enabled — threads run one at a time" if result["gil_enabled"]
+                                else "disabled (free-threaded build)"))
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CPU affinity and topology (Linux)
+# os.sched_setaffinity(0, …) applies to the calling thread on Linux, so the
+# same call pins a worker process, a worker thread or a subinterpreter's
+# driving thread. Topology comes from /sys/devices/system/cpu/cpuN/topology.
+# ---------------------------------------------------------------------------
+
+CPU_SYSFS_ROOT   = "/sys/devices/system/cpu"
+PERCORE_MIN_STEP = 1.0      # seconds measured per CPU in per-core mode
+PERCORE_SLOW     = 0.90     # per-core score below this × median is "slow"
+
+
+def allowed_cpus():
+    """Logical CPUs this process may run on, in ascending order."""
+    if affinity_supported():
+        return sorted(os.sched_getaffinity(0))
+    return list(range(multiprocessing.cpu_count()))
+
+
+def pinned_cpus(count):
+    """CPU for each of `count` pinned workers: allowed CPUs in order, wrapping."""
+    cpus = allowed_cpus()
+    return [cpus[i % len(cpus)] for i in range(count)]
+
+
+def _read_sysfs(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _sysfs_int(path):
+    value = _read_sysfs(path)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_cpu_topology(cpus, root=CPU_SYSFS_ROOT):
+    """{cpu: package / die / cluster / core ids, SMT siblings, max MHz}.
+
+    Fields the kernel doesn't expose (cluster_id before 5.16, die_id on
+    single-die parts, cpufreq in VMs) are None.
+    """
+    topology = {}
+    for cpu in cpus:
+        base    = os.path.join(root, f"cpu{cpu}")
+        max_khz = _sysfs_int(os.path.join(base, "cpufreq", "cpuinfo_max_freq"))
+        topology[cpu] = {
+            "package":  _sysfs_int(os.path.join(base, "topology", "physical_package_id")),
+            "die":      _sysfs_int(os.path.join(base, "topology", "die_id")),
+            "cluster":  _sysfs_int(os.path.join(base, "topology", "cluster_id")),
+            "core":     _sysfs_int(os.path.join(base, "topology", "core_id")),
+            "siblings": _read_sysfs(os.path.join(base, "topology", "thread_siblings_list")),
+            "max_mhz":  max_khz // 1000 if max_khz else None,
+        }
+    return topology
+
+
+def percore_summary(cpus):
+    """Median / best / worst per-core score, spread and slow CPUs."""
+    scores = [c["score"] for c in cpus]
+    if not scores:
+        return {"cpus": cpus, "median_score": 0, "best_score": 0, "worst_score": 0,
+                "spread": 0.0, "slow_cpus": []}
+    median = statistics.median(scores)
+    return {
+        "cpus":         cpus,
+        "median_score": round(median),
+        "best_score":   max(scores),
+        "worst_score":  min(scores),
+        "spread":       round((max(scores) - min(scores)) / max(scores) * 100, 1)
+                        if max(scores) else 0.0,
+        "slow_cpus":    [c["cpu"] for c in cpus if c["score"] < median * PERCORE_SLOW],
+    }
+
+
+def _percore_group_key(core):
+    return (core.get("package"), core.get("die"), core.get("cluster"))
+
+
+def _percore_group_label(key):
+    package, die, cluster = key
+    parts = [f"Pkg {package if package is not None else '?'}"]
+    if die is not None:
+        parts.append(f"die {die}")
+    if cluster is not None:
+        parts.append(f"cluster {cluster}")
+    return " · ".join(parts)
+
+
+def percore_heatmap(result):
+    """Chart spec (kind "heatmap") for QuickBenchApp._draw_chart.
+
+    One row per package / die / cluster; cells are logical CPUs ordered by
+    core id, with a gap between physical cores so SMT siblings sit together.
+    """
+    cores = result.get("cpus") or []
+    if not cores:
+        return None
+    groups = {}
+    for core in cores:
+        groups.setdefault(_percore_group_key(core), []).append(core)
+    rows = []
+    for key in sorted(groups, key=lambda k: tuple(-1 if v is None else v for v in k)):
+        members = sorted(groups[key], key=lambda c: (c["core"] if c["core"] is not None
+                                                     else c["cpu"], c["cpu"]))
+        cells, previous_core = [], None
+        for core in members:
+            cells.append({"label": str(core["cpu"]), "value": core["score"],
+                          "gap_before": previous_core is not None
+                                        and core["core"] != previous_core})
+            previous_core = core["core"]
+        rows.append({"label": _percore_group_label(key), "cells": cells})
+    return {"kind": "heatmap", "title": "Per-core score (cells = logical CPUs)",
+            "rows": rows, "min": result["worst_score"], "max": result["best_score"]}
+
+
+def _heat_color(frac):
+    """Red (slowest) → amber → green (fastest) for frac in 0..1."""
+    stops = ((0xDC, 0x26, 0x26), (0xF5, 0x9E, 0x0B), (0x16, 0xA3, 0x4A))
+    frac  = max(0.0, min(1.0, frac)) * (len(stops) - 1)
+    i     = min(int(frac), len(stops) - 2)
+    t     = frac - i
+    rgb   = (round(a + (b - a) * t) for a, b in zip(stops[i], stops[i + 1]))
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+def format_percore_result(result):
+    lines = [f"{'CPU':>4}{'Pkg':>5}{'Cluster':>9}{'Core':>6}  {'SMT':<9}{'MHz':>6}"
+             f"{'Score':>8}{'vs best':>9}"]
+    best = result.get("best_score") or 0
+    def cell(value):
+        return "—" if value is None else str(value)
+
+    for core in result.get("cpus") or []:
+        lines.append(f"{core['cpu']:>4}{cell(core['package']):>5}"
+                     f"{cell(core['cluster']):>9}{cell(core['core']):>6}  "
+                     f"{cell(core['siblings']):<9}{cell(core['max_mhz']):>6}"
+                     f"{core['score']:>8}"
+                     f"{(core['score'] / best * 100 if best else 0):>8.0f}%")
+    lines.append(f"Median per-core score: {result.get('median_score', 0)}   "
+                 f"spread {result.get('spread', 0.0):.1f}%")
+    if result.get("slow_cpus"):
+        lines.append(f"Slow CPUs (< {PERCORE_SLOW * 100:.0f}% of median): "
+                     + ", ".join(str(cpu) for cpu in result["slow_cpus"]))
+    lines.append(f"Step duration: {result['step_duration']:.1f}s per CPU")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Live telemetry
+# Continuous readings (progress, batches, throughput, CPU / RAM use) are
+# overwritten in one lock-protected snapshot that the UI samples at its own
+# frame rate, so a busy run never backs up the event queue and the display
+# always shows the newest values. Discrete events — status text, results,
+# errors, "done" — still go through the queue, in order.
+# ---------------------------------------------------------------------------
+
+class Telemetry:
+    FIELDS = ("progress", "batches", "items_per_s", "cpu", "ram", "mhz", "temp")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._values  = dict.fromkeys(self.FIELDS)
+            self._version = 0
+
+    def update(self, **values):
+        with self._lock:
+            self._values.update(values)
+            self._version += 1
+
+    def snapshot(self):
+        """(version, values); the version changes whenever any value does."""
+        with self._lock:
+            return self._version, dict(self._values)
+
+
+# ---------------------------------------------------------------------------
+# BenchmarkWorker
+# ---------------------------------------------------------------------------
+
+# Per-run options accepted by BenchmarkWorker.start(**options).
+#   workload  registered Workload name
+#   dataset   "private": each multi-core worker generates its own input per
+#             batch; "shared": the parent generates it once into shared
+#             memory and workers copy slices out of it
+#   warmup    discarded runs before the measured ones (single / multi)
+#   trials    measured runs; with more than one the score is their median
+#   cv_threshold  coefficient of variation (%) above which trials are "noisy"
+#   backend   multi-core backend from MULTI_BACKENDS; non-process backends
+#             are reported next to a process baseline from the same run
+#   pin       pin multi-core worker i to the i-th allowed CPU (Linux)
+DEFAULT_RUN_OPTIONS = {
+    "workload":     DEFAULT_WORKLOAD,
+    "dataset":      "private",
+    "warmup":       0,
+    "trials":       1,
+    "cv_threshold": 5.0,
+    "backend":      "processes",
+    "pin":          False,
+}
+DATASETS = ("private", "shared")
+
+# Shared pool size in batches: enough distinct slices that consecutive
+# batches rarely sort the same data, small enough to stay cheap to build.
+SHARED_POOL_BATCHES = 8
+
+
+def _release_shared_pool(pool):
+    if pool is not None:
+        pool["shm"].close()
+        pool["shm"].unlink()
+
+
+def _shared_pool_fields(pool):
+    """Result-dict fields describing the dataset a multi-core run used."""
+    if pool is None:
+        return {"dataset": "private", "generation_time": None, "shared_items": 0}
+    return {"dataset": "shared", "generation_time": pool["generation_time"],
+            "shared_items": pool["items"]}
+
+
+class BenchmarkWorker:
+    def __init__(self, event_queue: queue.Queue):
+        self.event_queue      = event_queue
+        self.cancel_event     = threading.Event()
+        self.thread           = None
+        self.monitor_thread   = None
+        self.monitor_stop     = threading.Event()
+        self.cpu_samples      = []
+        self.rss_peak         = None      # highest RSS seen in the current measurement
+        self.multi_stop_event = None
+        self.processes        = []
+        self.pool             = None
+        self.telemetry        = Telemetry()
+        self.options          = dict(DEFAULT_RUN_OPTIONS)
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, benchmark_type: str, single_numbers: int,
+              multi_duration: int, multi_batch: int, **options):
+        """Start a run. `options` override DEFAULT_RUN_OPTIONS for this run."""
+        if self.is_running():
+            return
+        unknown = set(options) - set(DEFAULT_RUN_OPTIONS)
+        if unknown:
+            raise TypeError(f"Unknown benchmark option(s): {', '.join(sorted(unknown))}")
+        self.options = {**DEFAULT_RUN_OPTIONS, **options}
+        self.cancel_event.clear()
+        self.monitor_stop.clear()
+        self.cpu_samples = []
+        self.telemetry.reset()
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(benchmark_type, single_numbers, multi_duration, multi_batch),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.multi_stop_event is not None:
+            self.multi_stop_event.set()
+
+    def join(self, timeout=None):
+        """Block until the worker thread finishes (used during shutdown)."""
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+
+    def _note_rss(self, rss=None):
+        """Fold an RSS reading (default: read it now) into self.rss_peak."""
+        rss = current_rss_bytes() if rss is None else rss
+        if rss is not None and (self.rss_peak is None or rss > self.rss_peak):
+            self.rss_peak = rss
+
+    def _monitor_usage(self):
+        # Clock and temperature are read here, off the timed window, and no
+        # more often than the timeline samples them (sensor reads are slow).
+        last_sensors = None
+        while not self.monitor_stop.is_set() and not self.cancel_event.is_set():
+            try:
+                cpu = PSUTIL.cpu_percent(interval=0.25)
+                mem = PSUTIL.virtual_memory().percent
+                self._note_rss()
+                self.cpu_samples.append(cpu)
+                if len(self.cpu_samples) > 20:
+                    self.cpu_samples.pop(0)
+                avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
+                           if self.cpu_samples else 0.0)
+                self.telemetry.update(cpu=avg_cpu, ram=mem)
+                now = time.monotonic()
+                if last_sensors is None or now - last_sensors >= TIMELINE_INTERVAL:
+                    last_sensors = now
+                    self.telemetry.update(mhz=sample_cpu_clock(),
+                                          temp=sample_cpu_temperature())
+            except Exception:
+                # FIX: transient psutil failures (e.g. permission errors on
+                # Linux) must not trigger an error dialog — just stop monitoring.
+                break
+
+    def _run(self, benchmark_type: str, single_numbers: int,
+             multi_duration: int, multi_batch: int):
+        self.monitor_thread = threading.Thread(target=self._monitor_usage, daemon=True)
+        self.monitor_thread.start()
+        try:
+            kernel = get_workload(self.options["workload"])
+            if benchmark_type in ("single", "multi", "sweep", "percore") and kernel.missing():
+                raise RuntimeError(f"{kernel.label} cannot run: {kernel.missing()}")
+            if self.options["pin"] and not affinity_supported():
+                raise RuntimeError("CPU pinning needs os.sched_setaffinity, which is only "
+                                   "available on Linux.")
+            if benchmark_type == "single":
+                self._run_single(single_numbers, kernel)
+            elif benchmark_type == "multi":
+                self._run_multi(multi_duration, multi_batch, kernel)
+            elif benchmark_type == "memory":
+                self._run_memory()
+            elif benchmark_type == "numpy":
+                self._run_numpy(single_numbers, multi_duration, multi_batch)
+            elif benchmark_type == "sweep":
+                self._run_sweep(multi_duration, multi_batch, kernel)
+            elif benchmark_type == "percore":
+                self._run_percore(multi_duration, multi_batch, kernel)
+            else:
+                raise ValueError(f"Unknown benchmark type: {benchmark_type}")
+        except MemoryError:
+            self.event_queue.put(("error",
+                "The benchmark used more memory than your system could comfortably provide. "
+                "Try a smaller workload."))
+        except Exception as exc:
+            self.event_queue.put(("error", str(exc)))
+        finally:
+            self.monitor_stop.set()
+            if self.monitor_thread is not None:
+                self.monitor_thread.join(timeout=1.0)
+            self.event_queue.put(("done",))
+
+    # ------------------------------------------------------------------
+
+    def _run_single(self, numbers_count: int, workload: Workload):
+        result = self._run_trials(
+            "Single-core",
+            lambda span: self._measure_single(numbers_count, workload, span))
+        self.event_queue.put(("single_result", result))
+
+    def _measure_single(self, numbers_count: int, workload: Workload, progress_span=(0, 100)):
+        self.event_queue.put(("status", "Generating random data for the single-core test…"))
+        rss_before       = current_rss_bytes()
+        # ru_maxrss would be the peak of the whole session; the monitor thread
+        # and these readings give the peak of this measurement alone.
+        self.rss_peak    = rss_before
+        start_generation = time.perf_counter()
+        data = workload.setup(numbers_count, random.Random())
+        generation_time = time.perf_counter() - start_generation
+        rss_after        = current_rss_bytes()
+        self._note_rss(rss_after)
+        data_rss = (rss_after - rss_before
+                    if rss_before is not None and rss_after is not None else None)
+
+        span_start, span_end = progress_span
+
+        def on_step(completed, total):
+            percent = span_start + completed / total * (span_end - span_start)
+            self.telemetry.update(progress=min(int(percent), 100), batches=completed)
+
+        self.event_queue.put(("status", f"Running single-core {workload.label.lower()}…"))
+        pass_times       = [] if workload.pass_timing else None
+        extra            = {"pass_times": pass_times} if workload.pass_timing else {}
+        start_sort       = time.perf_counter()
+        completed_passes = workload.run(data, self.cancel_event.is_set, on_step, **extra)
+        elapsed          = time.perf_counter() - start_sort
+        self._note_rss()
+
+        cancelled = self.cancel_event.is_set()
+        avg_cpu   = (sum(self.cpu_samples) / len(self.cpu_samples)
+                     if self.cpu_samples else 0.0)
+        mem       = PSUTIL.virtual_memory().percent
+
+        # FIX: report score 0 for cancelled runs — a partial sort time
+        # produces a meaningless inflated score.
+        score = workload.score(numbers_count, elapsed) if not cancelled else 0
+
+        return {
+            "cancelled":       cancelled,
+            "workload":        workload.name,
+            "sort_time":       elapsed,
+            "generation_time": generation_time,
+            "data_rss":        data_rss,
+            "peak_rss":        self.rss_peak,
+            "avg_cpu":         avg_cpu,
+            "ram":             mem,
+            "items":           numbers_count,
+            "work_units":      workload.work_units(numbers_count),
+            "batches":         completed_passes,
+            **({"pass_profile": pass_profile(pass_times, numbers_count)}
+               if pass_times else {}),
+            "score":           score,
+        }
+
+    def _run_trials(self, label, measure):
+        """Run measure(progress_span) for the configured warm-up + trials.
+
+        With one trial and no warm-up this is a single measurement. Otherwise
+        the returned result is the measured run with the median score, plus a
+        "trials" dict holding every sample and its statistics. A cancelled run
+        is returned as-is.
+        """
+        warmup = self.options["warmup"]
+        trials = self.options["trials"]
+        total  = warmup + trials
+        warmup_scores = []
+        runs          = []
+        for i in range(total):
+            if total > 1:
+                phase = (f"warm-up {i + 1}/{warmup}" if i < warmup
+                         else f"trial {i - warmup + 1}/{trials}")
+                self.event_queue.put(("status", f"{label} {phase}…"))
+            span = (i * 100 // total, (i + 1) * 100 // total)
+            run  = measure(span)
+            if run["cancelled"]:
+                return run
+            if i < warmup:
+                warmup_scores.append(run["score"])
+            else:
+                runs.append(run)
+
+        if total == 1:
+            return runs[0]
+        scores = [run["score"] for run in runs]
+        stats  = summarize_samples(scores)
+        result = dict(sorted(runs, key=lambda r: r["score"])[(len(runs) - 1) // 2])
+        result["score"]  = round(stats["median"])
+        result["trials"] = {
+            "warmup":        warmup,
+            "count":         trials,
+            "scores":        scores,
+            "warmup_scores": warmup_scores,
+            "samples":       [{k: run[k] for k in _TRIAL_SAMPLE_KEYS if k in run}
+                              for run in runs],
+            "stats":         stats,
+            "cv_threshold":  self.options["cv_threshold"],
+            "noisy":         (stats["cv"] is not None
+                              and stats["cv"] > self.options["cv_threshold"]),
+        }
+        return result
+
+    # ------------------------------------------------------------------
+
+    def _run_multi(self, duration_seconds: int, batch_size: int, workload: Workload):
+        cpu_count     = multiprocessing.cpu_count()
+        pool          = self._create_shared_pool(workload, batch_size)
+        spawn_seconds = self._ensure_pool(cpu_count)
+
+        backend       = self.options["backend"]
+
+        def measure(span):
+            self.event_queue.put(("status",
+                                  "Starting multi-core benchmark across all CPU cores…"))
+            if backend == "processes":
+                return self._measure_multi(cpu_count, duration_seconds, batch_size,
+                                           workload, span, pool=pool)
+            # Other backends: measure them, then the process baseline, each
+            # for the full duration and each over half the progress span.
+            middle  = (span[0] + span[1]) // 2
+            measure_backend = getattr(self, f"_measure_{backend}")
+            self.event_queue.put(("status", f"Multi-core: {MULTI_BACKENDS[backend]} backend…"))
+            run = measure_backend(cpu_count, duration_seconds, batch_size, workload,
+                                  (span[0], middle), pool=pool)
+            if run["cancelled"]:
+                return run
+            self.event_queue.put(("status", "Multi-core: process baseline…"))
+            baseline = self._measure_multi(cpu_count, duration_seconds, batch_size,
+                                           workload, (middle, span[1]), pool=pool)
+            baseline["spawn_seconds"] = self.pool.spawn_seconds
+            run["cancelled"]  = baseline["cancelled"]
+            run["comparison"] = [backend_summary(backend, run),
+                                 backend_summary("processes", baseline)]
+            run["pool_timings"] = {key: baseline[key]
+                                   for key in ("start_seconds", "teardown_seconds")}
+            return run
+
+        try:
+            run = self._run_trials("Multi-core", measure)
+        finally:
+            _release_shared_pool(pool)
+
+        avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
+                   if self.cpu_samples else 0.0)
+        mem     = PSUTIL.virtual_memory().percent
+
+        if not run["cancelled"]:
+            self.telemetry.update(progress=100)
+        self.event_queue.put(("multi_result", {
+            "cancelled":           run["cancelled"],
+            "workload":            workload.name,
+            "elapsed":             run["elapsed"],
+            "avg_cpu":             avg_cpu,
+            "ram":                 mem,
+            "batches":             run["batches"],
+            "cores":               cpu_count,
+            "batch_size":          batch_size,
+            "effective_batch_size":run["effective_batch_size"],
+            "duration":            duration_seconds,
+            "workers":             run["workers"],
+            "dead_workers":        run["dead_workers"],
+            "imbalance":           run["imbalance"],
+            **_shared_pool_fields(pool),
+            "worker_pool":         {
+                "spawn_seconds":    spawn_seconds,
+                **run.get("pool_timings", {
+                    "start_seconds":    run.get("start_seconds"),
+                    "teardown_seconds": run.get("teardown_seconds"),
+                }),
+            },
+            "timeline":            summarize_timeline(
+                run["series"], run["score"],
+                run["batches"] / run["elapsed"] if run["elapsed"] > 0 else 0.0),
+            "backend":             backend,
+            "pin":                 self.options["pin"],
+            "gil_enabled":         gil_enabled(),
+            **({"comparison": run["comparison"]} if "comparison" in run else {}),
+            **({"trials": run["trials"]} if "trials" in run else {}),
+            "score":               run["score"],
+        }))
+
+    def _ensure_pool(self, worker_count: int):
+        """Grow (or first create) the warm worker pool; returns spawn seconds."""
+        if self.pool is None:
+            self.pool = WorkerPool()
+        self.multi_stop_event = self.pool.stop_event
+        if self.pool.ready_count() < worker_count:
+            self.event_queue.put(("status", "Starting worker processes…"))
+        return self.pool.ensure(worker_count)
+
+    def shutdown(self):
+        """Stop the warm worker pool. Returns teardown seconds (0 if none)."""
+        pool, self.pool = self.pool, None
+        return pool.close() if pool is not None else 0.0
+
+    def _measure_multi(self, worker_count: int, duration_seconds: int, batch_size: int,
+                       workload: Workload, progress_span=(0, 100), pool=None,
+                       pin_cpus=None):
+        """Run `worker_count` pooled workers for `duration_seconds`.
+
+        Progress events are scaled into progress_span so callers running
+        several measurements (the scaling sweep) get one continuous bar.
+        `pool` is a shared input pool from _create_shared_pool, or None.
+        `pin_cpus` pins worker i to pin_cpus[i]; by default the "pin" run
+        option spreads workers over the allowed CPUs in order.
+        The timed window runs from the start signal to the stop signal;
+        spawning, input setup and waiting for workers to finish their last
+        batch are reported separately.
+        """
+        shared_args   = (pool["shm"].name, pool["items"]) if pool else (None, 0)
+        spawn_seconds = self._ensure_pool(worker_count)
+        workers_pool  = self.pool
+        slots         = workers_pool.slots
+        processes     = workers_pool.processes[:worker_count]
+
+        if pin_cpus is None and self.options["pin"]:
+            pin_cpus = pinned_cpus(worker_count)
+        start_seconds = workers_pool.dispatch(
+            worker_count, (batch_size, workload.name, *shared_args), pin_cpus)
+        start     = workers_pool.go()
+        cancelled = False
+        series    = []
+        try:
+            cancelled = self._timed_window(start, duration_seconds, slots, worker_count,
+                                           progress_span,
+                                           workload.effective_batch_size(batch_size),
+                                           series)
+        finally:
+            # Snapshot liveness before the stop signal: anything already gone
+            # at this point died mid-run rather than being shut down by us.
+            alive_at_stop = [p.is_alive() for p in processes]
+            stop_ns       = time.monotonic_ns()
+            total_elapsed = time.perf_counter() - start
+            rss_bytes     = processes_rss_bytes(processes)
+            self.event_queue.put(("status", "Stopping worker processes…"))
+            teardown_seconds = workers_pool.stop(worker_count)
+
+        workers = summarize_worker_slots(slots, processes, alive_at_stop, stop_ns)
+        return {
+            **_window_result(workload, batch_size, workers, cancelled, total_elapsed),
+            "series":               series,
+            "spawn_seconds":        spawn_seconds,
+            "start_seconds":        start_seconds,
+            "teardown_seconds":     teardown_seconds,
+            "rss_bytes":            rss_bytes,
+        }
+
+    def _measure_threads(self, worker_count: int, duration_seconds: int, batch_size: int,
+                         workload: Workload, progress_span=(0, 100), pool=None):
+        """Thread-backend counterpart of _measure_multi: the same kernel and
+        per-worker slots, run by `worker_count` threads of this process.
+
+        Under a GIL build the threads take turns; on a free-threaded build
+        with the GIL disabled they run in parallel.
+        """
+        shared_args = (pool["shm"].name, pool["items"]) if pool else (None, 0)
+        cpus        = pinned_cpus(worker_count) if self.options["pin"] else [None] * worker_count
+        slots       = [0] * (worker_count * WORKER_SLOT_STRIDE)
+        stop_event  = threading.Event()
+        barrier     = threading.Barrier(worker_count + 1)
+        self.multi_stop_event = stop_event
+        rss_before  = current_rss_bytes()
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=_thread_worker_main,
+                args=(slots, index, stop_event, barrier,
+                      (batch_size, workload.name, *shared_args), cpus[index]),
+                name=f"{APP_NAME}-worker-{index}", daemon=True)
+            for index in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            barrier.wait(timeout=POOL_READY_TIMEOUT)
+        except threading.BrokenBarrierError:
+            stop_event.set()
+            raise RuntimeError("Worker threads did not start in time.") from None
+        start         = time.perf_counter()
+        start_seconds = start - started
+        cancelled     = False
+        series        = []
+        try:
+            cancelled = self._timed_window(start, duration_seconds, slots, worker_count,
+                                           progress_span,
+                                           workload.effective_batch_size(batch_size),
+                                           series)
+        finally:
+            alive_at_stop = [t.is_alive() for t in threads]
+            stop_ns       = time.monotonic_ns()
+            total_elapsed = time.perf_counter() - start
+            rss_after     = current_rss_bytes()
+            self.event_queue.put(("status", "Stopping worker threads…"))
+            stop_event.set()
+            stopped = time.perf_counter()
+            for thread in threads:
+                thread.join(timeout=POOL_STOP_GRACE)
+            teardown_seconds = time.perf_counter() - stopped
+
+        workers = summarize_worker_slots(slots, threads, alive_at_stop, stop_ns)
+        return {
+            **_window_result(workload, batch_size, workers, cancelled, total_elapsed),
+            "series":               series,
+            "spawn_seconds":        0.0,
+            "start_seconds":        start_seconds,
+            "teardown_seconds":     teardown_seconds,
+            # What the threads added to this process; the process backend
+            # reports the workers' own RSS.
+            "rss_bytes":            (rss_after - rss_before
+                                     if rss_before is not None and rss_after is not None
+                                     else None),
+        }
+
+    def _measure_interpreters(self, worker_count: int, duration_seconds: int,
+                              batch_size: int, workload: Workload, progress_span=(0, 100),
+                              pool=None):
+        """Subinterpreter-backend counterpart of _measure_multi (Python 3.14+).
+
+        Each worker is a concurrent.interpreters interpreter with its own GIL,
+        driven from a thread of this process. They share a memory block for
+        the per-worker slots and the go / stop flags.
+        """
+        interpreters = load_interpreters()
+        if interpreters is None:
+            raise RuntimeError("The subinterpreter backend needs Python 3.14 or newer "
+                               "(concurrent.interpreters).")
+        if getattr(sys, "frozen", False):
+            # A bundle's modules live in its archive, which a fresh
+            # interpreter cannot import from.
+            raise RuntimeError("The subinterpreter backend is not available in "
+                               "the packaged app; run QuickBench.py from source.")
+
+        shared_args = (pool["shm"].name, pool["items"]) if pool else (None, 0)
+        task        = (batch_size, workload.name, *shared_args)
+        control_at  = worker_count * WORKER_SLOT_STRIDE
+        control     = shared_memory.SharedMemory(create=True, size=(control_at + 2) * 8)
+        view        = control.buf.cast("q")
+        for i in range(control_at + 2):
+            view[i] = 0
+        stop_flag   = _SharedFlag(view, control_at + 1)
+        self.multi_stop_event = stop_flag
+        rss_before  = current_rss_bytes()
+        interps     = []
+        threads     = []
+
+        cpus = pinned_cpus(worker_count) if self.options["pin"] else None
+
+        def drive(interp, index):
+            try:
+                if cpus is not None:
+                    # The interpreter runs on this thread, so pin the thread.
+                    os.sched_setaffinity(0, {cpus[index]})
+                interp.exec(_INTERPRETER_WORKER_SOURCE.format(
+                    path=list(sys.path), control=control.name, index=index,
+                    count=worker_count, task=task))
+            except Exception:
+                # The worker's error stays in its interpreter; mark it ready
+                # so the gate opens, and it is reported as a dead worker.
+                view[index * WORKER_SLOT_STRIDE + SLOT_READY] = 1
+
+        try:
+            started = time.perf_counter()
+            for index in range(worker_count):
+                interps.append(interpreters.create())
+            spawn_seconds = time.perf_counter() - started
+
+            for index, interp in enumerate(interps):
+                thread = threading.Thread(target=drive, args=(interp, index),
+                                          name=f"{APP_NAME}-interp-{index}", daemon=True)
+                thread.start()
+                threads.append(thread)
+            deadline = time.perf_counter() + POOL_READY_TIMEOUT
+            while not all(view[i * WORKER_SLOT_STRIDE + SLOT_READY]
+                          for i in range(worker_count)):
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("Subinterpreter workers did not start in time.")
+                time.sleep(0.005)
+            start_seconds = time.perf_counter() - started - spawn_seconds
+
+            start = time.perf_counter()
+            view[control_at] = 1
+            cancelled = False
+            series    = []
+            try:
+                cancelled = self._timed_window(start, duration_seconds, view, worker_count,
+                                               progress_span,
+                                               workload.effective_batch_size(batch_size),
+                                               series)
+            finally:
+                alive_at_stop = [t.is_alive() for t in threads]
+                stop_ns       = time.monotonic_ns()
+                total_elapsed = time.perf_counter() - start
+                rss_after     = current_rss_bytes()
+                self.event_queue.put(("status", "Stopping subinterpreters…"))
+                stop_flag.set()
+                stopped = time.perf_counter()
+                for thread in threads:
+                    thread.join(timeout=POOL_STOP_GRACE)
+                teardown_seconds = time.perf_counter() - stopped
+            workers = summarize_worker_slots(view, threads, alive_at_stop, stop_ns)
+        finally:
+            stop_flag.set()
+            view[control_at] = 1
+            for thread in threads:
+                thread.join(timeout=POOL_STOP_GRACE)
+            for interp in interps:
+                try:
+                    interp.close()
+                except Exception:
+                    pass            # still running a batch; freed at exit
+            self.multi_stop_event = None
+            view.release()
+            control.close()
+            control.unlink()
+
+        return {
+            **_window_result(workload, batch_size, workers, cancelled, total_elapsed),
+            "series":               series,
+            "spawn_seconds":        spawn_seconds,
+            "start_seconds":        start_seconds,
+            "teardown_seconds":     teardown_seconds,
+            "rss_bytes":            (rss_after - rss_before
+                                     if rss_before is not None and rss_after is not None
+                                     else None),
+        }
+
+    def _timed_window(self, start, duration_seconds, slots, worker_count, progress_span,
+                      batch_items, series=None):
+        """Publish telemetry until the duration elapses; returns True if cancelled.
+
+        If `series` is a list, one timeline sample (see sample_timeline) is
+        appended once TIMELINE_INTERVAL seconds and TIMELINE_MIN_BATCHES
+        batches have passed since the previous one.
+        """
+        span_start, span_end = progress_span
+        last_t, last_batches, last_ns = 0.0, 0, time.monotonic_ns()
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= duration_seconds:
+                return False
+            if self.cancel_event.is_set():
+                return True
+            fraction = elapsed / duration_seconds
+            batches  = total_batches(slots, worker_count)
+            self.telemetry.update(
+                progress=int(span_start + fraction * (span_end - span_start)),
+                batches=batches,
+                items_per_s=batches * batch_items / elapsed if elapsed > 0 else 0.0)
+            if (series is not None and elapsed - last_t >= TIMELINE_INTERVAL
+                    and batches - last_batches >= TIMELINE_MIN_BATCHES):
+                # Read after `batches`: workers set the heartbeat before
+                # counting a batch, so every counted batch finished by now.
+                finish_ns = last_batch_ns(slots, worker_count)
+                if finish_ns > last_ns:
+                    sensors = self.telemetry.snapshot()[1]
+                    series.append(sample_timeline(elapsed, batches - last_batches,
+                                                  (finish_ns - last_ns) / 1e9,
+                                                  sensors["mhz"], sensors["temp"]))
+                    last_t, last_batches, last_ns = elapsed, batches, finish_ns
+            time.sleep(0.2)
+
+    def _run_sweep(self, step_seconds: int, batch_size: int, workload: Workload):
+        cpu_count = multiprocessing.cpu_count()
+        counts    = sweep_worker_counts(cpu_count)
+        points    = []
+        cancelled = False
+        start     = time.perf_counter()
+        # One shared pool serves every step of the sweep, and the warm worker
+        # pool is grown to the largest step up front so no step pays spawn cost.
+        pool          = self._create_shared_pool(workload, batch_size)
+        spawn_seconds = self._ensure_pool(max(counts))
+
+        try:
+            for step, count in enumerate(counts):
+                self.event_queue.put(("status",
+                    f"Scaling sweep: {count} worker{'s' if count != 1 else ''} "
+                    f"({step + 1}/{len(counts)})…"))
+                span = (int(step / len(counts) * 100), int((step + 1) / len(counts) * 100))
+                run  = self._measure_multi(count, step_seconds, batch_size, workload, span,
+                                           pool=pool)
+                if run["cancelled"]:
+                    cancelled = True
+                    break
+                points.append({
+                    "workers":      count,
+                    "batches":      run["batches"],
+                    "elapsed":      run["elapsed"],
+                    "throughput":   run["batches"] * run["effective_batch_size"]
+                                    / run["elapsed"],
+                    "score":        run["score"],
+                    "imbalance":    run["imbalance"],
+                    "dead_workers": run["dead_workers"],
+                    "start_seconds":    run["start_seconds"],
+                    "teardown_seconds": run["teardown_seconds"],
+                })
+        finally:
+            _release_shared_pool(pool)
+
+        curve   = scaling_curve(points, cpu_count)
+        avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
+                   if self.cpu_samples else 0.0)
+        self.telemetry.update(progress=100 if not cancelled else
+                              int(len(points) / len(counts) * 100))
+        self.event_queue.put(("sweep_result", {
+            "cancelled":     cancelled,
+            "workload":      workload.name,
+            "elapsed":       time.perf_counter() - start,
+            "step_duration": step_seconds,
+            "pin":           self.options["pin"],
+            "batch_size":    batch_size,
+            "cores":         cpu_count,
+            "avg_cpu":       avg_cpu,
+            "ram":           PSUTIL.virtual_memory().percent,
+            **curve,
+            **_shared_pool_fields(pool),
+            "worker_pool":   {
+                "spawn_seconds":    spawn_seconds,
+                "start_seconds":    max((p["start_seconds"] for p in points), default=None),
+                "teardown_seconds": max((p["teardown_seconds"] for p in points),
+                                        default=None),
+            },
+            # Peak multi-core score over the curve, i.e. the best pool size.
+            "score":         max((p["score"] for p in points), default=0)
+                             if not cancelled else 0,
+        }))
+
+    def _run_percore(self, duration_seconds: int, batch_size: int, workload: Workload):
+        """Run one pooled worker pinned to each allowed CPU in turn."""
+        if not affinity_supported():
+            raise RuntimeError("Per-core mode needs os.sched_setaffinity, which is only "
+                               "available on Linux.")
+        cpus      = allowed_cpus()
+        topology  = read_cpu_topology(cpus)
+        step      = max(PERCORE_MIN_STEP, duration_seconds / len(cpus))
+        cpu_results = []
+        cancelled   = False
+        start       = time.perf_counter()
+        pool        = self._create_shared_pool(workload, batch_size)
+        self._ensure_pool(1)
+
+        try:
+            for i, cpu in enumerate(cpus):
+                self.event_queue.put(("status", f"Per-core: CPU {cpu} ({i + 1}/{len(cpus)})…"))
+                span = (i * 100 // len(cpus), (i + 1) * 100 // len(cpus))
+                run  = self._measure_multi(1, step, batch_size, workload, span, pool=pool,
+                                           pin_cpus=[cpu])
+                if run["cancelled"]:
+                    cancelled = True
+                    break
+                cpu_results.append({
+                    "cpu":         cpu,
+                    **topology[cpu],
+                    "score":       run["score"],
+                    "batches":     run["batches"],
+                    "items_per_s": run["batches"] * run["effective_batch_size"]
+                                   / run["elapsed"] if run["elapsed"] > 0 else 0.0,
+                })
+        finally:
+            _release_shared_pool(pool)
 
-    def _run_single(self, numbers_count: int):
-        self.event_queue.put(("status", "Generating random data for the single-core test…"))
-        start_generation = time.perf_counter()
-        data = [random.randint(0, numbers_count) for _ in range(numbers_count)]
-        generation_time = time.perf_counter() - start_generation
+        summary = percore_summary(cpu_results)
+        avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
+                   if self.cpu_samples else 0.0)
+        if not cancelled:
+            self.telemetry.update(progress=100)
+        self.event_queue.put(("percore_result", {
+            "cancelled":     cancelled,
+            "workload":      workload.name,
+            "elapsed":       time.perf_counter() - start,
+            "step_duration": step,
+            "batch_size":    batch_size,
+            "avg_cpu":       avg_cpu,
+            "ram":           PSUTIL.virtual_memory().percent,
+            **_shared_pool_fields(pool),
+            **summary,
+            "score":         summary["median_score"] if not cancelled else 0,
+        }))
 
-        self.event_queue.put(("status", "Running single-core merge sort…"))
-        start_sort       = time.perf_counter()
-        completed_passes = self._merge_sort_iterative(data)
-        elapsed          = time.perf_counter() - start_sort
+    def _create_shared_pool(self, workload: Workload, batch_size: int):
+        """Generate the multi-core input once into shared memory.
 
-        cancelled = self.cancel_event.is_set()
+        Returns None for the private dataset (or a workload without shared
+        support, which is reported in the status line), else a dict with the
+        SharedMemory block, its item count and the generation time.
+        """
+        if self.options["dataset"] != "shared":
+            return None
+        if not workload.supports_shared:
+            self.event_queue.put(("status",
+                f"{workload.label} reuses its input per worker — "
+                "running with private data."))
+            return None
+        size  = workload.effective_batch_size(batch_size)
+        items = size * SHARED_POOL_BATCHES
+        self.event_queue.put(("status", f"Generating {items:,} shared input items…"))
+        start  = time.perf_counter()
+        values = workload.shared_setup(items, size, random.Random())
+        shm    = shared_memory.SharedMemory(create=True, size=len(values) * values.itemsize)
+        shm.buf[:len(values) * values.itemsize] = memoryview(values).cast("B")
+        return {"shm": shm, "items": items, "generation_time": time.perf_counter() - start}
+
+    # ------------------------------------------------------------------
+
+    def _run_memory(self):
+        cpu_count = multiprocessing.cpu_count()
+        start     = time.perf_counter()
+
+        single_bytes, llc = memory_array_bytes(1)
+        self.event_queue.put(("status",
+            f"Memory bandwidth on one core — 3 × {bytes_to_mb_string(single_bytes)} buffers…"))
+        single_gbps = self._memory_single_core(single_bytes)
+
+        multi_bytes = None
+        multi_gbps  = None
+        if single_gbps is not None:
+            multi_bytes, _ = memory_array_bytes(cpu_count)
+            self.event_queue.put(("status",
+                f"Memory bandwidth across {cpu_count} processes — "
+                f"3 × {bytes_to_mb_string(multi_bytes)} buffers each…"))
+            multi_gbps = self._memory_multi_core(multi_bytes, cpu_count)
+
+        cancelled = single_gbps is None or multi_gbps is None
         avg_cpu   = (sum(self.cpu_samples) / len(self.cpu_samples)
                      if self.cpu_samples else 0.0)
         mem       = PSUTIL.virtual_memory().percent
-
-        # FIX: report score 0 for cancelled runs — a partial sort time
-        # produces a meaningless inflated score.
-        score = score_single_core(numbers_count, elapsed) if not cancelled else 0
-
-        self.event_queue.put(("single_result", {
-            "cancelled":       cancelled,
-            "sort_time":       elapsed,
-            "generation_time": generation_time,
-            "avg_cpu":         avg_cpu,
-            "ram":             mem,
-            "items":           numbers_count,
-            "batches":         completed_passes,
-            "score":           score,
+        headline  = (multi_gbps or {}).get(MEMORY_HEADLINE, 0.0)
+
+        self.event_queue.put(("memory_result", {
+            "cancelled":          cancelled,
+            "elapsed":            time.perf_counter() - start,
+            "llc_bytes":          llc,
+            "single_array_bytes": single_bytes,
+            "multi_array_bytes":  multi_bytes,
+            "processes":          cpu_count,
+            "passes":             MEMORY_PASSES,
+            "single_gbps":        single_gbps or {},
+            "multi_gbps":         multi_gbps or {},
+            "avg_cpu":            avg_cpu,
+            "ram":                mem,
+            "headline":           MEMORY_HEADLINE,
+            "score":              score_memory(headline) if not cancelled else 0,
         }))
 
-    def _merge_sort_iterative(self, arr):
-        n    = len(arr)
-        temp = arr.copy()
-        size = 1
-        total_passes     = max(1, math.ceil(math.log2(max(1, n))))
-        completed_passes = 0
-        while size < n and not self.cancel_event.is_set():
-            for left in range(0, n, 2 * size):
-                if self.cancel_event.is_set():
-                    break
-                mid   = min(left + size, n)
-                right = min(left + 2 * size, n)
-                self._merge(arr, temp, left, mid, right)
-            arr[:] = temp[:]
-            size *= 2
-            completed_passes += 1
-            percent = int((completed_passes / total_passes) * 100)
-            self.event_queue.put(("progress", min(percent, 100)))
-            self.event_queue.put(("batches",  completed_passes))
-        return completed_passes
-
-    @staticmethod
-    def _merge(arr, temp, left, mid, right):
-        i, j, k = left, mid, left
-        while i < mid and j < right:
-            if arr[i] <= arr[j]:
-                temp[k] = arr[i]
-                i += 1
-            else:
-                temp[k] = arr[j]
-                j += 1
-            k += 1
-        while i < mid:
-            temp[k] = arr[i]
-            i += 1
-            k += 1
-        while j < right:
-            temp[k] = arr[j]
-            j += 1
-            k += 1
+    def _run_numpy(self, numbers_count: int, duration_seconds: int, batch_size: int):
+        """Run each NumPy kernel on one core, then across the worker pool.
 
-    # ------------------------------------------------------------------
+        The duration is shared between the kernels (at least NUMPY_MIN_STEP
+        each). Without NumPy the tier reports a skip instead of an error.
+        """
+        start   = time.perf_counter()
+        missing = optional_package_missing("numpy")
+        if missing:
+            self.event_queue.put(("numpy_result", {
+                "cancelled": False,
+                "skipped":   missing,
+                "elapsed":   0.0,
+                "score":     0,
+            }))
+            return
 
-    @staticmethod
-    def _multicore_worker(batch_counter, stop_event, batch_size: int):
-        rng = random.Random()
-        effective_size = max(10_000, min(batch_size, 250_000))
-        while not stop_event.is_set():
-            data = [rng.randint(0, effective_size) for _ in range(effective_size)]
-            if stop_event.is_set():
+        np        = import_numpy()
+        cpu_count = multiprocessing.cpu_count()
+        step      = max(NUMPY_MIN_STEP, duration_seconds / len(NUMPY_WORKLOADS))
+        kernels   = []
+        cancelled = False
+        spawn_seconds = self._ensure_pool(cpu_count)
+
+        for i, name in enumerate(NUMPY_WORKLOADS):
+            workload = get_workload(name)
+            low      = i * 100 // len(NUMPY_WORKLOADS)
+            high     = (i + 1) * 100 // len(NUMPY_WORKLOADS)
+            single   = self._measure_single(numbers_count, workload, (low, (low + high) // 2))
+            if single["cancelled"]:
+                cancelled = True
                 break
-            data.sort()
-            if stop_event.is_set():
+            self.event_queue.put(("status",
+                f"Running {workload.label} across {cpu_count} "
+                f"process{'es' if cpu_count != 1 else ''}…"))
+            multi = self._measure_multi(cpu_count, step, batch_size, workload,
+                                        ((low + high) // 2, high))
+            if multi["cancelled"]:
+                cancelled = True
                 break
-            with batch_counter.get_lock():
-                batch_counter.value += 1
+            size = multi["effective_batch_size"]
+            kernels.append({
+                "workload":     name,
+                "items":        numbers_count,
+                "batch_size":   size,
+                "single_score": single["score"],
+                "multi_score":  multi["score"],
+                # Work units per second: FLOP/s for matmul.
+                "single_rate":  (single["work_units"] / single["sort_time"]
+                                 if single["sort_time"] > 0 else 0.0),
+                "multi_rate":   (multi["batches"] * workload.work_units(size) / multi["elapsed"]
+                                 if multi["elapsed"] > 0 else 0.0),
+                **({"matrix_n":       numpy_matmul_side(numbers_count),
+                    "batch_matrix_n": numpy_matmul_side(size)}
+                   if name == "numpy_matmul" else {}),
+            })
 
-    def _run_multi(self, duration_seconds: int, batch_size: int):
-        self.event_queue.put(("status", "Starting multi-core benchmark across all CPU cores…"))
-        cpu_count             = multiprocessing.cpu_count()
-        self.multi_stop_event = multiprocessing.Event()
-        # Use "q" (signed long long, always 64-bit on all platforms).
-        # "l" (signed long) is only 32-bit on Windows (LONG = 32-bit there),
-        # which would overflow at ~2.1B on a fast stress run.
-        self.batch_counter    = multiprocessing.Value("q", 0)
-        self.processes        = []
+        avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
+                   if self.cpu_samples else 0.0)
+        if not cancelled:
+            self.telemetry.update(progress=100)
+        self.event_queue.put(("numpy_result", {
+            "cancelled":     cancelled,
+            "elapsed":       time.perf_counter() - start,
+            "numpy_version": np.__version__,
+            "cores":         cpu_count,
+            "items":         numbers_count,
+            "batch_size":    batch_size,
+            "step_duration": step,
+            "spawn_seconds": spawn_seconds,
+            "kernels":       kernels,
+            "avg_cpu":       avg_cpu,
+            "ram":           PSUTIL.virtual_memory().percent,
+            "score":         (score_numpy_tier([k["multi_score"] for k in kernels])
+                              if not cancelled else 0),
+        }))
 
-        for _ in range(cpu_count):
+    def _memory_single_core(self, array_bytes):
+        """Best-of-N GB/s per kernel on this thread, or None if cancelled."""
+        a, b, c = _memory_buffers(array_bytes)
+        best    = {kernel: 0.0 for kernel in MEMORY_KERNELS}
+        for done in range(MEMORY_PASSES):
+            for kernel in MEMORY_KERNELS:
+                if self.cancel_event.is_set():
+                    return None
+                t0 = time.perf_counter()
+                _stream_kernel(kernel, a, b, c)
+                elapsed = time.perf_counter() - t0
+                moved   = MEMORY_BYTES_PER_ELEM[kernel] * array_bytes
+                best[kernel] = max(best[kernel], moved / elapsed / 1e9)
+            self.telemetry.update(progress=int((done + 1) / MEMORY_PASSES * 50))
+        return best
+
+    def _memory_multi_core(self, array_bytes, process_count):
+        """Aggregate best-of-N GB/s per kernel, or None if cancelled/failed."""
+        self.multi_stop_event = multiprocessing.Event()
+        barrier      = multiprocessing.Barrier(process_count)
+        result_queue = multiprocessing.Queue()
+        self.processes = []
+        for index in range(process_count):
             process = multiprocessing.Process(
-                target=self._multicore_worker,
-                args=(self.batch_counter, self.multi_stop_event, batch_size),
+                target=_memory_worker,
+                args=(index, array_bytes, MEMORY_PASSES, barrier, result_queue,
+                      self.multi_stop_event),
                 daemon=True,
             )
             process.start()
             self.processes.append(process)
 
-        start                = time.perf_counter()
-        cancelled            = False
-        effective_batch_size = max(10_000, min(batch_size, 250_000))
-
+        timings = {}
         try:
-            while True:
-                elapsed = time.perf_counter() - start
-                if elapsed >= duration_seconds:
-                    break
+            while len(timings) < process_count:
                 if self.cancel_event.is_set():
-                    cancelled = True
-                    break
-                progress = int((elapsed / duration_seconds) * 100)
-                batches  = self.batch_counter.value if self.batch_counter is not None else 0
-                self.event_queue.put(("progress", progress))
-                self.event_queue.put(("batches",  batches))
-                time.sleep(0.2)
+                    return None
+                try:
+                    index, worker_timings = result_queue.get(timeout=0.2)
+                except queue.Empty:
+                    # A crashed worker would leave its siblings blocked on
+                    # the barrier forever, so fail fast instead of waiting.
+                    if any(p.exitcode not in (None, 0) for p in self.processes):
+                        raise RuntimeError("A memory benchmark worker process exited early.")
+                    continue
+                if worker_timings is None:
+                    raise MemoryError
+                timings[index] = worker_timings
+                self.telemetry.update(progress=50 + int(len(timings) / process_count * 50))
         finally:
-            self.event_queue.put(("status", "Stopping worker processes…"))
             self.multi_stop_event.set()
+            barrier.abort()
             for process in self.processes:
-                process.join(timeout=0.5)
+                process.join(timeout=1.0)
                 if process.is_alive():
                     process.terminate()
                     process.join(timeout=0.5)
-                    if process.is_alive():
-                        try:
-                            process.kill()
-                        except AttributeError:
-                            pass
-                        process.join(timeout=0.5)
-
-        total_elapsed = time.perf_counter() - start
-        avg_cpu = (sum(self.cpu_samples) / len(self.cpu_samples)
-                   if self.cpu_samples else 0.0)
-        mem     = PSUTIL.virtual_memory().percent
-        batches = self.batch_counter.value if self.batch_counter is not None else 0
-        score   = score_multi_core(batches, effective_batch_size, total_elapsed)
 
-        self.event_queue.put((
-            "progress",
-            100 if not cancelled else min(99, int((total_elapsed / duration_seconds) * 100))
-        ))
-        self.event_queue.put(("multi_result", {
-            "cancelled":           cancelled,
-            "elapsed":             total_elapsed,
-            "avg_cpu":             avg_cpu,
-            "ram":                 mem,
-            "batches":             batches,
-            "cores":               cpu_count,
-            "batch_size":          batch_size,
-            "effective_batch_size":effective_batch_size,
-            "duration":            duration_seconds,
-            "score":               score,
-        }))
+        # Passes are barrier-aligned, so pass i ran concurrently everywhere:
+        # its aggregate rate is all bytes moved ÷ the slowest worker's time.
+        best = {}
+        for kernel in MEMORY_KERNELS:
+            moved = MEMORY_BYTES_PER_ELEM[kernel] * array_bytes * process_count
+            best[kernel] = max(
+                moved / max(t[kernel][i] for t in timings.values()) / 1e9
+                for i in range(MEMORY_PASSES)
+            )
+        return best
 
 
 # ---------------------------------------------------------------------------
@@ -1720,15 +4376,27 @@ class QuickBenchApp:
             "platform_name": f"{platform.system()} {platform.release()}",
             "label": "",
         }
+        # A cached profile for this hardware is shown straight away; detection
+        # only runs when there is none or it has passed its TTL.
+        self._hardware_fingerprint = hardware_fingerprint()
+        cached, refresh = cached_system_profile(self._hardware_fingerprint)
+        self.system_ready = cached is not None
+        if cached is not None:
+            self.system_info = cached
+            startup_mark("system info (cached)")
 
         self.app_icon           = None
         self.last_single_result = None
         self.last_multi_result  = None
+        self._telemetry_version = -1
+        # Results of the other modes (memory, sweep, …) keyed by benchmark type.
+        self.last_results       = {}
 
         # FIX: track whether results have already been auto-saved so that
         # _save_current_result never double-writes to history.
         self._single_auto_saved = False
         self._multi_auto_saved  = False
+        self._auto_saved        = set()   # same, for the types in last_results
 
         # Label lists for responsive wrap-length updates.
         self.wrap_labels        = []   # card/column labels  ~window/5
@@ -1739,7 +4407,6 @@ class QuickBenchApp:
         self._sysinfo_vars = {}
 
         self._configure_style()
-        self._create_app_icon()
         self._configure_menu()
 
         self.event_queue      = queue.Queue()
@@ -1757,8 +4424,11 @@ class QuickBenchApp:
         self.single_numbers_var = tk.StringVar(value=str(DEFAULT_SINGLE_CORE_NUMBERS))
         self.multi_duration_var = tk.StringVar(value=str(DEFAULT_MULTICORE_DURATION))
         self.multi_batch_var    = tk.StringVar(value=str(DEFAULT_MULTICORE_BATCH_SIZE))
+        self.trials_var         = tk.StringVar(value=str(DEFAULT_RUN_OPTIONS["trials"]))
+        self.warmup_var         = tk.StringVar(value=str(DEFAULT_RUN_OPTIONS["warmup"]))
 
-        self.status_var  = tk.StringVar(value="Ready — detecting system info…")
+        self.status_var  = tk.StringVar(
+            value="Ready" if cached is not None else "Ready — detecting system info…")
         self.percent_var = tk.StringVar(value="0%")
         self.timer_var   = tk.StringVar(value="Time: 00:00")
         self.usage_var   = tk.StringVar(value="CPU: 0.0%   RAM: 0.0%")
@@ -1779,7 +4449,11 @@ class QuickBenchApp:
 
         # FIX: run slow hardware detection in a background thread so the
         # UI is immediately responsive.
-        threading.Thread(target=self._detect_system_async, daemon=True).start()
+        if refresh:
+            threading.Thread(target=self._detect_system_async, daemon=True).start()
+
+        # Decoding the embedded PNG is left until the first frame is drawn.
+        self.root.after_idle(self._create_app_icon)
 
     # ------------------------------------------------------------------
     # System detection (background)
@@ -1787,16 +4461,20 @@ class QuickBenchApp:
 
     def _detect_system_async(self):
         info = detect_system_profile()
+        save_system_profile(self._hardware_fingerprint, info)
         try:
             self.root.after(0, lambda: self._apply_system_info(info))
         except RuntimeError:
             pass  # root was destroyed before detection finished — ignore
 
     def _apply_system_info(self, info):
-        self.system_info = info
+        self.system_info  = info
+        self.system_ready = True
+        startup_mark("system info")
         for key, var in self._sysinfo_vars.items():
             var.set(str(info.get(key, "Unknown")))
-        self.status_var.set("Ready")
+        if not self.worker.is_running():    # a cached profile may have let a run start
+            self.status_var.set("Ready")
 
     # ------------------------------------------------------------------
     # Style
@@ -1983,6 +4661,14 @@ class QuickBenchApp:
                                    command=lambda: self._set_mode("single"))
         benchmark_menu.add_command(label="Multi-Core Mode",
                                    command=lambda: self._set_mode("multi"))
+        benchmark_menu.add_command(label="Memory Bandwidth Mode",
+                                   command=lambda: self._set_mode("memory"))
+        benchmark_menu.add_command(label="Scaling Sweep Mode",
+                                   command=lambda: self._set_mode("sweep"))
+        benchmark_menu.add_command(label="Per-Core Mode",
+                                   command=lambda: self._set_mode("percore"))
+        benchmark_menu.add_command(label="NumPy Tier Mode",
+                                   command=lambda: self._set_mode("numpy"))
         benchmark_menu.add_separator()
         benchmark_menu.add_command(label="Start Benchmark", command=self.start_benchmark)
         benchmark_menu.add_command(label="Stop Benchmark",  command=self.stop_benchmark)
@@ -2096,8 +4782,8 @@ class QuickBenchApp:
         mode_card = ttk.LabelFrame(container, text="Benchmark Mode", padding=14,
                                    style="Section.TLabelframe")
         mode_card.grid(row=2, column=0, sticky="ew", padx=16, pady=(0, 14))
-        mode_card.columnconfigure(0, weight=1)
-        mode_card.columnconfigure(1, weight=1)
+        for i in range(6):
+            mode_card.columnconfigure(i, weight=1)
 
         self.single_mode_btn = tk.Button(
             mode_card, text="Single-Core Benchmark",
@@ -2108,7 +4794,27 @@ class QuickBenchApp:
             mode_card, text="Multi-Core Benchmark",
             command=lambda: self._set_mode("multi"),
             **self._button_base_config())
-        self.multi_mode_btn.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+        self.multi_mode_btn.grid(row=0, column=1, sticky="ew", padx=8)
+        self.memory_mode_btn = tk.Button(
+            mode_card, text="Memory Bandwidth",
+            command=lambda: self._set_mode("memory"),
+            **self._button_base_config())
+        self.memory_mode_btn.grid(row=0, column=2, sticky="ew", padx=8)
+        self.sweep_mode_btn = tk.Button(
+            mode_card, text="Scaling Sweep",
+            command=lambda: self._set_mode("sweep"),
+            **self._button_base_config())
+        self.sweep_mode_btn.grid(row=0, column=3, sticky="ew", padx=8)
+        self.percore_mode_btn = tk.Button(
+            mode_card, text="Per-Core Map",
+            command=lambda: self._set_mode("percore"),
+            **self._button_base_config())
+        self.percore_mode_btn.grid(row=0, column=4, sticky="ew", padx=8)
+        self.numpy_mode_btn = tk.Button(
+            mode_card, text="NumPy Tier",
+            command=lambda: self._set_mode("numpy"),
+            **self._button_base_config())
+        self.numpy_mode_btn.grid(row=0, column=5, sticky="ew", padx=(8, 0))
 
         # -- Main split --
         main = ttk.Frame(container, padding=(16, 0, 16, 16))
@@ -2138,8 +4844,53 @@ class QuickBenchApp:
         self.multi_batch_entry = ttk.Entry(left, textvariable=self.multi_batch_var)
         self.multi_batch_entry.grid(row=2, column=1, sticky="ew", pady=6)
 
+        # Run options (BenchmarkWorker.start **options) share one sub-grid.
+        options = ttk.Frame(left)
+        options.grid(row=3, column=0, columnspan=2, sticky="ew")
+        options.columnconfigure(1, weight=1)
+
+        ttk.Label(options, text="Workload:",
+                  style="Body.TLabel").grid(row=0, column=0, sticky="w", pady=6)
+        self.workload_combo = ttk.Combobox(
+            options, state="readonly",
+            values=[w.label for w in WORKLOADS.values()])
+        self.workload_combo.set(get_workload(DEFAULT_WORKLOAD).label)
+        self.workload_combo.grid(row=0, column=1, sticky="ew", pady=6, padx=(8, 0))
+
+        self.shared_dataset_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options, variable=self.shared_dataset_var,
+            text="Pre-generate multi-core input once in shared memory").grid(
+            row=1, column=0, columnspan=2, sticky="w", pady=6)
+
+        ttk.Label(options, text="Multi-core backend:",
+                  style="Body.TLabel").grid(row=3, column=0, sticky="w", pady=6)
+        self.backend_combo = ttk.Combobox(
+            options, state="readonly", values=list(MULTI_BACKENDS.values()))
+        self.backend_combo.set(MULTI_BACKENDS["processes"])
+        self.backend_combo.grid(row=3, column=1, sticky="ew", pady=6, padx=(8, 0))
+
+        self.pin_workers_var = tk.BooleanVar(value=False)
+        pin_check = ttk.Checkbutton(
+            options, variable=self.pin_workers_var,
+            text="Pin each multi-core worker to its own CPU")
+        pin_check.grid(row=4, column=0, columnspan=2, sticky="w", pady=6)
+        if not affinity_supported():
+            pin_check.state(["disabled"])
+
+        ttk.Label(options, text="Trials / warm-up runs:",
+                  style="Body.TLabel").grid(row=2, column=0, sticky="w", pady=6)
+        trials_row = ttk.Frame(options)
+        trials_row.grid(row=2, column=1, sticky="ew", pady=6, padx=(8, 0))
+        trials_row.columnconfigure(0, weight=1)
+        trials_row.columnconfigure(1, weight=1)
+        ttk.Entry(trials_row, textvariable=self.trials_var, width=6).grid(
+            row=0, column=0, sticky="ew", padx=(0, 6))
+        ttk.Entry(trials_row, textvariable=self.warmup_var, width=6).grid(
+            row=0, column=1, sticky="ew")
+
         presets = ttk.Frame(left)
-        presets.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(8, 14))
+        presets.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(8, 14))
         for i in range(3):
             presets.columnconfigure(i, weight=1)
         self.light_preset_btn = tk.Button(
@@ -2158,23 +4909,23 @@ class QuickBenchApp:
             **self._button_base_config())
         self.stress_preset_btn.grid(row=0, column=2, sticky="ew", padx=(6, 0))
 
-        ttk.Separator(left).grid(row=4, column=0, columnspan=2, sticky="ew", pady=10)
+        ttk.Separator(left).grid(row=5, column=0, columnspan=2, sticky="ew", pady=10)
 
         self.start_btn = ttk.Button(left, text="Start Benchmark",
                                     command=self.start_benchmark)
-        self.start_btn.grid(row=5, column=0, columnspan=2, sticky="ew", pady=6)
+        self.start_btn.grid(row=6, column=0, columnspan=2, sticky="ew", pady=6)
         self.stop_btn = ttk.Button(left, text="Stop Benchmark",
                                    command=self.stop_benchmark)
-        self.stop_btn.grid(row=6, column=0, columnspan=2, sticky="ew", pady=6)
+        self.stop_btn.grid(row=7, column=0, columnspan=2, sticky="ew", pady=6)
         ttk.Button(left, text="Save Current Result",
                    command=self._save_current_result).grid(
-            row=7, column=0, columnspan=2, sticky="ew", pady=6)
+            row=8, column=0, columnspan=2, sticky="ew", pady=6)
         ttk.Button(left, text="View History",
                    command=self._show_history).grid(
-            row=8, column=0, columnspan=2, sticky="ew", pady=6)
+            row=9, column=0, columnspan=2, sticky="ew", pady=6)
         ttk.Button(left, text="How It Works",
                    command=self._show_how_it_works).grid(
-            row=9, column=0, columnspan=2, sticky="ew", pady=6)
+            row=10, column=0, columnspan=2, sticky="ew", pady=6)
 
         # Right: Live Status
         right = ttk.LabelFrame(main, text="Live Status", padding=16,
@@ -2208,6 +4959,114 @@ class QuickBenchApp:
         self._make_right_wrap_label(
             right, textvariable=self.result_var, style="Result.TLabel", width=320).grid(
             row=11, column=0, sticky="nw", pady=(6, 0))
+        # Result chart — only gridded while the last result has one to show.
+        self._chart_spec   = None
+        self.chart_canvas  = tk.Canvas(right, height=CHART_HEIGHT, highlightthickness=0,
+                                       bg="#FFFFFF")
+        self.chart_canvas.bind("<Configure>", lambda _e: self._draw_chart())
+
+    # ------------------------------------------------------------------
+    # Result chart
+    # ------------------------------------------------------------------
+
+    def _show_chart(self, spec):
+        self._chart_spec = spec
+        self.chart_canvas.grid(row=12, column=0, sticky="ew", pady=(12, 0))
+        self._draw_chart()
+
+    def _hide_chart(self):
+        self._chart_spec = None
+        self.chart_canvas.grid_remove()
+
+    def _draw_chart(self):
+        """Plot self._chart_spec as x/y lines (see sweep_chart for the format)."""
+        canvas = self.chart_canvas
+        canvas.delete("all")
+        spec = self._chart_spec
+        if not spec:
+            return
+        if spec.get("kind") == "heatmap":
+            self._draw_heatmap(spec)
+            return
+        width  = max(200, canvas.winfo_width())
+        height = CHART_HEIGHT
+        left, right, top, bottom = 44, 10, 22, 30
+        points = [pt for series in spec["series"] for pt in series["points"]]
+        if not points:
+            return
+        log_x = spec.get("log_x", False)
+        tx    = (lambda v: math.log2(v)) if log_x else (lambda v: v)
+        xs    = [tx(x) for x, _ in points]
+        x_min, x_max = min(xs), max(xs)
+        y_min, y_max = 0.0, max(y for _, y in points) * 1.08 or 1.0
+        x_span = (x_max - x_min) or 1.0
+
+        def px(x):
+            return left + (tx(x) - x_min) / x_span * (width - left - right)
+
+        def py(y):
+            return height - bottom - (y - y_min) / (y_max - y_min) * (height - top - bottom)
+
+        font = _ui_font(8)
+        canvas.create_text(left, 4, text=spec["title"], anchor="nw", font=_ui_font(9, "bold"))
+        canvas.create_line(left, top, left, height - bottom, fill="#888888")
+        canvas.create_line(left, height - bottom, width - right, height - bottom,
+                           fill="#888888")
+        for frac in (0.0, 0.5, 1.0):
+            y = y_min + frac * (y_max - y_min)
+            canvas.create_text(left - 4, py(y), text=f"{y:.3g}", anchor="e", font=font)
+        for x in spec.get("x_ticks") or sorted({x for x, _ in points}):
+            canvas.create_text(px(x), height - bottom + 4, text=format_short_count(x),
+                               anchor="n", font=font)
+        canvas.create_text(width - right, height - 4, text=spec["x_label"],
+                           anchor="se", font=font)
+
+        legend_x = left + 6
+        for series in spec["series"]:
+            coords = [c for x, y in series["points"] for c in (px(x), py(y))]
+            dash   = (4, 3) if series.get("dash") else None
+            if len(coords) >= 4:
+                canvas.create_line(*coords, fill=series["color"], width=2, dash=dash)
+            if series.get("markers"):
+                for x, y in series["points"]:
+                    canvas.create_oval(px(x) - 3, py(y) - 3, px(x) + 3, py(y) + 3,
+                                       fill=series["color"], outline="")
+            item = canvas.create_text(legend_x, top + 2, text=series["label"], anchor="nw",
+                                      fill=series["color"], font=font)
+            legend_x = canvas.bbox(item)[2] + 10
+
+    def _draw_heatmap(self, spec):
+        """Plot a percore_heatmap spec: one labelled row of coloured cells per group."""
+        canvas = self.chart_canvas
+        width  = max(200, canvas.winfo_width())
+        rows   = spec["rows"]
+        left, right, top, bottom = 110, 10, 22, 8
+        gap    = 4
+        cell_w = max(8, min(40, min(
+            (width - left - right - gap * sum(c["gap_before"] for c in r["cells"]))
+            / len(r["cells"]) for r in rows)))
+        row_h  = max(10, min(28, (CHART_HEIGHT - top - bottom) / len(rows)))
+        low, high = spec["min"], spec["max"]
+        font   = _ui_font(8)
+
+        canvas.create_text(left, 4, text=spec["title"], anchor="nw", font=_ui_font(9, "bold"))
+        canvas.create_text(width - right, 4, anchor="ne", font=font,
+                           text=f"{low} … {high}")
+        for r, row in enumerate(rows):
+            y0 = top + r * row_h
+            canvas.create_text(left - 6, y0 + row_h / 2, text=row["label"], anchor="e",
+                               font=font)
+            x = left
+            for cell in row["cells"]:
+                if cell["gap_before"]:
+                    x += gap
+                frac = (cell["value"] - low) / (high - low) if high > low else 1.0
+                canvas.create_rectangle(x, y0 + 1, x + cell_w - 1, y0 + row_h - 1,
+                                        fill=_heat_color(frac), outline="")
+                if cell_w >= 14 and row_h >= 12:
+                    canvas.create_text(x + cell_w / 2, y0 + row_h / 2, text=cell["label"],
+                                       font=font, fill="#FFFFFF")
+                x += cell_w
 
     # ------------------------------------------------------------------
     # Button helpers
@@ -2237,6 +5096,10 @@ class QuickBenchApp:
     def _refresh_selection_outlines(self):
         self._set_button_selected(self.single_mode_btn,    self.benchmark_type == "single")
         self._set_button_selected(self.multi_mode_btn,     self.benchmark_type == "multi")
+        self._set_button_selected(self.memory_mode_btn,    self.benchmark_type == "memory")
+        self._set_button_selected(self.sweep_mode_btn,     self.benchmark_type == "sweep")
+        self._set_button_selected(self.percore_mode_btn,   self.benchmark_type == "percore")
+        self._set_button_selected(self.numpy_mode_btn,     self.benchmark_type == "numpy")
         self._set_button_selected(self.light_preset_btn,   self.selected_preset == "light")
         self._set_button_selected(self.balanced_preset_btn,self.selected_preset == "balanced")
         self._set_button_selected(self.stress_preset_btn,  self.selected_preset == "stress")
@@ -2281,10 +5144,18 @@ class QuickBenchApp:
         self.root.bind("<Control-r>", lambda _e: self.start_benchmark())
         self.root.bind("<Control-1>", lambda _e: self._set_mode("single"))
         self.root.bind("<Control-2>", lambda _e: self._set_mode("multi"))
+        self.root.bind("<Control-3>", lambda _e: self._set_mode("memory"))
+        self.root.bind("<Control-4>", lambda _e: self._set_mode("sweep"))
+        self.root.bind("<Control-5>", lambda _e: self._set_mode("percore"))
+        self.root.bind("<Control-6>", lambda _e: self._set_mode("numpy"))
         if sys.platform == "darwin":
             self.root.bind("<Command-r>", lambda _e: self.start_benchmark())
             self.root.bind("<Command-1>", lambda _e: self._set_mode("single"))
             self.root.bind("<Command-2>", lambda _e: self._set_mode("multi"))
+            self.root.bind("<Command-3>", lambda _e: self._set_mode("memory"))
+            self.root.bind("<Command-4>", lambda _e: self._set_mode("sweep"))
+            self.root.bind("<Command-5>", lambda _e: self._set_mode("percore"))
+            self.root.bind("<Command-6>", lambda _e: self._set_mode("numpy"))
             self.root.bind("<Command-q>", lambda _e: self._on_close())
 
     # ------------------------------------------------------------------
@@ -2317,6 +5188,32 @@ class QuickBenchApp:
             self.status_var.set("Ready for single-core benchmark")
             self.result_var.set("This mode sorts one large list using a single CPU core.")
             self.batches_var.set("Batches Completed: 0")
+        elif mode == "sweep":
+            self.status_var.set("Ready for core-count scaling sweep")
+            self.result_var.set(
+                "This mode reruns the multi-core test with 1, 2, 4, … N and 2N worker "
+                "processes. The duration field sets the length of each step.")
+            self.batches_var.set("Batches Completed: 0")
+        elif mode == "percore":
+            self.status_var.set("Ready for per-core benchmark")
+            self.result_var.set(
+                "This mode pins one worker to each logical CPU in turn and maps the "
+                "per-core scores by package, cluster, core and SMT sibling (Linux). "
+                "The duration field sets the total length, shared across CPUs.")
+            self.batches_var.set("Batches Completed: 0")
+        elif mode == "memory":
+            self.status_var.set("Ready for memory bandwidth benchmark")
+            self.result_var.set(
+                "This mode runs STREAM-style copy / scale / add / triad kernels on "
+                "buffers larger than the CPU cache, on one core and on all cores.")
+            self.batches_var.set("Batches Completed: 0")
+        elif mode == "numpy":
+            self.status_var.set("Ready for NumPy tier benchmark")
+            self.result_var.set(
+                "This mode times NumPy's native sort, matrix multiply and reductions "
+                "on one core and on all cores, next to the pure-Python scores. "
+                "It is skipped when NumPy is not installed.")
+            self.batches_var.set("Batches Completed: 0")
         else:
             self.status_var.set("Ready for multi-core benchmark")
             self.result_var.set(
@@ -2361,6 +5258,18 @@ class QuickBenchApp:
             "Multi-Core Benchmark\n\n"
             "Starts one worker process per CPU core. Each worker repeatedly generates "
             "and sorts a batch of random numbers until the timer ends.\n\n"
+            "Workloads\n\n"
+            "Integer sort is the default. The dict/hashing, floating-point and "
+            "allocation workloads run through the same single- and multi-core "
+            "runners and are scored in work units per second.\n\n"
+            "Scaling Sweep\n\n"
+            "Reruns the multi-core test with 1, 2, 4, … N and 2N workers, then fits "
+            "Amdahl's law and the Universal Scalability Law to the speedup curve.\n\n"
+            "Memory Bandwidth\n\n"
+            "Runs STREAM-style copy, scale, add and triad kernels over buffers several "
+            "times larger than the last-level cache, first on one core and then in one "
+            "process per core. Copy is the bandwidth figure and the score; scale, add "
+            "and triad are compute-bound in CPython and shown as effective rates.\n\n"
             "Responsive UI\n\n"
             "The window uses a scrollable layout, so shrinking the window will not "
             "cut off the controls.",
@@ -2406,6 +5315,11 @@ class QuickBenchApp:
                 self.multi_duration_var.get(), "Multi-core duration")
             multi_batch    = self._validate_positive_int(
                 self.multi_batch_var.get(), "Multi-core batch size")
+            trials         = self._validate_positive_int(
+                self.trials_var.get(), "Trial count")
+            warmup         = (0 if self.warmup_var.get().strip() in ("", "0")
+                              else self._validate_positive_int(
+                                  self.warmup_var.get(), "Warm-up run count"))
         except ValueError as exc:
             messagebox.showerror("Invalid Input", str(exc))
             return
@@ -2413,6 +5327,7 @@ class QuickBenchApp:
         # Reset per-run auto-save flags.
         self._single_auto_saved = False
         self._multi_auto_saved  = False
+        self._auto_saved.clear()
 
         self.progress["value"] = 0
         self.percent_var.set("0%")
@@ -2421,10 +5336,30 @@ class QuickBenchApp:
         self.result_var.set("Benchmark in progress…")
         self.batches_var.set("Batches Completed: 0")
         self.status_var.set("Starting benchmark…")
+        self._hide_chart()
         self.timer_started_at = time.perf_counter()
         self.timer_running    = True
         self._tick_timer()
-        self.worker.start(self.benchmark_type, single_numbers, multi_duration, multi_batch)
+        self.worker.start(self.benchmark_type, single_numbers, multi_duration, multi_batch,
+                          workload=self._selected_workload(),
+                          dataset="shared" if self.shared_dataset_var.get() else "private",
+                          trials=trials, warmup=warmup,
+                          backend=self._selected_backend(),
+                          pin=self.pin_workers_var.get())
+
+    def _selected_workload(self):
+        label = self.workload_combo.get()
+        for workload in WORKLOADS.values():
+            if workload.label == label:
+                return workload.name
+        return DEFAULT_WORKLOAD
+
+    def _selected_backend(self):
+        label = self.backend_combo.get()
+        for name, backend_label in MULTI_BACKENDS.items():
+            if backend_label == label:
+                return name
+        return "processes"
 
     def stop_benchmark(self):
         if not self.worker.is_running():
@@ -2452,6 +5387,7 @@ class QuickBenchApp:
     def _poll_events(self):
         MAX_PER_TICK = 20
         processed    = 0
+        self._sample_telemetry()
         try:
             while processed < MAX_PER_TICK:
                 event = self.event_queue.get_nowait()
@@ -2461,19 +5397,28 @@ class QuickBenchApp:
             pass
         self.root.after(100, self._poll_events)
 
+    def _sample_telemetry(self):
+        """Show the worker's latest readings; a no-op when nothing changed."""
+        version, values = self.worker.telemetry.snapshot()
+        if version == self._telemetry_version:
+            return
+        self._telemetry_version = version
+        if values["progress"] is not None:
+            percent = max(0, min(100, int(values["progress"])))
+            self.progress["value"] = percent
+            self.percent_var.set(f"{percent}%")
+        if values["cpu"] is not None:
+            self.usage_var.set(f"CPU: {values['cpu']:.1f}%   RAM: {values['ram']:.1f}%")
+        if values["batches"] is not None:
+            text = f"Batches Completed: {values['batches']:,}"
+            if values["items_per_s"]:
+                text += f"   ({values['items_per_s'] / 1e6:.2f}M items/s)"
+            self.batches_var.set(text)
+
     def _handle_event(self, event):
         event_type = event[0]
         if event_type == "status":
             self.status_var.set(event[1])
-        elif event_type == "progress":
-            percent = max(0, min(100, int(event[1])))
-            self.progress["value"] = percent
-            self.percent_var.set(f"{percent}%")
-        elif event_type == "usage":
-            avg_cpu, mem = event[1], event[2]
-            self.usage_var.set(f"CPU: {avg_cpu:.1f}%   RAM: {mem:.1f}%")
-        elif event_type == "batches":
-            self.batches_var.set(f"Batches Completed: {event[1]}")
         elif event_type == "single_result":
             result = event[1]
             self.timer_running = False
@@ -2482,7 +5427,7 @@ class QuickBenchApp:
             if not result["cancelled"]:
                 self.progress["value"] = 100
                 self.percent_var.set("100%")
-                self.status_var.set("Single-core benchmark complete")
+                self.status_var.set(self._completion_status("Single-core", result))
                 # FIX: auto-save exactly once per run.
                 if not self._single_auto_saved:
                     self._save_result_to_history("single", result)
@@ -2490,21 +5435,35 @@ class QuickBenchApp:
             else:
                 self.status_var.set("Single-core benchmark cancelled")
             self.result_var.set(
-                f"Items sorted: {result['items']:,}\n"
+                f"Workload: {_workload_label(result)}\n"
+                f"Items processed: {result['items']:,}\n"
                 f"Data generation: {result['generation_time']:.2f}s\n"
-                f"Sort time: {result['sort_time']:.2f}s\n"
+                f"Input data in RAM: {bytes_to_mb_string(result.get('data_rss'))}\n"
+                f"Peak RSS during the run: {bytes_to_mb_string(result.get('peak_rss'))}\n"
+                f"Run time: {result['sort_time']:.2f}s\n"
                 f"Batches completed: {result['batches']}\n"
                 f"Average CPU: {result['avg_cpu']:.1f}%\n"
                 f"RAM in use: {result['ram']:.1f}%\n"
                 f"Single score: {result['score']}"
+                + (f"\n{format_trials(result)}" if result.get("trials") else "")
+                + (f"\n{format_pass_profile(result)}" if result.get("pass_profile") else "")
+                + (f"\n{format_baseline(result['baseline'])}" if result.get("baseline") else "")
             )
+            if result.get("pass_profile"):
+                self._show_chart(pass_profile_chart(result))
+            else:
+                self._hide_chart()
         elif event_type == "multi_result":
             result = event[1]
             self.timer_running = False
             self.last_multi_result = result
+            if result.get("timeline"):
+                self._show_chart(timeline_chart(result))
+            else:
+                self._hide_chart()
             self._update_score_text()
             if not result["cancelled"]:
-                self.status_var.set("Multi-core benchmark complete")
+                self.status_var.set(self._completion_status("Multi-core", result))
                 # FIX: auto-save exactly once per run.
                 if not self._multi_auto_saved:
                     self._save_result_to_history("multi", result)
@@ -2512,15 +5471,48 @@ class QuickBenchApp:
             else:
                 self.status_var.set("Multi-core benchmark cancelled")
             self.result_var.set(
+                f"Workload: {_workload_label(result)}\n"
+                f"Backend: {MULTI_BACKENDS.get(result.get('backend'), 'Processes')}\n"
                 f"CPU cores used: {result['cores']}\n"
                 f"Runtime: {result['elapsed']:.2f}s\n"
                 f"Batches completed: {result['batches']}\n"
                 f"Requested batch size: {result['batch_size']:,}\n"
                 f"Effective batch size: {result['effective_batch_size']:,}\n"
+                f"{format_worker_balance(result)}\n"
+                f"{format_dataset(result)}\n"
+                f"{format_worker_pool(result)}\n"
                 f"Average CPU: {result['avg_cpu']:.1f}%\n"
                 f"RAM in use: {result['ram']:.1f}%\n"
                 f"Multi score: {result['score']}"
+                + (f"\n{format_timeline(result)}" if result.get("timeline") else "")
+                + (f"\n{format_backend_comparison(result)}" if result.get("comparison") else "")
+                + (f"\n{format_trials(result)}" if result.get("trials") else "")
+                + (f"\n{format_baseline(result['baseline'])}" if result.get("baseline") else "")
             )
+        elif event_type == "memory_result":
+            self._finish_result("memory", event[1], "Memory bandwidth benchmark",
+                                format_memory_result(event[1]))
+            self._hide_chart()
+        elif event_type == "numpy_result":
+            result = event[1]
+            self._hide_chart()
+            if result.get("skipped"):
+                self.timer_running = False
+                self.status_var.set("NumPy tier skipped")
+                self.result_var.set(format_numpy_result(result))
+            else:
+                self._finish_result("numpy", result, "NumPy tier benchmark",
+                                    format_numpy_result(result))
+        elif event_type == "sweep_result":
+            result = event[1]
+            self._finish_result("sweep", result, "Scaling sweep",
+                                format_sweep_result(result))
+            self._show_chart(sweep_chart(result))
+        elif event_type == "percore_result":
+            result = event[1]
+            self._finish_result("percore", result, "Per-core benchmark",
+                                format_percore_result(result))
+            self._show_chart(percore_heatmap(result))
         elif event_type == "error":
             self.timer_running = False
             self.status_var.set("Benchmark failed")
@@ -2529,6 +5521,30 @@ class QuickBenchApp:
         elif event_type == "done":
             self.timer_running = False
 
+    @staticmethod
+    def _completion_status(title, result):
+        trials = result.get("trials")
+        if trials and trials["noisy"]:
+            return (f"{title} benchmark complete — high variation between trials "
+                    f"(CV {trials['stats']['cv']:.1f}%)")
+        return f"{title} benchmark complete"
+
+    def _finish_result(self, benchmark_type, result, title, text):
+        """Shared completion path for the modes tracked in last_results."""
+        self.timer_running = False
+        self.last_results[benchmark_type] = result
+        if not result["cancelled"]:
+            self.status_var.set(f"{title} complete")
+            # Auto-save exactly once per run, like single / multi.
+            if benchmark_type not in self._auto_saved:
+                self._save_result_to_history(benchmark_type, result)
+                self._auto_saved.add(benchmark_type)
+        else:
+            self.status_var.set(f"{title} cancelled")
+        if result.get("baseline"):
+            text += f"\n{format_baseline(result['baseline'])}"
+        self.result_var.set(text)
+
     # ------------------------------------------------------------------
     # Score helpers
     # ------------------------------------------------------------------
@@ -2555,50 +5571,18 @@ class QuickBenchApp:
     # History persistence
     # ------------------------------------------------------------------
 
-    def _load_history(self):
-        if not os.path.exists(HISTORY_FILE):
-            return []
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-        except Exception:
-            pass
-        return []
-
-    def _save_history(self, rows):
+    def _save_result_to_history(self, benchmark_type, result):
         try:
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(rows, f, indent=2)
+            verdict = append_history_row(
+                build_history_row(self.system_info, benchmark_type, result))
         except Exception as exc:
             messagebox.showerror(APP_NAME, f"Could not save history:\n{exc}")
-
-    def _save_result_to_history(self, benchmark_type, result):
-        rows = self._load_history()
-        rows.append({
-            "timestamp":           datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "machine_name":        self.system_info["label"],
-            "model":               self.system_info["model"],
-            "cpu_name":            self.system_info["cpu"],
-            "gpu_name":            self.system_info["gpu"],
-            "gpu_vram":            self.system_info["gpu_vram"],
-            "gpu_cores":           self.system_info["gpu_cores"],
-            "cpu_frequency":       self.system_info["cpu_frequency"],
-            "cpu_physical_cores":  self.system_info["cpu_cores_physical"],
-            "cpu_logical_threads": self.system_info["cpu_cores_logical"],
-            "installed_ram":       self.system_info["ram"],
-            "ram_type":            self.system_info["ram_type"],
-            "ram_speed":           self.system_info["ram_speed"],
-            "type":                benchmark_type,
-            "score":               result.get("score", 0),
-            "system":              self.system_info["platform_name"],
-            "python":              platform.python_version(),
-            "avg_cpu":             round(float(result.get("avg_cpu", 0.0)), 1),
-            "ram":                 round(float(result.get("ram",     0.0)), 1),
-            "details":             result,
-        })
-        self._save_history(rows)
+            return
+        # Shown with the result text; a regression also goes in the status bar.
+        result["baseline"] = verdict
+        if verdict["status"] == "regression":
+            self.status_var.set(f"{self.status_var.get()} — ⚠ {verdict['change']:+.1f}% "
+                                f"below this machine's baseline")
 
     def _save_current_result(self):
         # FIX: results are auto-saved when a benchmark finishes.
@@ -2616,13 +5600,20 @@ class QuickBenchApp:
             self._save_result_to_history("multi", self.last_multi_result)
             self._multi_auto_saved = True
             saved = True
+        for benchmark_type, result in self.last_results.items():
+            if not result.get("cancelled") and benchmark_type not in self._auto_saved:
+                self._save_result_to_history(benchmark_type, result)
+                self._auto_saved.add(benchmark_type)
+                saved = True
 
         if saved:
             messagebox.showinfo(APP_NAME, "Current completed result(s) saved to history.")
         elif ((self.last_single_result and not self.last_single_result.get("cancelled")
                and self._single_auto_saved) or
               (self.last_multi_result and not self.last_multi_result.get("cancelled")
-               and self._multi_auto_saved)):
+               and self._multi_auto_saved) or
+              any(not result.get("cancelled") and benchmark_type in self._auto_saved
+                  for benchmark_type, result in self.last_results.items())):
             messagebox.showinfo(APP_NAME, "Results have already been saved automatically.")
         else:
             messagebox.showinfo(APP_NAME,
@@ -2631,6 +5622,11 @@ class QuickBenchApp:
     # ------------------------------------------------------------------
     # History window
     # FIX: only one window allowed; horizontal scrollbar; transient
+    # The tree is virtual: it only ever holds the rows that fit on screen.
+    # The scrollbar maps onto the whole filtered history, and scrolling
+    # re-fills the same items from a HistoryPager. Sorting and filtering go
+    # to the database indexes, so opening the window costs one COUNT and
+    # one page however long the history is.
     # ------------------------------------------------------------------
 
     def _show_history(self):
@@ -2640,7 +5636,6 @@ class QuickBenchApp:
             self._history_window.focus_force()
             return
 
-        rows = self._load_history()
         win  = tk.Toplevel(self.root)
         win.title(f"{APP_NAME} Score History")
         win.geometry("1280x560")
@@ -2652,7 +5647,7 @@ class QuickBenchApp:
         frame = ttk.Frame(win, padding=14)
         frame.pack(fill="both", expand=True)
         frame.columnconfigure(0, weight=1)
-        frame.rowconfigure(2, weight=1)
+        frame.rowconfigure(3, weight=1)
 
         ttk.Label(frame, text=f"{APP_NAME} Score History",
                   style="Title.TLabel").grid(row=0, column=0, columnspan=2, sticky="w")
@@ -2661,10 +5656,46 @@ class QuickBenchApp:
                   style="Body.TLabel").grid(
             row=1, column=0, columnspan=2, sticky="w", pady=(4, 10))
 
+        # ---- Filters ----
+        try:
+            import_legacy_history()
+            machines = history_machines()
+            types    = history_types()
+        except Exception as exc:
+            messagebox.showerror(APP_NAME, f"Could not read history:\n{exc}", parent=win)
+            machines, types = [], []
+        all_machines, all_tests = "All machines", "All tests"
+        machine_ids = {label: fp for fp, label in machines}
+
+        bar = ttk.Frame(frame)
+        bar.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+        machine_var = tk.StringVar(value=all_machines)
+        type_var    = tk.StringVar(value=all_tests)
+        since_var   = tk.StringVar()
+        until_var   = tk.StringVar()
+        status_var  = tk.StringVar()
+
+        ttk.Label(bar, text="Machine", style="Body.TLabel").pack(side="left")
+        machine_combo = ttk.Combobox(bar, textvariable=machine_var, state="readonly", width=40,
+                                     values=[all_machines] + [label for _, label in machines])
+        machine_combo.pack(side="left", padx=(6, 14))
+        ttk.Label(bar, text="Test", style="Body.TLabel").pack(side="left")
+        type_combo = ttk.Combobox(bar, textvariable=type_var, state="readonly", width=12,
+                                  values=[all_tests] + types)
+        type_combo.pack(side="left", padx=(6, 14))
+        ttk.Label(bar, text="From", style="Body.TLabel").pack(side="left")
+        since_entry = ttk.Entry(bar, textvariable=since_var, width=11)
+        since_entry.pack(side="left", padx=(6, 8))
+        ttk.Label(bar, text="To", style="Body.TLabel").pack(side="left")
+        until_entry = ttk.Entry(bar, textvariable=until_var, width=11)
+        until_entry.pack(side="left", padx=(6, 8))
+        ttk.Label(bar, text="(YYYY-MM-DD)", style="Body.TLabel").pack(side="left")
+        ttk.Label(bar, textvariable=status_var, style="Body.TLabel").pack(side="right")
+
         columns = ("timestamp", "model", "cpu", "gpu", "ram_installed",
                    "cores", "freq", "type", "score")
         tree = ttk.Treeview(frame, columns=columns, show="headings")
-        tree.grid(row=2, column=0, sticky="nsew")
+        tree.grid(row=3, column=0, sticky="nsew")
 
         headings = {
             "timestamp":    "Timestamp",
@@ -2679,23 +5710,26 @@ class QuickBenchApp:
         }
         widths = {
             "timestamp": 150, "model": 170, "cpu": 230, "gpu": 190,
-            "ram_installed": 90, "cores": 90, "freq": 95, "type": 70, "score": 80,
+            "ram_installed": 90, "cores": 90, "freq": 95, "type": 100, "score": 80,
         }
         centered = {"type", "score", "ram_installed", "cores", "freq"}
         for key in columns:
-            tree.heading(key, text=headings[key])
+            tree.heading(key, text=headings[key], command=lambda k=key: sort_by(k))
             tree.column(key, width=widths[key],
                         anchor="center" if key in centered else "w")
 
         # FIX: both vertical and horizontal scrollbars.
-        vsb = ttk.Scrollbar(frame, orient="vertical",   command=tree.yview)
+        vsb = ttk.Scrollbar(frame, orient="vertical",   command=lambda *a: scroll(*a))
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
-        vsb.grid(row=2, column=1, sticky="ns")
-        hsb.grid(row=3, column=0, sticky="ew")
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        vsb.grid(row=3, column=1, sticky="ns")
+        hsb.grid(row=4, column=0, sticky="ew")
+        tree.configure(xscrollcommand=hsb.set)
 
-        for row in reversed(rows):
-            tree.insert("", "end", values=(
+        view = {"pager": None, "first": 0, "visible": 20,
+                "filters": {}, "sort": "timestamp", "descending": True}
+
+        def values_for(row):
+            return (
                 row.get("timestamp", ""),
                 row.get("model", row.get("machine_name", "")),
                 row.get("cpu_name", ""),
@@ -2703,9 +5737,122 @@ class QuickBenchApp:
                 row.get("installed_ram", ""),
                 row.get("cpu_physical_cores", ""),
                 row.get("cpu_frequency", ""),
-                row.get("type", ""),
+                _history_test_label(row),
                 row.get("score", ""),
-            ))
+            )
+
+        def render():
+            pager = view["pager"]
+            total = pager.total if pager else 0
+            view["first"] = max(0, min(view["first"], total - view["visible"]))
+            try:
+                rows = pager.rows(view["first"], view["visible"]) if pager else []
+            except Exception as exc:
+                status_var.set(f"Could not read history: {exc}")
+                rows = []
+            # Re-use the existing items; only the on-screen rows exist.
+            items = tree.get_children()
+            if len(items) > len(rows):
+                tree.delete(*items[len(rows):])
+            for i, row in enumerate(rows):
+                if i < len(items):
+                    tree.item(items[i], values=values_for(row))
+                else:
+                    tree.insert("", "end", values=values_for(row))
+            if total:
+                vsb.set(view["first"] / total, (view["first"] + len(rows)) / total)
+            else:
+                vsb.set(0.0, 1.0)
+
+        def close_pager():
+            if view["pager"] is not None:
+                view["pager"].close()
+                view["pager"] = None
+
+        def reload():
+            close_pager()
+            try:
+                view["pager"] = HistoryPager(view["filters"], view["sort"], view["descending"])
+                shown = view["pager"].total
+                status_var.set(f"{shown} result{'s' if shown != 1 else ''}")
+            except Exception as exc:
+                view["pager"] = None
+                status_var.set(f"Could not read history: {exc}")
+            view["first"] = 0
+            for key in columns:
+                arrow = ""
+                if key == view["sort"]:
+                    arrow = " ▼" if view["descending"] else " ▲"
+                tree.heading(key, text=headings[key] + arrow)
+            render()
+
+        def scroll(action, amount, unit=None):
+            if action == "moveto":
+                total = view["pager"].total if view["pager"] else 0
+                view["first"] = int(float(amount) * total)
+            else:
+                step = max(1, view["visible"] - 1) if unit == "pages" else 1
+                view["first"] += int(amount) * step
+            render()
+
+        def on_wheel(event):
+            if event.num == 4 or event.num == 5:          # X11
+                steps = -1 if event.num == 4 else 1
+            else:                                         # Windows / macOS deltas
+                steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+            scroll("scroll", steps * 3, "units")
+            return "break"
+
+        def on_resize(event):
+            rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+            # +1 so a partly visible last row is filled too; minus the heading.
+            visible = max(1, (event.height - rowheight - 4) // rowheight + 1)
+            if visible != view["visible"]:
+                view["visible"] = visible
+                render()
+
+        def sort_by(key):
+            if key == view["sort"]:
+                view["descending"] = not view["descending"]
+            else:
+                view["sort"]       = key
+                view["descending"] = key in ("timestamp", "score")
+            reload()
+
+        def parse_day(text, label):
+            text = text.strip()
+            if not text:
+                return None
+            try:
+                return datetime.strptime(text, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"{label} must be a date like 2024-05-31.") from None
+
+        def apply_filters(_event=None):
+            try:
+                since = parse_day(since_var.get(), "From")
+                until = parse_day(until_var.get(), "To")
+            except ValueError as exc:
+                messagebox.showerror(APP_NAME, str(exc), parent=win)
+                return
+            view["filters"] = {
+                "fingerprint":    machine_ids.get(machine_var.get()),
+                "benchmark_type": type_var.get() if type_var.get() != all_tests else None,
+                "since":          since.strftime("%Y-%m-%d") if since else None,
+                "before":         (until + timedelta(days=1)).strftime("%Y-%m-%d") if until else None,
+            }
+            reload()
+
+        machine_combo.bind("<<ComboboxSelected>>", apply_filters)
+        type_combo.bind("<<ComboboxSelected>>", apply_filters)
+        since_entry.bind("<Return>", apply_filters)
+        until_entry.bind("<Return>", apply_filters)
+        ttk.Button(bar, text="Apply", command=apply_filters).pack(side="left", padx=(8, 0))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, on_wheel)
+        tree.bind("<Configure>", on_resize)
+        win.bind("<Destroy>", lambda event: close_pager() if event.widget is win else None)
+        reload()
 
     def _close_history(self, win):
         self._history_window = None
@@ -2745,6 +5892,774 @@ class QuickBenchApp:
         self.root.destroy()
 
 
+# ---------------------------------------------------------------------------
+# Result comparison (--compare A B)
+# Each side is a set of saved results: a JSON file (a --json export or a
+# pre-3.1 history file), a history database, or "history:key=value,…" to
+# filter the local history. Results are grouped by test and workload; every
+# trial score in a result's details counts as a sample. A difference is only
+# reported as real when the Mann–Whitney U test and the bootstrap CI of the
+# median change agree; otherwise it is "no significant difference".
+# ---------------------------------------------------------------------------
+
+COMPARE_ALPHA       = 0.05
+COMPARE_RESAMPLES   = 2000
+COMPARE_MIN_SAMPLES = 2
+_COMPARE_FILTERS    = ("machine", "type", "workload", "python", "since", "before")
+
+
+def load_compare_source(spec):
+    """(label, rows) for one side of a comparison; raises ValueError."""
+    if spec == "history" or spec.startswith("history:"):
+        filters = {}
+        for part in filter(None, spec.partition(":")[2].split(",")):
+            key, sep, value = part.partition("=")
+            key = key.strip()
+            if not sep or key not in _COMPARE_FILTERS:
+                raise ValueError(f"{spec!r}: filters are key=value with key one of "
+                                 f"{', '.join(_COMPARE_FILTERS)}")
+            filters[key] = value.strip()
+        rows = query_history(benchmark_type=filters.get("type"),
+                             since=filters.get("since"), before=filters.get("before"))
+        machine = filters.get("machine", "").lower()
+        if machine:
+            rows = [r for r in rows
+                    if r.get("fingerprint", "").startswith(machine)
+                    or any(machine in str(r.get(k, "")).lower()
+                           for k in ("machine_name", "model", "cpu_name"))]
+        if "workload" in filters:
+            rows = [r for r in rows if r.get("workload") == filters["workload"]]
+        if "python" in filters:
+            rows = [r for r in rows if str(r.get("python", "")).startswith(filters["python"])]
+        return spec, rows
+    if not os.path.isfile(spec):
+        raise ValueError(f"{spec}: no such file")
+    with open(spec, "rb") as f:
+        is_sqlite = f.read(16) == b"SQLite format 3\x00"
+    if is_sqlite:
+        return os.path.basename(spec), query_history(path=spec)
+    try:
+        with open(spec, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"{spec}: not a QuickBench JSON file ({exc})") from None
+    if not isinstance(rows, list):
+        raise ValueError(f"{spec}: expected a list of result rows")
+    return os.path.basename(spec), [r for r in rows if isinstance(r, dict)]
+
+
+def comparison_samples(rows):
+    """{(type, workload, options): [scores]}: each row's trial scores, or its
+    score. options is the options_label() of the run, so samples measured
+    with different backends or settings are never compared."""
+    groups = {}
+    for row in rows:
+        if row.get("score") is None:
+            continue
+        trials = (row.get("details") or {}).get("trials") or {}
+        scores = trials.get("scores") or [row["score"]]
+        key    = (row.get("type", ""), row.get("workload"), options_label(baseline_options(row)))
+        groups.setdefault(key, []).extend(scores)
+    return groups
+
+
+def mann_whitney_u(a, b):
+    """(U for a, two-sided p) by the normal approximation with tie correction."""
+    n1, n2 = len(a), len(b)
+    pooled = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    rank_a, ties, i = 0.0, 0, 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1                  # average rank of the tied run
+        rank_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    n = n1 + n2
+    u = rank_a - n1 * (n1 + 1) / 2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(var)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_median_change(a, b, resamples=COMPARE_RESAMPLES, seed=0):
+    """95% percentile-bootstrap CI of (median(b) / median(a) − 1) × 100."""
+    rng     = random.Random(seed)           # same inputs, same interval
+    changes = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(a, k=len(a)))
+        if base:
+            changes.append((statistics.median(rng.choices(b, k=len(b))) / base - 1) * 100)
+    if not changes:
+        return None
+    changes.sort()
+    return (changes[int(0.025 * (len(changes) - 1))],
+            changes[int(0.975 * (len(changes) - 1))])
+
+
+def compare_result_sets(rows_a, rows_b):
+    """Per-test comparison of B against A, in test order."""
+    groups_a, groups_b = comparison_samples(rows_a), comparison_samples(rows_b)
+    out = []
+    for key in sorted(set(groups_a) | set(groups_b), key=lambda k: (k[0], str(k[1]), k[2])):
+        a, b = groups_a.get(key, []), groups_b.get(key, [])
+        entry = {"type": key[0], "workload": key[1], "options": key[2],
+                 "n_a": len(a), "n_b": len(b)}
+        if min(len(a), len(b)) < COMPARE_MIN_SAMPLES:
+            entry["verdict"] = "too few samples"
+            out.append(entry)
+            continue
+        median_a, median_b = statistics.median(a), statistics.median(b)
+        _, p = mann_whitney_u(a, b)
+        ci   = bootstrap_median_change(a, b)
+        significant = p < COMPARE_ALPHA and ci is not None and (ci[0] > 0 or ci[1] < 0)
+        entry.update(
+            median_a=median_a, median_b=median_b,
+            change=(median_b / median_a - 1) * 100 if median_a else None,
+            ci=ci, p=p,
+            verdict=("B faster" if median_b > median_a else "B slower")
+                    if significant else "no significant difference",
+        )
+        out.append(entry)
+    return out
+
+
+def format_result_comparison(label_a, label_b, entries):
+    lines = [f"A: {label_a}", f"B: {label_b}"]
+    if not entries:
+        lines.append("No results to compare.")
+    for e in entries:
+        test = e["type"] if e["workload"] in (None, DEFAULT_WORKLOAD) else f"{e['type']} · {e['workload']}"
+        if e["options"]:
+            test += f" [{e['options']}]"
+        if e["verdict"] == "too few samples" and not (e["n_a"] and e["n_b"]):
+            lines.append(f"{test}: only in {'A' if e['n_a'] else 'B'}")
+            continue
+        if e["verdict"] == "too few samples":
+            lines.append(f"{test}: too few samples (A {e['n_a']}, B {e['n_b']}; "
+                         f"need {COMPARE_MIN_SAMPLES} each)")
+            continue
+        change = f"{e['change']:+.1f}%" if e["change"] is not None else "n/a"
+        ci     = f"95% CI {e['ci'][0]:+.1f}% to {e['ci'][1]:+.1f}%" if e["ci"] else "no CI"
+        lines.append(f"{test}: median {e['median_a']:g} → {e['median_b']:g} ({change}, {ci}, "
+                     f"p={e['p']:.3f}, n={e['n_a']}/{e['n_b']}) — {e['verdict']}")
+    return "\n".join(lines)
+
+
+def run_compare(args):
+    """--compare A B: print the comparison (and --json it). Returns an exit code."""
+    try:
+        label_a, rows_a = load_compare_source(args.compare[0])
+        label_b, rows_b = load_compare_source(args.compare[1])
+    except ValueError as exc:
+        _print_err(f"{APP_NAME}: {exc}")
+        return 2
+    entries = compare_result_sets(rows_a, rows_b)
+    print(format_result_comparison(label_a, label_b, entries), flush=True)
+    if args.json:
+        payload = json.dumps({"a": label_a, "b": label_b, "tests": entries}, indent=2)
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(payload)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Fleet aggregation (--aggregate PATH …)
+# Reads history from many machines (old JSON history files, --json exports,
+# history databases, or directories of them), one row at a time. It builds
+# reference score distributions per CPU model and per platform. Each machine
+# contributes the median of its own runs, so a host that ran a hundred times
+# doesn't outweigh one that ran once.
+# ---------------------------------------------------------------------------
+
+AGGREGATE_TYPES      = ("single", "multi")
+AGGREGATE_EXTENSIONS = (".json", ".sqlite3", ".db")
+
+# Marketing noise removed by normalize_cpu_name, in order.
+_CPU_NAME_NOISE = (
+    (r"\((?:R|TM|tm|r)\)", ""),
+    (r"\s+@\s*[\d.]+\s*[GM]Hz", ""),
+    (r"\b\d+-Core Processor\b", ""),
+    (r"\s+(?:with|w/)\s+Radeon(?:\s+\w+)*\s+Graphics\b", ""),
+    (r"\b(?:CPU|Processor)\b", ""),
+    (r"\s+", " "),
+)
+
+
+def normalize_cpu_name(name):
+    """One spelling per CPU model, e.g. "Intel(R) Core(TM) i7-9700K CPU @
+    3.60GHz" -> "Intel Core i7-9700K"."""
+    name = str(name or "").strip()
+    if not name or name.lower().startswith("unknown"):
+        return "Unknown"
+    for pattern, replacement in _CPU_NAME_NOISE:
+        name = re.sub(pattern, replacement, name)
+    return name.strip() or "Unknown"
+
+
+def platform_family(system):
+    """"Linux 6.8.0-45-generic" -> "Linux"; the OS without its release."""
+    family = str(system or "").split(" ", 1)[0]
+    return {"Darwin": "macOS"}.get(family, family) or "Unknown"
+
+
+def iter_json_rows(path, chunk_size=1 << 16):
+    """Yield the objects of a file holding one JSON array, reading it in
+    chunks so a large history never has to fit in memory at once.
+
+    Raises ValueError for anything but an array of objects separated by
+    single commas, so a malformed file is reported rather than read as empty.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, eof = "", False
+
+        def next_char():
+            """Skip whitespace, reading on; the next character, or "" at EOF."""
+            nonlocal buf, eof
+            buf = buf.lstrip()
+            while not buf and not eof:
+                more = f.read(chunk_size)
+                eof  = not more
+                buf  = more.lstrip()
+            return buf[:1]
+
+        first = next_char()
+        if not first:
+            raise ValueError("empty file")
+        if first != "[":
+            raise ValueError("not a JSON array")
+        buf = buf[1:]
+        if next_char() == "]":
+            return
+        while True:
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf)
+                    break
+                except ValueError:
+                    if eof:
+                        raise ValueError("malformed or truncated JSON array") from None
+                    more = f.read(chunk_size)
+                    eof  = not more
+                    buf += more
+            if not isinstance(item, dict):
+                raise ValueError(f"history rows must be JSON objects, "
+                                 f"found {type(item).__name__}")
+            yield item
+            buf = buf[end:]
+            separator = next_char()
+            if separator == "]":
+                return
+            if not separator:
+                raise ValueError("truncated JSON array")
+            if separator != ",":
+                raise ValueError(f"expected ',' or ']' after a row, found {separator!r}")
+            buf = buf[1:]
+            if not next_char():
+                raise ValueError("truncated JSON array")
+
+
+def iter_history_file(path):
+    """Yield (machine, cpu_name, system, type, workload, options, score) per
+    saved result; options is the options_label() of the run."""
+    with open(path, "rb") as f:
+        is_sqlite = f.read(16) == b"SQLite format 3\x00"
+    if is_sqlite:
+        conn = _connect_history_readonly(path)
+        try:
+            for info, type_, workload, score, system, details in conn.execute(
+                    "SELECT m.info, r.type, r.workload, r.score, "
+                    "json_extract(r.data, '$.system'), json_extract(r.data, '$.details') "
+                    "FROM results r JOIN machines m ON m.id = r.machine_id"):
+                info    = json.loads(info)
+                options = baseline_options({"type": type_,
+                                            "details": json.loads(details or "null")})
+                yield (tuple(info.get(k) for k in BASELINE_MACHINE_FIELDS),
+                       info.get("cpu_name"), system or info.get("system"), type_, workload,
+                       options_label(options), score)
+        finally:
+            conn.close()
+        return
+    for row in iter_json_rows(path):
+        yield (tuple(row.get(k) for k in BASELINE_MACHINE_FIELDS),
+               row.get("cpu_name"), row.get("system"), row.get("type"),
+               row.get("workload"), options_label(baseline_options(row)), row.get("score"))
+
+
+def _history_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _dirs, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(AGGREGATE_EXTENSIONS):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+def _percentiles(values):
+    """(p10, p50, p90) with linear interpolation between the sorted values."""
+    ordered = sorted(values)
+    def at(q):
+        pos  = q * (len(ordered) - 1)
+        low  = int(pos)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+    return at(0.10), at(0.50), at(0.90)
+
+
+def aggregate_history_files(paths, on_error=None):
+    """Columnar fleet summary of every history file under paths.
+
+    Returns {"files", "failed", "results", "columns": {name: [values]}} with
+    one entry per (scope, group, type, workload, options); scope is "cpu" or
+    "platform", and options is the options_label() of the runs, so a
+    threads-backend run is never pooled with a process run. A file that cannot be read to the end counts as failed (and
+    is reported through on_error); rows read before the error are kept.
+    """
+    # (scope, group, type, workload, options) -> machine -> scores of that machine
+    groups  = {}
+    files   = failed = results = 0
+    for path in _history_paths(paths):
+        try:
+            for (machine, cpu, system, type_, workload, options,
+                 score) in iter_history_file(path):
+                if type_ not in AGGREGATE_TYPES or not isinstance(score, (int, float)):
+                    continue
+                workload = workload or DEFAULT_WORKLOAD
+                for key in (("cpu", normalize_cpu_name(cpu), type_, workload, options),
+                            ("platform", platform_family(system), type_, workload, options)):
+                    groups.setdefault(key, {}).setdefault(machine, array("d")).append(score)
+                results += 1
+            files += 1
+        except Exception as exc:    # OSError, bad JSON, not a history database, …
+            failed += 1
+            if on_error is not None:
+                on_error(path, exc)
+
+    names   = ("scope", "group", "type", "workload", "options", "machines", "results",
+               "p10", "p50", "p90")
+    columns = {name: [] for name in names}
+    for key in sorted(groups, key=lambda k: (k[0], k[2], k[3], k[4], k[1])):
+        machines = groups[key]
+        medians  = [statistics.median(scores) for scores in machines.values()]
+        p10, p50, p90 = _percentiles(medians)
+        for name, value in zip(names, (*key, len(machines),
+                                       sum(len(v) for v in machines.values()),
+                                       round(p10, 1), round(p50, 1), round(p90, 1))):
+            columns[name].append(value)
+    return {"files": files, "failed": failed, "results": results, "columns": columns}
+
+
+def format_fleet_summary(summary):
+    cols  = summary["columns"]
+    lines = [f"{summary['results']:,} results from {summary['files']} file(s)"
+             + (f", {summary['failed']} unreadable" if summary["failed"] else "")]
+    width = max([len(g) for g in cols["group"]] + [10])
+    last  = None
+    for i in range(len(cols["group"])):
+        section = (cols["scope"][i], cols["type"][i], cols["workload"][i],
+                   cols["options"][i])
+        if section != last:
+            scope = "CPU model" if section[0] == "cpu" else "Platform"
+            lines.append(f"\n{scope} — {section[1]} ({section[2]})"
+                         + (f" · {section[3]}" if section[3] else ""))
+            lines.append(f"  {'':<{width}}  {'hosts':>6} {'p10':>9} {'p50':>9} {'p90':>9}")
+            last = section
+        lines.append(f"  {cols['group'][i]:<{width}}  {cols['machines'][i]:>6} "
+                     f"{cols['p10'][i]:>9g} {cols['p50'][i]:>9g} {cols['p90'][i]:>9g}")
+    return "\n".join(lines)
+
+
+def run_aggregate(args):
+    """--aggregate PATH …: print the fleet summary (and --json it)."""
+    summary = aggregate_history_files(
+        args.aggregate, on_error=lambda path, exc: _print_err(f"Could not read {path}: {exc}"))
+    print(format_fleet_summary(summary), flush=True)
+    if args.json:
+        payload = json.dumps(summary, separators=(",", ":"))
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(payload)
+    return 0 if summary["files"] else 2
+
+
+# ---------------------------------------------------------------------------
+# Headless runner
+# Drives BenchmarkWorker straight from the console — no Tk anywhere on this
+# path. Progress goes to stderr so stdout stays clean for `--json -`.
+# ---------------------------------------------------------------------------
+
+def _print_err(*args):
+    print(*args, file=sys.stderr, flush=True)
+
+
+def _drain_headless_events(worker, event_queue):
+    """Print worker events until "done"; return (result_or_None, error_or_None).
+
+    Progress comes from the worker's telemetry snapshot, sampled between events.
+    """
+    result        = None
+    error         = None
+    last_progress = -10
+
+    def print_progress():
+        nonlocal last_progress
+        progress = worker.telemetry.snapshot()[1]["progress"]
+        if progress is None:
+            return
+        # Only print every 10% so long runs don't flood CI logs.
+        percent = max(0, min(100, int(progress)))
+        if percent >= last_progress + 10 or (percent == 100 and last_progress < 100):
+            _print_err(f"  {percent:3d}%")
+            last_progress = percent
+
+    while True:
+        try:
+            event = event_queue.get(timeout=0.25)
+        except queue.Empty:
+            print_progress()
+            continue
+        except KeyboardInterrupt:
+            _print_err("Interrupted — cancelling benchmark…")
+            worker.cancel()
+            continue
+
+        print_progress()
+        event_type = event[0]
+        if event_type == "status":
+            _print_err(event[1])
+        elif event_type in ("single_result", "multi_result", "memory_result",
+                            "sweep_result", "percore_result", "numpy_result"):
+            result = event[1]
+        elif event_type == "error":
+            error = event[1]
+            _print_err(f"Error: {error}")
+        elif event_type == "done":
+            return result, error
+
+
+def run_headless(args):
+    """Run the requested benchmarks without a GUI. Returns a process exit code."""
+    missing = _check_missing()
+    if missing:
+        names = " ".join(pip_name for _, pip_name, _ in missing)
+        _print_err(f"Missing required packages: {names}\n"
+                   f"Install them with:  pip install {names}")
+        return 2
+
+    global PSUTIL
+    PSUTIL = _get_psutil()
+
+    fingerprint = hardware_fingerprint()
+    system_info, refresh = cached_system_profile(fingerprint)
+    if refresh:
+        # Detected in the foreground: a background refresh would compete
+        # with the benchmark for the CPU.
+        _print_err("Detecting system…")
+        system_info = detect_system_profile()
+        save_system_profile(fingerprint, system_info)
+    _print_err(system_info["label"])
+    if args.startup_profile:
+        startup_mark("system info" if refresh else "system info (cached)")
+        startup_mark("ready")
+        print(format_startup_profile(_STARTUP_MARKS, _process_start_time()), flush=True)
+        return 0
+
+    modes       = ["single", "multi"] if args.mode == "all" else [args.mode]
+    event_queue = queue.Queue()
+    worker      = BenchmarkWorker(event_queue)
+    rows        = []
+    exit_code   = 0
+
+    for mode in modes:
+        worker.start(mode, args.items, args.duration, args.batch,
+                     workload=args.workload, dataset=args.dataset,
+                     warmup=args.warmup, trials=args.trials,
+                     cv_threshold=args.cv_threshold, backend=args.backend,
+                     pin=args.pin)
+        result, error = _drain_headless_events(worker, event_queue)
+        worker.join()
+        if error is not None or result is None:
+            exit_code = 1
+            break
+        if result["cancelled"]:
+            _print_err(f"{mode.capitalize()}-core benchmark cancelled")
+            exit_code = 130
+            break
+        if result.get("skipped"):
+            # An optional tier without its package: reported, not saved.
+            print(format_numpy_result(result), flush=True)
+            continue
+        row = build_history_row(system_info, mode, result)
+        rows.append(row)
+        if mode == "memory":
+            print(format_memory_result(result), flush=True)
+        elif mode == "sweep":
+            print(format_sweep_result(result), flush=True)
+        elif mode == "percore":
+            print(format_percore_result(result), flush=True)
+        elif mode == "numpy":
+            print(format_numpy_result(result), flush=True)
+        else:
+            print(f"{mode} ({args.workload}): score {result['score']}", flush=True)
+        if result.get("pass_profile"):
+            print(format_pass_profile(result), flush=True)
+        if result.get("trials"):
+            print(format_trials(result), flush=True)
+            if result["trials"]["noisy"]:
+                _print_err("Warning: trial-to-trial variation is above the CV threshold")
+        if mode == "multi":
+            print(format_worker_balance(result), flush=True)
+            print(format_dataset(result), flush=True)
+            print(format_worker_pool(result), flush=True)
+            if result.get("timeline"):
+                print(format_timeline(result), flush=True)
+                if result["timeline"]["throttling"]:
+                    _print_err("Warning: throughput dropped under sustained load")
+            if result.get("comparison"):
+                print(format_backend_comparison(result), flush=True)
+        try:
+            if args.no_history:
+                verdict = check_baseline(row, threshold=args.regression_threshold)
+            else:
+                verdict = append_history_row(row, threshold=args.regression_threshold)
+        except Exception as exc:
+            _print_err(f"Could not {'read' if args.no_history else 'save'} history: {exc}")
+        else:
+            print(format_baseline(verdict), flush=True)
+            if verdict["status"] == "regression" and exit_code == 0:
+                exit_code = REGRESSION_EXIT_CODE
+
+    if worker.pool is not None:
+        _print_err(f"Worker pool shut down in {worker.shutdown():.2f}s")
+
+    if args.json:
+        payload = json.dumps(rows, indent=2)
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(payload)
+    return exit_code
+
+
+def _whole_number(value):
+    try:
+        return int(value.replace("_", "").replace(",", ""))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a whole number") from exc
+
+
+def _positive_int(value):
+    parsed = _whole_number(value)
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("must be greater than 0")
+    return parsed
+
+
+def _non_negative_int(value):
+    parsed = _whole_number(value)
+    if parsed < 0:
+        raise argparse.ArgumentTypeError("must be 0 or greater")
+    return parsed
+
+
+def _positive_float(value):
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a number") from exc
+    if not parsed > 0:
+        raise argparse.ArgumentTypeError("must be greater than 0")
+    return parsed
+
+
+def _build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog=APP_NAME,
+        description="Single-core and multi-core CPU benchmark. "
+                    "Starts the GUI unless --headless is given.",
+        allow_abbrev=False,     # a misspelt option is an error, not a prefix match
+    )
+    parser.add_argument("--headless", action="store_true",
+                        help="run from the console without creating any window")
+    parser.add_argument("--mode", choices=("single", "multi", "memory", "sweep", "percore",
+                                           "numpy", "all"),
+                        default="all",
+                        help="benchmark(s) to run in headless mode; "
+                             "all = single + multi (default: all); "
+                             "numpy is skipped when NumPy is not installed")
+    parser.add_argument("--items", type=_positive_int,
+                        default=DEFAULT_SINGLE_CORE_NUMBERS,
+                        help="items to sort in the single-core test")
+    parser.add_argument("--duration", type=_positive_int,
+                        default=DEFAULT_MULTICORE_DURATION,
+                        help="multi-core test duration in seconds "
+                             "(per step in sweep mode, total in percore mode)")
+    parser.add_argument("--batch", type=_positive_int,
+                        default=DEFAULT_MULTICORE_BATCH_SIZE,
+                        help="batch size per core in the multi-core test")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default=DEFAULT_WORKLOAD,
+                        help="benchmark kernel to run (default: sort)")
+    parser.add_argument("--dataset", choices=DATASETS, default="private",
+                        help="multi-core input: generated per batch by each worker "
+                             "(private) or once by the parent in shared memory (shared)")
+    parser.add_argument("--backend", choices=tuple(MULTI_BACKENDS), default="processes",
+                        help="multi-core backend; anything other than processes is "
+                             "compared against a process baseline (default: processes)")
+    parser.add_argument("--pin", action="store_true",
+                        help="pin multi-core worker i to the i-th allowed CPU (Linux)")
+    parser.add_argument("--trials", type=_positive_int, default=1,
+                        help="measured runs of the single/multi test; with more than "
+                             "one the median score is reported (default: 1)")
+    parser.add_argument("--warmup", type=_non_negative_int, default=0,
+                        help="discarded warm-up runs before the trials (default: 0)")
+    parser.add_argument("--cv-threshold", type=_positive_float, default=5.0,
+                        metavar="PERCENT",
+                        help="warn when the trials' coefficient of variation "
+                             "exceeds this (default: 5)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the result rows (or the --compare report) as JSON "
+                             "('-' for stdout)")
+    parser.add_argument("--no-history", action="store_true",
+                        help=f"do not append results to {HISTORY_DB}")
+    parser.add_argument("--regression-threshold", type=_positive_float,
+                        default=REGRESSION_THRESHOLD, metavar="PERCENT",
+                        help="flag a score more than this far below the machine's "
+                             "rolling median (the band widens with the history's own "
+                             f"spread) and exit with status {REGRESSION_EXIT_CODE} "
+                             f"(default: {REGRESSION_THRESHOLD:g})")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"),
+                        help="compare two sets of saved results and exit; each is a "
+                             "--json export, a history file, or "
+                             "history:key=value,… (keys: machine, type, workload, "
+                             "python, since, before)")
+    parser.add_argument("--aggregate", nargs="+", metavar="PATH",
+                        help="summarize history files (or folders of them) from many "
+                             "machines into p10/p50/p90 scores per CPU model and "
+                             "platform, then exit; --json writes the columnar summary")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="start up, print time to first window / ready and an "
+                             "import-time breakdown, then exit without benchmarking")
+    return parser
+
+
+# ---------------------------------------------------------------------------
+# Startup profiling (--startup-profile)
+# Milestones are measured from the moment the profiled process is launched,
+# so they include interpreter start-up. The import breakdown comes from
+# re-running the same command line under `python -X importtime`.
+# ---------------------------------------------------------------------------
+
+_STARTUP_MARKS = []     # [(label, time.time())] in the order reached
+_STARTUP_T0_ENV = "QUICKBENCH_STARTUP_T0"
+
+
+def startup_mark(label):
+    _STARTUP_MARKS.append((label, time.time()))
+
+
+def _process_start_time():
+    # Set by run_startup_profile just before it launches us. psutil's
+    # create_time() is the fallback; on Linux it is only accurate to ~1 s.
+    try:
+        return float(os.environ[_STARTUP_T0_ENV])
+    except (KeyError, ValueError):
+        pass
+    try:
+        return PSUTIL.Process().create_time()
+    except Exception:
+        return _STARTUP_MARKS[0][1] if _STARTUP_MARKS else time.time()
+
+
+def format_startup_profile(marks, start):
+    lines = ["Startup profile (ms since process start):"]
+    for label, at in marks:
+        lines.append(f"  {label:<24}{(at - start) * 1000:9.1f}")
+    return "\n".join(lines)
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us)] for the top-level imports in
+    `-X importtime` output, slowest first."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue                                # the column header
+        name = fields[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):  # not nested
+            rows.append((name.strip(), self_us, cumulative_us))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def format_importtime(rows, limit=15):
+    total = sum(row[2] for row in rows)
+    lines = [f"Imports ({total / 1000:.1f} ms at top level, slowest first):",
+             f"  {'module':<28}{'cumulative':>12}{'self':>10}"]
+    for name, self_us, cumulative_us in rows[:limit]:
+        lines.append(f"  {name:<28}{cumulative_us / 1000:>10.1f}ms{self_us / 1000:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def run_startup_profile(argv):
+    """Re-run this command line under -X importtime; pass its output through
+    and append the import breakdown. Returns its exit code."""
+    command = [sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv]
+    env     = dict(os.environ, **{_STARTUP_T0_ENV: repr(time.time())})
+    proc    = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             text=True, env=env)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:"):
+            imports.append(line)
+        else:
+            _print_err(line)
+    sys.stdout.write(proc.stdout)
+    rows = parse_importtime("\n".join(imports))
+    if rows:
+        print(format_importtime(rows), flush=True)
+    return proc.returncode
+
+
+def _watch_gui_startup(root, app):
+    """Mark the first drawn window and readiness, print the profile, quit."""
+    def on_map(_event):
+        root.unbind("<Map>")
+        root.after_idle(first_window)
+
+    def first_window():
+        startup_mark("first window")
+        wait_ready()
+
+    def wait_ready():
+        if not app.system_ready:
+            root.after(5, wait_ready)
+            return
+        startup_mark("ready")
+        print(format_startup_profile(_STARTUP_MARKS, _process_start_time()), flush=True)
+        root.destroy()
+
+    root.bind("<Map>", on_map)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -2752,6 +6667,30 @@ class QuickBenchApp:
 def main():
     multiprocessing.freeze_support()
 
+    if sys.platform == "darwin":
+        try:
+            multiprocessing.set_start_method("spawn", force=True)
+        except RuntimeError:
+            pass
+
+    startup_mark("modules imported")
+
+    # Finder may append a -psn_* argument to GUI launches; anything else that
+    # is not a known option is a typo and exits with usage (code 2).
+    argv = [arg for arg in sys.argv[1:] if not arg.startswith("-psn_")]
+    args = _build_arg_parser().parse_args(argv)
+    if args.startup_profile and "importtime" not in sys._xoptions and \
+            not getattr(sys, "frozen", False):
+        sys.exit(run_startup_profile(argv))
+    if args.compare:
+        sys.exit(run_compare(args))
+    if args.aggregate:
+        sys.exit(run_aggregate(args))
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    _import_tk()
+
     # Fix Windows high-DPI blurriness — must be called before Tk() is created.
     if os.name == "nt":
         try:
@@ -2760,12 +6699,6 @@ def main():
         except Exception:
             pass  # Windows 7 / older shcore — safe to ignore
 
-    if sys.platform == "darwin":
-        try:
-            multiprocessing.set_start_method("spawn", force=True)
-        except RuntimeError:
-            pass
-
     # Check and optionally install missing dependencies before the main app
     # window opens. Exits cleanly if the user declines or install fails.
     if not bootstrap_dependencies():
@@ -2778,7 +6711,11 @@ def main():
 
     root = tk.Tk()
     app  = QuickBenchApp(root)
+    startup_mark("app constructed")
+    if args.startup_profile:
+        _watch_gui_startup(root, app)
     root.mainloop()
+    app.worker.shutdown()
 
 
 if __name__ == "__main__":
@@ -80,8 +80,8 @@ app = BUNDLE(
         "CFBundleName":             "QuickBench",
         "CFBundleDisplayName":      "QuickBench",
         "CFBundleIdentifier":       "com.quickbench.app",
-        "CFBundleVersion":          "3.0.0",
-        "CFBundleShortVersionString":"3.0",
+        "CFBundleVersion":          "3.1.0",
+        "CFBundleShortVersionString":"3.1",
 
         # Tell macOS this is a GUI app and not to show it in the Dock
         # as a background agent
@@ -16,7 +16,7 @@ header "QuickBench — macOS App Builder"
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 cd "$SCRIPT_DIR"
 
-for f in QuickBench.py QuickBench.spec QB.png QB.ico; do
+for f in QuickBench.py quickbench_kernels.py QuickBench.spec QB.png QB.ico; do
     [[ -f "$f" ]] || error "Missing: $f"
 done
 
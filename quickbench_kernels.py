@@ -0,0 +1,1072 @@
+"""QuickBench kernels and worker entry points.
+
+Everything a benchmark worker runs lives here: the scoring helpers, the
+kernels and their Workload registry, the memory kernels, the shared slot
+layout and the entry points of the pool, subinterpreter and memory workers.
+QuickBench.py imports it, and worker processes unpickle their targets from
+it. Stdlib only; optional packages such as NumPy are imported lazily by the
+kernels that need them.
+"""
+from __future__ import annotations
+
+import math
+import os
+import random
+import threading
+import time
+from array import array
+from multiprocessing import shared_memory
+
+
+# ---------------------------------------------------------------------------
+# Optional packages
+# ---------------------------------------------------------------------------
+
+# Packages that unlock extra benchmarks. They are never installed or imported
+# at startup; a tier whose package is missing is reported as skipped.
+_OPTIONAL_PACKAGES = [
+    ("numpy", "numpy", "NumPy kernel tier (native sort, matmul, reductions)"),
+]
+
+
+def optional_package_missing(import_name):
+    """Return a one-line reason if an optional package is unavailable, else None.
+
+    Uses find_spec, so the package is located but not imported.
+    """
+    from importlib.util import find_spec
+    if find_spec(import_name) is not None:
+        return None
+    for name, pip_name, reason in _OPTIONAL_PACKAGES:
+        if name == import_name:
+            return (f"{pip_name} is not installed — needed for the {reason}; "
+                    f"install it with:  pip install {pip_name}")
+    return f"{import_name} is not installed"
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def score_single_core(items: int, seconds: float) -> int:
+    if seconds <= 0 or items <= 1:
+        return 0
+    work_units = items * math.log2(items)
+    return int(work_units / seconds / 100_000)
+
+
+def score_multi_core(batches: int, effective_batch_size: int, seconds: float) -> int:
+    if seconds <= 0 or batches <= 0 or effective_batch_size <= 0:
+        return 0
+    items_per_second = (batches * effective_batch_size) / seconds
+    return int(items_per_second / 1_000)
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# Module-level (not BenchmarkWorker methods) so worker processes can run them
+# by name without pickling any bound state.
+# ---------------------------------------------------------------------------
+
+def merge_sort_iterative(arr, should_stop=None, on_pass=None, pass_times=None):
+    """Bottom-up merge sort in place. Returns the number of completed passes.
+
+    should_stop() is polled between merges; on_pass(completed, total) is
+    called after every pass. If pass_times is a list, (width, nanoseconds)
+    is appended for every pass that ran to completion, width being the
+    length of the runs merged by that pass.
+    """
+    n    = len(arr)
+    temp = arr.copy()
+    size = 1
+    total_passes     = max(1, math.ceil(math.log2(max(1, n))))
+    completed_passes = 0
+    while size < n and not (should_stop and should_stop()):
+        started = time.perf_counter_ns()
+        for left in range(0, n, 2 * size):
+            if should_stop and should_stop():
+                break
+            mid   = min(left + size, n)
+            right = min(left + 2 * size, n)
+            _merge(arr, temp, left, mid, right)
+        arr[:] = temp[:]
+        if pass_times is not None and not (should_stop and should_stop()):
+            pass_times.append((size, time.perf_counter_ns() - started))
+        size *= 2
+        completed_passes += 1
+        if on_pass is not None:
+            on_pass(completed_passes, total_passes)
+    return completed_passes
+
+
+def _merge(arr, temp, left, mid, right):
+    i, j, k = left, mid, left
+    while i < mid and j < right:
+        if arr[i] <= arr[j]:
+            temp[k] = arr[i]
+            i += 1
+        else:
+            temp[k] = arr[j]
+            j += 1
+        k += 1
+    while i < mid:
+        temp[k] = arr[i]
+        i += 1
+        k += 1
+    while j < right:
+        temp[k] = arr[j]
+        j += 1
+        k += 1
+
+
+def merge_sort_buffer(arr, should_stop=None, on_pass=None, pass_times=None):
+    """Bottom-up merge sort of an array('q') in place.
+
+    Compact-path counterpart of merge_sort_iterative: the two buffers swap
+    roles every pass instead of copying the whole array back, and run tails
+    are moved with C-level slice assignment. Only the final pass copies back,
+    and only when the sorted data ended up in the scratch buffer.
+    """
+    n    = len(arr)
+    src  = arr
+    dst  = array(arr.typecode, arr)
+    size = 1
+    total_passes     = max(1, math.ceil(math.log2(max(1, n))))
+    completed_passes = 0
+    while size < n and not (should_stop and should_stop()):
+        started = time.perf_counter_ns()
+        for left in range(0, n, 2 * size):
+            if should_stop and should_stop():
+                break
+            mid   = min(left + size, n)
+            right = min(left + 2 * size, n)
+            _merge_runs(src, dst, left, mid, right)
+        if pass_times is not None and not (should_stop and should_stop()):
+            pass_times.append((size, time.perf_counter_ns() - started))
+        src, dst = dst, src
+        size *= 2
+        completed_passes += 1
+        if on_pass is not None:
+            on_pass(completed_passes, total_passes)
+    if src is not arr:
+        memoryview(arr)[:] = memoryview(src)
+    return completed_passes
+
+
+def _merge_runs(src, dst, left, mid, right):
+    i, j, k = left, mid, left
+    if i < mid and j < right:
+        a, b = src[i], src[j]
+        while True:
+            if a <= b:
+                dst[k] = a
+                i += 1
+                k += 1
+                if i == mid:
+                    break
+                a = src[i]
+            else:
+                dst[k] = b
+                j += 1
+                k += 1
+                if j == right:
+                    break
+                b = src[j]
+    # At most one of the runs has a tail left; move it in one slice copy.
+    if i < mid:
+        dst[k:right] = src[i:mid]
+    elif j < right:
+        dst[k:right] = src[j:right]
+
+
+# ---------------------------------------------------------------------------
+# Sort-algorithm catalog
+# In-place kernels with the common run(data, should_stop, on_step) shape, so
+# each one runs unchanged on one core and inside every multi-core batch:
+#   top-down merge  recursive halving; small subarrays stay in cache
+#   quicksort       Hoare partition, median-of-three pivot; branchy
+#   heapsort        sift-downs jump across the whole array; cache-hostile
+#   LSD radix       counting + scatter passes over array('q'); streaming
+# Bottom-up merge (merge_sort_iterative) and Timsort (list.sort) complete
+# the set. Progress and cancellation are checked SORT_STEPS times per run.
+# ---------------------------------------------------------------------------
+
+SORT_STEPS     = 20
+TOPDOWN_CHECKS = 4      # top-down levels that poll should_stop / report progress
+RADIX_BITS     = 8
+RADIX_PASSES   = 64 // RADIX_BITS
+
+
+def sort_work_units(n):
+    """Comparison-sort work: n·log2(n)."""
+    return n * math.log2(n) if n > 1 else 0
+
+
+def radix_work_units(n):
+    """LSD radix work: n items × RADIX_PASSES digit passes."""
+    return n * RADIX_PASSES
+
+
+class _SortProgress:
+    """Turns a count of finished items into SORT_STEPS on_step calls and
+    polls should_stop at each of them. Kernels compare against .next
+    themselves so the per-item path stays a single integer compare."""
+
+    def __init__(self, n, should_stop, on_step):
+        self.stride      = max(1, -(-n // SORT_STEPS))
+        self.next        = self.stride
+        self.steps       = 0
+        self.should_stop = should_stop
+        self.on_step     = on_step
+
+    def reach(self, done):
+        """Report progress up to `done` items; False once a stop is requested."""
+        while done >= self.next and self.steps < SORT_STEPS:
+            self.steps += 1
+            self.next  += self.stride
+        if self.on_step is not None:
+            self.on_step(self.steps, SORT_STEPS)
+        return not (self.should_stop and self.should_stop())
+
+    def finish(self):
+        if self.steps < SORT_STEPS:
+            self.steps = SORT_STEPS
+            if self.on_step is not None:
+                self.on_step(self.steps, SORT_STEPS)
+        return self.steps
+
+
+def merge_sort_topdown(arr, should_stop=None, on_step=None):
+    """Recursive merge sort in place. Returns the number of completed steps.
+
+    The top TOPDOWN_CHECKS levels poll should_stop and report progress once
+    per finished subtree; the subtrees below them recurse without checks.
+    """
+    temp  = arr.copy()
+    total = (1 << (TOPDOWN_CHECKS + 1)) - 1     # subtrees in the checked levels
+    done  = 0
+
+    def sort(lo, hi, depth):
+        nonlocal done
+        if should_stop and should_stop():
+            return False
+        if depth == TOPDOWN_CHECKS or hi - lo < 2:
+            _topdown(arr, temp, lo, hi)
+        else:
+            mid = (lo + hi) // 2
+            if not (sort(lo, mid, depth + 1) and sort(mid, hi, depth + 1)):
+                return False
+            _merge(arr, temp, lo, mid, hi)
+            arr[lo:hi] = temp[lo:hi]
+        done += 1
+        if on_step is not None:
+            on_step(done, total)
+        return True
+
+    if sort(0, len(arr), 0) and done < total:
+        done = total            # small inputs finish with fewer subtrees
+        if on_step is not None:
+            on_step(done, total)
+    return done
+
+
+def _topdown(arr, temp, lo, hi):
+    if hi - lo < 2:
+        return
+    mid = (lo + hi) // 2
+    _topdown(arr, temp, lo, mid)
+    _topdown(arr, temp, mid, hi)
+    _merge(arr, temp, lo, mid, hi)
+    arr[lo:hi] = temp[lo:hi]
+
+
+def quicksort_inplace(arr, should_stop=None, on_step=None):
+    """In-place quicksort with an explicit stack. Returns completed steps.
+
+    The smaller side of every partition is sorted first, so the stack stays
+    O(log n) deep. Progress counts items that ended up in one-item ranges.
+    """
+    n        = len(arr)
+    progress = _SortProgress(n, should_stop, on_step)
+    stack    = [(0, n - 1)] if n > 1 else []
+    done     = 0
+    while stack:
+        lo, hi = stack.pop()
+        p = _hoare_partition(arr, lo, hi)
+        sides = ((lo, p), (p + 1, hi))
+        if p - lo < hi - p - 1:
+            sides = sides[::-1]     # push the larger side first
+        for a, b in sides:
+            if a < b:
+                stack.append((a, b))
+            else:
+                done += 1
+        if done >= progress.next and not progress.reach(done):
+            return progress.steps
+    return progress.finish()
+
+
+def _hoare_partition(a, lo, hi):
+    # Order a[lo], a[mid], a[hi] and partition around the middle value: the
+    # pivot is then never the range maximum, so both sides are non-empty.
+    mid = (lo + hi) // 2
+    if a[mid] < a[lo]:
+        a[lo], a[mid] = a[mid], a[lo]
+    if a[hi] < a[lo]:
+        a[lo], a[hi] = a[hi], a[lo]
+    if a[hi] < a[mid]:
+        a[mid], a[hi] = a[hi], a[mid]
+    pivot = a[mid]
+    i, j  = lo - 1, hi + 1
+    while True:
+        i += 1
+        while a[i] < pivot:
+            i += 1
+        j -= 1
+        while a[j] > pivot:
+            j -= 1
+        if i >= j:
+            return j
+        a[i], a[j] = a[j], a[i]
+
+
+def heapsort_inplace(arr, should_stop=None, on_step=None):
+    """In-place heapsort (max-heap). Returns completed steps."""
+    n        = len(arr)
+    progress = _SortProgress(n, should_stop, on_step)
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, root, n)
+    if should_stop and should_stop():
+        return 0
+    for end in range(n - 1, 0, -1):
+        arr[0], arr[end] = arr[end], arr[0]
+        _sift_down(arr, 0, end)
+        if n - end >= progress.next and not progress.reach(n - end):
+            return progress.steps
+    return progress.finish()
+
+
+def _sift_down(a, root, end):
+    item  = a[root]
+    child = 2 * root + 1
+    while child < end:
+        right = child + 1
+        if right < end and a[right] > a[child]:
+            child = right
+        if a[child] <= item:
+            break
+        a[root] = a[child]
+        root    = child
+        child   = 2 * root + 1
+    a[root] = item
+
+
+def radix_sort_lsd(arr, should_stop=None, on_step=None):
+    """LSD radix sort of an array('q') in place. Returns completed passes.
+
+    Each of the RADIX_PASSES passes counts one RADIX_BITS-wide digit, then
+    scatters every item into the other buffer; the buffers swap roles each
+    pass. The top digit's buckets are visited negative-half first, which
+    orders the signed keys.
+    """
+    n       = len(arr)
+    buckets = 1 << RADIX_BITS
+    mask    = buckets - 1
+    src     = arr
+    dst     = array(arr.typecode, bytes(arr.itemsize * n))
+    completed = 0
+    for digit in range(RADIX_PASSES):
+        if should_stop and should_stop():
+            break
+        shift  = digit * RADIX_BITS
+        counts = [0] * buckets
+        for x in src:
+            counts[(x >> shift) & mask] += 1
+        order = (range(buckets) if digit < RADIX_PASSES - 1
+                 else [*range(buckets // 2, buckets), *range(buckets // 2)])
+        starts, total = [0] * buckets, 0
+        for d in order:
+            starts[d] = total
+            total    += counts[d]
+        for x in src:
+            d = (x >> shift) & mask
+            dst[starts[d]] = x
+            starts[d] += 1
+        src, dst = dst, src
+        completed += 1
+        if on_step is not None:
+            on_step(completed, RADIX_PASSES)
+    if src is not arr:
+        memoryview(arr)[:] = memoryview(src)
+    return completed
+
+
+def timsort_builtin(data, should_stop=None, on_step=None):
+    """list.sort(): one C call, so no progress or cancellation inside it."""
+    data.sort()
+    if on_step is not None:
+        on_step(1, 1)
+    return 1
+
+
+def pass_profile(pass_times, n):
+    """Per-pass merge throughput from merge-sort pass_times.
+
+    Every pass merges all n items, so items/s per pass is n / pass time. As
+    the run width grows the merged runs stop fitting in L1, then L2, then
+    L3, and throughput steps down at each of those transitions.
+    """
+    return [{"width":       width,
+             "ns":          ns,
+             "items_per_s": n / (ns / 1e9) if ns > 0 else 0.0}
+            for width, ns in pass_times]
+
+
+def _run_chunked(items, chunk_fn, should_stop=None, on_step=None, steps=20):
+    """Feed `items` to chunk_fn in `steps` slices, honouring cancellation."""
+    n     = len(items)
+    steps = max(1, min(steps, n))
+    chunk = -(-n // steps)
+    done  = 0
+    for start in range(0, n, chunk):
+        if should_stop and should_stop():
+            break
+        chunk_fn(items[start:start + chunk])
+        done += 1
+        if on_step is not None:
+            on_step(done, steps)
+    return done
+
+
+def _sort_setup(size, rng):
+    return [rng.randint(0, size) for _ in range(size)]
+
+
+def _compact_sort_setup(size, rng):
+    # Filled in bulk: 8 bytes per item instead of a boxed int (28 bytes) plus
+    # a list slot (8 bytes), and no per-item Python loop. Chunking keeps the
+    # temporary bytes object small so peak RSS stays close to the array size.
+    data  = array("q")
+    chunk = 1 << 20
+    for start in range(0, size, chunk):
+        data.frombytes(rng.randbytes(8 * min(chunk, size - start)))
+    return data
+
+
+def _sort_shared_setup(items, batch_size, rng):
+    # Same value range as _sort_setup, so shared and private runs sort
+    # statistically identical input.
+    return array("q", [rng.randint(0, batch_size) for _ in range(items)])
+
+
+def _compact_sort_shared_setup(items, batch_size, rng):
+    return _compact_sort_setup(items, rng)
+
+
+def attach_shared_memory(name):
+    """Open an existing SharedMemory block without tracking it.
+
+    The parent created the block and unlinks it; a tracked attach (3.13+)
+    would let a worker's resource tracker unlink it, or warn about a leak,
+    when the worker exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:       # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
+
+
+def _list_from_shared(pool, offset, size):
+    return pool[offset:offset + size].tolist()
+
+
+def _array_from_shared(pool, offset, size):
+    data = array("q")
+    data.frombytes(pool[offset:offset + size].cast("B"))
+    return data
+
+
+def _hash_setup(size, rng):
+    # String keys: str hashes are computed on first use, then cached, so the
+    # timed body pays for one hash per key plus the dict probes.
+    return [f"k{rng.getrandbits(24):06x}" for _ in range(size)]
+
+
+def _hash_run(keys, should_stop=None, on_step=None):
+    counts = {}
+
+    def chunk_fn(chunk):
+        get = counts.get
+        for key in chunk:
+            counts[key] = get(key, 0) + 1
+        hits = 0
+        for key in chunk:
+            if key in counts:
+                hits += 1
+        return hits
+
+    return _run_chunked(keys, chunk_fn, should_stop, on_step)
+
+
+def _float_setup(size, rng):
+    return [rng.random() for _ in range(size)]
+
+
+def _float_run(values, should_stop=None, on_step=None):
+    def chunk_fn(chunk):
+        # Horner evaluation of a degree-4 polynomial: 8 flops per value.
+        acc = 0.0
+        for x in chunk:
+            acc += (((0.3 * x + 1.7) * x - 2.1) * x + 0.9) * x - 0.4
+        return acc
+
+    return _run_chunked(values, chunk_fn, should_stop, on_step)
+
+
+def _alloc_setup(size, rng):
+    return range(size)
+
+
+def _alloc_run(indices, should_stop=None, on_step=None):
+    def chunk_fn(chunk):
+        # A tuple, a list and a dict per item, all discarded at chunk end.
+        nodes = [(i, [i, i + 1], {"v": i}) for i in chunk]
+        return len(nodes)
+
+    return _run_chunked(indices, chunk_fn, should_stop, on_step)
+
+
+# ---------------------------------------------------------------------------
+# Workload registry
+# The single-core and multi-core runners dispatch to these by name, so a new
+# kernel gets progress, cancellation, usage monitoring and history for free.
+# ---------------------------------------------------------------------------
+
+class Workload:
+    """A named benchmark kernel.
+
+    setup(size, rng)                 -> input data (not timed)
+    run(data, should_stop, on_step)  -> steps completed (timed, single-core)
+    batch_run(data)                  -> timed body of one multi-core batch
+    work_units(size)                 -> work done by one run over `size` items
+    score(size, seconds)             -> single-core score
+    batch_score(batches, size, secs) -> multi-core score
+
+    When score / batch_score are omitted both are derived from work_units as
+    work units per second ÷ 100,000, so a multi-core score is directly
+    comparable to cores × single-core score.
+
+    Kernels that modify their input (sorting) set mutates_input so the
+    multi-core runner regenerates data for every batch; the others reuse
+    one dataset per worker.
+
+    Int64 kernels can also provide shared_setup(items, batch_size, rng) ->
+    array('q') and from_shared(pool, offset, size) -> data, which enable the
+    "shared" multi-core dataset: the parent fills a shared-memory pool once
+    and each batch copies a slice of it instead of generating new input.
+
+    Multi-pass kernels set pass_timing when run() also accepts a pass_times
+    list (see merge_sort_iterative); the single-core result then carries a
+    per-pass throughput profile.
+
+    Kernels built on an optional package name it in `requires` (an entry of
+    _OPTIONAL_PACKAGES); they are left out of the worker warm-up and refuse
+    to run while the package is missing.
+    """
+
+    def __init__(self, name, label, description, setup, run, work_units,
+                 score=None, batch_run=None, batch_score=None,
+                 batch_limits=(10_000, 250_000), mutates_input=False,
+                 shared_setup=None, from_shared=None, pass_timing=False,
+                 requires=None):
+        self.name          = name
+        self.label         = label
+        self.description   = description
+        self.setup         = setup
+        self.run           = run
+        self.work_units    = work_units
+        self.batch_run     = batch_run or (lambda data: run(data))
+        self.batch_limits  = batch_limits
+        self.mutates_input = mutates_input
+        self.shared_setup  = shared_setup
+        self.from_shared   = from_shared
+        self.pass_timing   = pass_timing
+        self.requires      = requires
+        self._score        = score
+        self._batch_score  = batch_score
+
+    def score(self, size: int, seconds: float) -> int:
+        if self._score is not None:
+            return self._score(size, seconds)
+        if seconds <= 0 or size <= 0:
+            return 0
+        return int(self.work_units(size) / seconds / 100_000)
+
+    def batch_score(self, batches: int, size: int, seconds: float) -> int:
+        if self._batch_score is not None:
+            return self._batch_score(batches, size, seconds)
+        if seconds <= 0 or batches <= 0 or size <= 0:
+            return 0
+        return int(batches * self.work_units(size) / seconds / 100_000)
+
+    def missing(self):
+        """Reason this workload cannot run here, or None."""
+        return optional_package_missing(self.requires) if self.requires else None
+
+    @property
+    def supports_shared(self):
+        return self.shared_setup is not None and self.from_shared is not None
+
+    def effective_batch_size(self, batch_size: int) -> int:
+        low, high = self.batch_limits
+        return max(low, min(batch_size, high))
+
+
+WORKLOADS = {}
+DEFAULT_WORKLOAD = "sort"
+
+
+def register_workload(workload):
+    WORKLOADS[workload.name] = workload
+    return workload
+
+
+def get_workload(name):
+    try:
+        return WORKLOADS[name]
+    except KeyError:
+        raise ValueError(f"Unknown workload: {name}") from None
+
+
+register_workload(Workload(
+    "sort", "Integer sort",
+    "Merge sort on one core; built-in list.sort per batch on all cores.",
+    setup=_sort_setup,
+    run=merge_sort_iterative,
+    work_units=sort_work_units,
+    score=score_single_core,
+    batch_run=lambda data: data.sort(),
+    batch_score=score_multi_core,
+    mutates_input=True,
+    shared_setup=_sort_shared_setup,
+    from_shared=_list_from_shared,
+    pass_timing=True,
+))
+register_workload(Workload(
+    "sort_compact", "Integer sort (compact)",
+    "Merge sort over an array('q') buffer filled in bulk; ping-pong passes.",
+    setup=_compact_sort_setup,
+    run=merge_sort_buffer,
+    work_units=sort_work_units,
+    mutates_input=True,
+    shared_setup=_compact_sort_shared_setup,
+    from_shared=_array_from_shared,
+    pass_timing=True,
+))
+register_workload(Workload(
+    "hash", "Dict / hashing",
+    "Counts string keys in a dict, then probes every key again.",
+    setup=_hash_setup,
+    run=_hash_run,
+    work_units=lambda n: 3 * n,       # get + store + membership probe
+))
+register_workload(Workload(
+    "float", "Floating point",
+    "Evaluates a degree-4 polynomial over random floats (Horner's rule).",
+    setup=_float_setup,
+    run=_float_run,
+    work_units=lambda n: 8 * n,       # 4 multiplies + 4 adds
+))
+register_workload(Workload(
+    "alloc", "Allocation",
+    "Builds and discards a tuple, list and dict per item.",
+    setup=_alloc_setup,
+    run=_alloc_run,
+    work_units=lambda n: 3 * n,       # objects allocated
+))
+
+# Sort catalog: the same algorithm runs on one core and in every multi-core
+# batch, so a catalog entry's multi-core score stays comparable to cores ×
+# its single-core score. Comparison sorts count n·log2(n) work units and
+# radix sort n × passes, which keeps scores flat as --items grows.
+_catalog_sort = dict(setup=_sort_setup, work_units=sort_work_units,
+                     mutates_input=True, shared_setup=_sort_shared_setup,
+                     from_shared=_list_from_shared)
+
+register_workload(Workload(
+    "sort_bottomup", "Bottom-up merge sort",
+    "Iterative merge sort of doubling runs: long sequential passes.",
+    run=merge_sort_iterative, pass_timing=True, **_catalog_sort,
+))
+register_workload(Workload(
+    "sort_topdown", "Top-down merge sort",
+    "Recursive merge sort: halves down to single items, merges on the way up.",
+    run=merge_sort_topdown, **_catalog_sort,
+))
+register_workload(Workload(
+    "sort_quick", "Quicksort",
+    "In-place Hoare quicksort with median-of-three pivots: branch-heavy.",
+    run=quicksort_inplace, **_catalog_sort,
+))
+register_workload(Workload(
+    "sort_heap", "Heapsort",
+    "In-place heapsort: sift-downs jump across the whole array.",
+    run=heapsort_inplace, **_catalog_sort,
+))
+register_workload(Workload(
+    "sort_radix", "LSD radix sort",
+    "Eight 8-bit counting passes over an array('q'): no comparisons.",
+    setup=_compact_sort_setup,
+    run=radix_sort_lsd,
+    work_units=radix_work_units,
+    mutates_input=True,
+    shared_setup=_compact_sort_shared_setup,
+    from_shared=_array_from_shared,
+))
+register_workload(Workload(
+    "sort_tim", "Timsort (built-in)",
+    "CPython's C list.sort: the reference for the pure-Python sorts.",
+    run=timsort_builtin, **_catalog_sort,
+))
+
+
+# ---------------------------------------------------------------------------
+# Optional NumPy tier
+# The same runners timing native code: np.sort on int64 and float64 arrays,
+# a dense float64 matmul and a set of vectorised reductions. NumPy is only
+# imported by the first setup() that needs it, with the BLAS / OpenMP
+# thread variables set to 1 for the import, so "one core" means one core and
+# the multi-core runner gets one single-threaded BLAS per worker process.
+# ---------------------------------------------------------------------------
+
+NUMPY_THREAD_VARS    = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                        "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+NUMPY_MATMUL_MAX_N   = 1024      # matrix side cap; 2·N³ = 2.1 GFLOP per run
+NUMPY_REDUCE_PASSES  = 8         # sum / min / max / dot passes per run
+_numpy               = None
+
+
+def import_numpy():
+    """Import NumPy with its thread pools limited to one thread.
+
+    The BLAS and OpenMP runtimes read NUMPY_THREAD_VARS when NumPy loads
+    them, so the variables are set only around the import and then put back:
+    the user's settings and later subprocesses never see them.
+    """
+    global _numpy
+    if _numpy is None:
+        saved = {var: os.environ.get(var) for var in NUMPY_THREAD_VARS}
+        try:
+            os.environ.update(dict.fromkeys(NUMPY_THREAD_VARS, "1"))
+            import numpy
+        finally:
+            for var, value in saved.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+        _numpy = numpy
+    return _numpy
+
+
+def _numpy_rng(rng):
+    return import_numpy().random.default_rng(rng.getrandbits(64))
+
+
+def _numpy_sort_setup(dtype):
+    # (source, scratch): each run copies the source into the scratch array
+    # and sorts that, so the input can be reused batch after batch.
+    def setup(size, rng):
+        gen = _numpy_rng(rng)
+        if dtype == "int64":
+            source = gen.integers(-2 ** 63, 2 ** 63 - 1, size, dtype="int64")
+        else:
+            source = gen.standard_normal(size)
+        return source, source.copy()
+    return setup
+
+
+def _numpy_sort_run(data, should_stop=None, on_step=None):
+    source, scratch = data
+    scratch[:] = source
+    scratch.sort()
+    if on_step is not None:
+        on_step(1, 1)
+    return 1
+
+
+def numpy_matmul_side(size):
+    """Matrix side used for `size` items: √size, capped at NUMPY_MATMUL_MAX_N."""
+    return max(16, min(math.isqrt(size), NUMPY_MATMUL_MAX_N))
+
+
+def _numpy_matmul_setup(size, rng):
+    n   = numpy_matmul_side(size)
+    gen = _numpy_rng(rng)
+    return gen.standard_normal((n, n)), gen.standard_normal((n, n)), import_numpy().empty((n, n))
+
+
+def _numpy_matmul_run(data, should_stop=None, on_step=None):
+    a, b, out = data
+    import_numpy().matmul(a, b, out=out)
+    if on_step is not None:
+        on_step(1, 1)
+    return 1
+
+
+def _numpy_reduce_setup(size, rng):
+    return _numpy_rng(rng).standard_normal(size)
+
+
+def _numpy_reduce_run(data, should_stop=None, on_step=None):
+    np = import_numpy()
+    for done in range(NUMPY_REDUCE_PASSES):
+        if should_stop and should_stop():
+            return done
+        np.add.reduce(data)
+        np.minimum.reduce(data)
+        np.maximum.reduce(data)
+        np.dot(data, data)
+        if on_step is not None:
+            on_step(done + 1, NUMPY_REDUCE_PASSES)
+    return NUMPY_REDUCE_PASSES
+
+
+_numpy_kernel = dict(requires="numpy", batch_limits=(100_000, 4_000_000))
+
+register_workload(Workload(
+    "numpy_sort_int", "NumPy sort (int64)",
+    "np.sort of random 64-bit integers, native code.",
+    setup=_numpy_sort_setup("int64"),
+    run=_numpy_sort_run,
+    work_units=sort_work_units,
+    **_numpy_kernel,
+))
+register_workload(Workload(
+    "numpy_sort_float", "NumPy sort (float64)",
+    "np.sort of normally distributed doubles, native code.",
+    setup=_numpy_sort_setup("float64"),
+    run=_numpy_sort_run,
+    work_units=sort_work_units,
+    **_numpy_kernel,
+))
+register_workload(Workload(
+    "numpy_matmul", "NumPy matmul",
+    "Dense float64 matrix product, √items per side (max 1024); one BLAS thread.",
+    setup=_numpy_matmul_setup,
+    run=_numpy_matmul_run,
+    work_units=lambda n: 2 * numpy_matmul_side(n) ** 3,     # multiply-adds × 2
+    **_numpy_kernel,
+))
+register_workload(Workload(
+    "numpy_reduce", "NumPy reductions",
+    "Vectorised sum, min, max and dot over a float64 array.",
+    setup=_numpy_reduce_setup,
+    run=_numpy_reduce_run,
+    work_units=lambda n: 4 * NUMPY_REDUCE_PASSES * n,       # elements reduced
+    **_numpy_kernel,
+))
+
+NUMPY_WORKLOADS = [w.name for w in WORKLOADS.values() if w.requires == "numpy"]
+
+
+# ---------------------------------------------------------------------------
+# Memory bandwidth kernels (STREAM-style); the runner is in QuickBench.py
+# ---------------------------------------------------------------------------
+
+MEMORY_KERNELS         = ("copy", "scale", "add", "triad")
+MEMORY_BYTES_PER_ELEM  = {"copy": 2, "scale": 2, "add": 3, "triad": 3}
+MEMORY_CHUNK           = 1 << 16     # 64 KiB — stays in L1/L2 between steps
+MEMORY_SCALAR          = 3
+_MEMORY_SCALE_TABLE    = bytes((MEMORY_SCALAR * i) & 0xFF for i in range(256))
+
+
+def _memory_buffers(array_bytes):
+    # Repeating a one-byte pattern writes every page, so first-touch faults
+    # happen here rather than inside the timed passes.
+    return (memoryview(bytearray(b"\x01") * array_bytes),
+            memoryview(bytearray(b"\x02") * array_bytes),
+            memoryview(bytearray(array_bytes)))
+
+
+def _stream_kernel(kernel, a, b, c):
+    n = len(a)
+    if kernel == "copy":
+        c[:] = a
+    elif kernel == "scale":
+        table = _MEMORY_SCALE_TABLE
+        for s in range(0, n, MEMORY_CHUNK):
+            b[s:s + MEMORY_CHUNK] = c[s:s + MEMORY_CHUNK].tobytes().translate(table)
+    elif kernel == "add":
+        for s in range(0, n, MEMORY_CHUNK):
+            e = min(s + MEMORY_CHUNK, n)
+            total = (int.from_bytes(a[s:e], "little")
+                     + int.from_bytes(b[s:e], "little"))
+            c[s:e] = total.to_bytes(e - s + 1, "little")[:e - s]
+    elif kernel == "triad":
+        for s in range(0, n, MEMORY_CHUNK):
+            e = min(s + MEMORY_CHUNK, n)
+            total = (int.from_bytes(b[s:e], "little")
+                     + MEMORY_SCALAR * int.from_bytes(c[s:e], "little"))
+            a[s:e] = total.to_bytes(e - s + 1, "little")[:e - s]
+    else:
+        raise ValueError(f"Unknown memory kernel: {kernel}")
+
+
+def _memory_worker(index, array_bytes, passes, barrier, result_queue, stop_event):
+    """Multi-core STREAM worker: one barrier-aligned timed pass per kernel."""
+    try:
+        a, b, c = _memory_buffers(array_bytes)
+        timings = {kernel: [] for kernel in MEMORY_KERNELS}
+        for _ in range(passes):
+            for kernel in MEMORY_KERNELS:
+                barrier.wait()
+                if stop_event.is_set():
+                    return
+                start = time.perf_counter()
+                _stream_kernel(kernel, a, b, c)
+                timings[kernel].append(time.perf_counter() - start)
+        result_queue.put((index, timings))
+    except threading.BrokenBarrierError:
+        pass        # parent aborted the barrier (cancel or a sibling died)
+    except MemoryError:
+        result_queue.put((index, None))
+
+
+# ---------------------------------------------------------------------------
+# Multi-core per-worker slots
+# One 64-byte slot (8 × int64) per worker in a shared lock-free array; see
+# the counter helpers in QuickBench.py.
+# ---------------------------------------------------------------------------
+
+WORKER_SLOT_STRIDE = 8
+(SLOT_BATCHES, SLOT_TOTAL_NS, SLOT_MIN_NS,
+ SLOT_MAX_NS, SLOT_HEARTBEAT_NS, SLOT_READY) = range(6)
+
+
+# ---------------------------------------------------------------------------
+# Worker entry points
+# ---------------------------------------------------------------------------
+
+def affinity_supported():
+    return hasattr(os, "sched_setaffinity") and hasattr(os, "sched_getaffinity")
+
+
+def multicore_worker(slots, index: int, stop_event, batch_size: int,
+                     workload_name: str = DEFAULT_WORKLOAD,
+                     shared_name=None, shared_items: int = 0, start_gate=None):
+    """Run batches until stop_event is set.
+
+    start_gate(), if given, is called once the first batch's input is
+    ready and blocks until the parent opens the timing window.
+    """
+    rng      = random.Random()
+    workload = get_workload(workload_name)
+    effective_size = workload.effective_batch_size(batch_size)
+    base = index * WORKER_SLOT_STRIDE
+    data = None
+    shm  = None
+    pool = None
+    if shared_name is not None:
+        shm  = attach_shared_memory(shared_name)
+        pool = shm.buf.cast("q")
+    try:
+        while not stop_event.is_set():
+            if pool is not None:
+                offset = rng.randrange(shared_items - effective_size + 1)
+                data   = workload.from_shared(pool, offset, effective_size)
+            elif data is None or workload.mutates_input:
+                data = workload.setup(effective_size, rng)
+            if start_gate is not None:
+                start_gate()
+                start_gate = None
+            if stop_event.is_set():
+                break
+            t0 = time.perf_counter_ns()
+            workload.batch_run(data)
+            if stop_event.is_set():
+                break
+            # Only this process writes its slot, so no lock is needed.
+            took = time.perf_counter_ns() - t0
+            slots[base + SLOT_TOTAL_NS] += took
+            if slots[base + SLOT_MIN_NS] == 0 or took < slots[base + SLOT_MIN_NS]:
+                slots[base + SLOT_MIN_NS] = took
+            if took > slots[base + SLOT_MAX_NS]:
+                slots[base + SLOT_MAX_NS] = took
+            slots[base + SLOT_HEARTBEAT_NS] = time.monotonic_ns()
+            slots[base + SLOT_BATCHES] += 1
+    finally:
+        if pool is not None:
+            # The view must be released before close(), or close() raises.
+            pool.release()
+            shm.close()
+
+
+def _pool_worker_main(slots, index, conn, go_event, stop_event):
+    """Process body of a WorkerPool member: warm up, then serve tasks.
+
+    Each task message is (task, cpu): the worker pins itself to `cpu` for
+    that task, or returns to its original CPU set when cpu is None.
+    """
+    allowed = os.sched_getaffinity(0) if affinity_supported() else None
+    try:
+        # Run every kernel once so first-use costs (allocator growth, cold
+        # code paths) stay out of the first measured window. Optional-package
+        # kernels are skipped: their first batch imports the package during
+        # setup, before the start gate.
+        for workload in WORKLOADS.values():
+            if workload.requires is None:
+                workload.batch_run(workload.setup(1_000, random.Random(index)))
+        conn.send("ready")
+
+        def start_gate():
+            conn.send("ready")
+            go_event.wait()
+
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            task, cpu = message
+            if allowed is not None:
+                os.sched_setaffinity(0, {cpu} if cpu is not None else allowed)
+            multicore_worker(slots, index, stop_event, *task, start_gate=start_gate)
+            conn.send("done")
+    except (EOFError, KeyboardInterrupt):
+        pass
+
+
+class _SharedFlag:
+    """Event-like is_set() / set() over one int64 of a shared memoryview, for
+    subinterpreters, which cannot share threading or multiprocessing events."""
+
+    def __init__(self, view, index):
+        self.view  = view
+        self.index = index
+
+    def is_set(self):
+        return self.view[self.index] != 0
+
+    def set(self):
+        self.view[self.index] = 1
+
+
+def _interpreter_worker_main(control_name, index, worker_count, task):
+    """Subinterpreter-backend worker. Slots and the go / stop flags live in
+    the shared-memory block `control_name`: worker_count slots, then go, stop."""
+    shm  = attach_shared_memory(control_name)
+    view = shm.buf.cast("q")
+    go   = _SharedFlag(view, worker_count * WORKER_SLOT_STRIDE)
+    stop = _SharedFlag(view, worker_count * WORKER_SLOT_STRIDE + 1)
+
+    def start_gate():
+        view[index * WORKER_SLOT_STRIDE + SLOT_READY] = 1
+        while not go.is_set() and not stop.is_set():
+            time.sleep(0.0005)
+
+    try:
+        multicore_worker(view, index, stop, *task, start_gate=start_gate)
+    finally:
+        view[index * WORKER_SLOT_STRIDE + SLOT_READY] = 1
+        view.release()
+        shm.close()